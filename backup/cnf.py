@@ -0,0 +1,200 @@
+"""Linear-size conversion of propositional sentences to CNF.
+
+    cnf_size         Number of clauses to_cnf's distribution would produce
+    TseitinEncoder   Equisatisfiable CNF of linear size, via fresh symbols
+
+logic.to_cnf distributes | over &, which is exact but can grow exponentially:
+(A1 & B1) | (A2 & B2) | ... | (An & Bn) has 2^n clauses.  The Tseitin
+encoding instead names every compound subformula with a fresh proposition
+and adds clauses saying the name is equivalent to the subformula, so the
+result grows linearly.  It is not equivalent to the input, only
+equisatisfiable, but every definition is a conservative extension: adding
+them to a KB changes nothing about what it entails over the original
+symbols, which is all tell/ask need.
+
+Works under Python 2 and 3.
+"""
+
+from logic_expr import Expr
+
+AUX_PREFIX = 'TSEITIN'
+
+
+def is_atom(s):
+    "A proposition or constant, or a predicate applied to terms such as P(x)."
+    return not s.args or (isinstance(s.op, str) and s.op[:1].isalpha())
+
+
+def is_literal(s):
+    "An atom or the negation of one."
+    return is_atom(s) or (s.op == '~' and is_atom(s.args[0]))
+
+
+def negate(literal):
+    return literal.args[0] if literal.op == '~' else Expr('~', literal)
+
+
+def flatten(op, args):
+    "The args of an associative op with nested uses of op spliced in."
+    result = []
+    stack = list(reversed(args))
+    while stack:
+        arg = stack.pop()
+        if arg.op == op:
+            stack.extend(reversed(arg.args))
+        else:
+            result.append(arg)
+    return result
+
+
+def clause(literals):
+    "The Expr for a clause given as a list of literal Exprs."
+    return literals[0] if len(literals) == 1 else Expr('|', *literals)
+
+
+def cnf_size(s):
+    """The number of clauses distribution would turn s into, computed on the
+    expression DAG in time linear in its size.
+    >>> from logic_expr import expr
+    >>> cnf_size(expr('B <=> (P | Q | R)'))
+    4
+    >>> cnf_size(expr('(A & B) | (C & D) | (E & F)'))
+    8
+    """
+    memo = {}
+
+    def size(s, positive):
+        key = (s, positive)
+        if key in memo:
+            return memo[key]
+        op, args = s.op, s.args
+        if not args:
+            result = 1
+        elif op == '~':
+            result = size(args[0], not positive)
+        elif op in ('&', '|'):
+            sizes = [size(arg, positive) for arg in args]
+            if (op == '&') == positive:
+                result = sum(sizes)
+            else:
+                result = 1
+                for n in sizes:
+                    result *= n
+        elif op in ('>>', '<<'):
+            a, b = args if op == '>>' else reversed(args)
+            if positive:    # ~a | b
+                result = size(a, False) * size(b, True)
+            else:           # a & ~b
+                result = size(a, True) + size(b, False)
+        elif op in ('<=>', '^'):
+            a, b = args
+            if (op == '<=>') == positive:   # (~a | b) & (a | ~b)
+                result = size(a, False) * size(b, True) + size(a, True) * size(b, False)
+            else:                           # (a | b) & (~a | ~b)
+                result = (size(a, True) * size(b, True) +
+                          size(a, False) * size(b, False))
+        else:
+            result = 1      # a non-logical term is an atom here
+        memo[key] = result
+        return result
+
+    return size(s, True)
+
+
+class TseitinEncoder:
+    """Encodes sentences as linear-size CNF, naming compound subformulas
+    with fresh propositions TSEITIN1, TSEITIN2, ...
+
+    Names are remembered per subformula (Exprs are interned), so a
+    subformula shared between sentences is defined once.  encode() returns
+    the clauses asserting the sentence separately from the clauses of any
+    new definitions: retracting a sentence only needs to remove the former.
+
+    >>> from logic_expr import expr
+    >>> encoder = TseitinEncoder()
+    >>> encoder.encode(expr('B <=> (P | Q)'))
+    ([(~B | P | Q), (B | ~P), (B | ~Q)], [])
+    >>> encoder.encode(expr('(A & B) | C'))
+    ([(TSEITIN1 | C)], [(~TSEITIN1 | A), (~TSEITIN1 | B), (TSEITIN1 | ~A | ~B)])
+    """
+
+    def __init__(self, prefix=AUX_PREFIX):
+        self.prefix = prefix
+        self.names = {}     # subformula -> its proposition
+
+    def copy(self):
+        "An encoder that knows the same names, and defines new ones on its own."
+        other = TseitinEncoder(self.prefix)
+        other.names = dict(self.names)
+        return other
+
+    def encode(self, sentence):
+        "Return (clauses asserting sentence, clauses defining new names)."
+        roots = []
+        definitions = []
+        for conjunct in flatten('&', [sentence]):
+            roots.extend(self._assert(conjunct, definitions))
+        return roots, definitions
+
+    def _assert(self, s, definitions):
+        "Clauses making s true."
+        op, args = s.op, s.args
+        if op == '|':
+            return [clause([self.literal(d, definitions) for d in flatten('|', args)])]
+        if op in ('>>', '<<'):
+            a, b = args if op == '>>' else reversed(args)
+            return [clause([negate(self.literal(a, definitions)), self.literal(b, definitions)])]
+        if op == '<=>' and len(args) == 2:
+            a, b = args
+            if is_literal(b) and not is_literal(a):
+                a, b = b, a
+            if is_literal(a) and not is_literal(b) and b.op in ('&', '|'):
+                # Let the literal itself name the other side: no fresh symbol
+                return self._define(a, b, definitions)
+            a, b = self.literal(a, definitions), self.literal(b, definitions)
+            return [clause([negate(a), b]), clause([a, negate(b)])]
+        if op == '~' and args[0].op in ('&', '|', '~'):
+            return self._assert(_push_negation(args[0]), definitions)
+        return [self.literal(s, definitions)]
+
+    def literal(self, s, definitions):
+        "A literal equivalent to s, defining fresh names as needed."
+        if is_literal(s):
+            return s
+        if s.op == '~':
+            return negate(self.literal(s.args[0], definitions))
+        name = self.names.get(s)
+        if name is None:
+            name = Expr('%s%d' % (self.prefix, len(self.names) + 1))
+            self.names[s] = name
+            definitions.extend(self._define(name, s, definitions))
+        return name
+
+    def _define(self, x, s, definitions):
+        "Clauses for x <=> s, where x is a literal."
+        op, args = s.op, s.args
+        if op in ('&', '|'):
+            lits = [self.literal(a, definitions) for a in flatten(op, args)]
+            if op == '|':   # x <=> (l1 | ... | ln)
+                return ([clause([negate(x)] + lits)] +
+                        [clause([x, negate(l)]) for l in lits])
+            return ([clause([negate(x), l]) for l in lits] +
+                    [clause([x] + [negate(l) for l in lits])])
+        if op in ('>>', '<<'):
+            a, b = args if op == '>>' else reversed(args)
+            return self._define(x, Expr('|', Expr('~', a), b), definitions)
+        if op in ('<=>', '^'):
+            a = self.literal(args[0], definitions)
+            b = self.literal(args[1], definitions)
+            if op == '^':
+                b = negate(b)
+            return [clause([negate(x), negate(a), b]), clause([negate(x), a, negate(b)]),
+                    clause([x, a, b]), clause([x, negate(a), negate(b)])]
+        raise ValueError("cannot encode operator %r" % op)
+
+
+def _push_negation(s):
+    "~s one level down, for s an &, | or ~."
+    if s.op == '~':
+        return s.args[0]
+    return Expr('|' if s.op == '&' else '&', *[Expr('~', a) for a in s.args])
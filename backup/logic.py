@@ -11,10 +11,13 @@ Be careful: some functions take an Expr as argument, and some take a KB.
 Then we implement various functions for doing logical inference:
 
     tt_entails       Say if a statement is entailed by a KB
+    sat_entails      The same, using the CDCL solver in sat.py
 
 And a few other functions:
 
     to_cnf           Convert to conjunctive normal form
+    cnf.py           Linear-size (Tseitin) CNF, used by PropKB.tell for
+                     sentences whose distributed CNF would be large
 
 [ebreck]: This module has been simplified to the subset of code needed for
 Assignment 3.
@@ -22,6 +25,8 @@ Assignment 3.
 
 import collections
 import itertools, re
+import cnf
+import sat
 from utils import *
 
 #______________________________________________________________________________
@@ -60,16 +65,52 @@ class KB:
         abstract
 
 class PropKB(KB):
-    "A KB for propositional logic. Inefficient, with no indexing."
+    """A KB for propositional logic. Inefficient, with no indexing.
+
+    Each conjunct told is converted with to_cnf when that stays small, and
+    with the linear Tseitin encoding in cnf.py when distribution would
+    produce more than DISTRIBUTE_LIMIT clauses."""
+
+    DISTRIBUTE_LIMIT = 64
 
     def __init__(self, sentence=None):
         self.clauses = []
+        self.encoder = cnf.TseitinEncoder()
+        self.version = 0        # bumped on every change, for callers caching answers
+        self.retracted_at = 0   # version of the latest retract
         if sentence:
             self.tell(sentence)
 
     def tell(self, sentence):
         "Add the sentence's clauses to the KB."
-        self.clauses.extend(conjuncts(to_cnf(sentence)))
+        clauses, definitions = self.encode(sentence)
+        self.clauses.extend(definitions)
+        self.clauses.extend(clauses)
+        self.version += 1
+
+    def tell_clauses(self, clauses):
+        """Add clauses given directly as lists of literal strings such as
+        ['~B1_1', 'P1_2', 'P2_1'], skipping parsing and CNF conversion."""
+        for literals in clauses:
+            self.clauses.append(cnf.clause([
+                Expr('~', Expr(lit[1:])) if lit[0] == '~' else Expr(lit)
+                for lit in literals]))
+        self.version += 1
+
+    def encode(self, sentence, encoder=None):
+        """Return (clauses asserting sentence, clauses defining any new Tseitin
+        names it needed), naming subformulas with encoder (the KB's own by
+        default)."""
+        encoder = encoder or self.encoder
+        clauses, definitions = [], []
+        for c in conjuncts(expr(sentence)):
+            if cnf.cnf_size(c) <= self.DISTRIBUTE_LIMIT:
+                clauses.extend(conjuncts(to_cnf(c)))
+            else:
+                roots, new = encoder.encode(c)
+                clauses.extend(roots)
+                definitions.extend(new)
+        return clauses, definitions
 
     def ask_generator(self, query):
         "Yield the empty substitution if KB implies query; else nothing."
@@ -77,141 +118,130 @@ class PropKB(KB):
             yield {}
 
     def retract(self, sentence):
-        "Remove the sentence's clauses from the KB."
-        for c in conjuncts(to_cnf(sentence)):
+        """Remove the sentence's clauses from the KB.  Tseitin definitions
+        stay: they say nothing about the original symbols.  The sentence is
+        encoded with a copy of the encoder, so names it would need for the
+        first time are not left behind without their definitions."""
+        for c in self.encode(sentence, self.encoder.copy())[0]:
             if c in self.clauses:
                 self.clauses.remove(c)
+        self.version += 1
+        self.retracted_at = self.version
 
-#______________________________________________________________________________
+class SatKB(PropKB):
+    """A PropKB that answers queries with the CDCL solver in sat.py instead of
+    truth tables.  The clauses are mirrored into one incremental solver, so
+    clauses it learns while answering one query speed up the next."""
 
-class Expr:
-    """A symbolic mathematical expression.  We use this class for logical
-    expressions, and for terms within logical expressions. In general, an
-    Expr has an op (operator) and a list of args.  The op can be:
-      Null-ary (no args) op:
-        A number, representing the number itself.  (e.g. Expr(42) => 42)
-        A symbol, representing a variable or constant (e.g. Expr('F') => F)
-      Unary (1 arg) op:
-        '~', '-', representing NOT, negation (e.g. Expr('~', Expr('P')) => ~P)
-      Binary (2 arg) op:
-        '>>', '<<', representing forward and backward implication
-        '+', '-', '*', '/', '**', representing arithmetic operators
-        '<', '>', '>=', '<=', representing comparison operators
-        '<=>', '^', representing logical equality and XOR
-      N-ary (0 or more args) op:
-        '&', '|', representing conjunction and disjunction
-        A symbol, representing a function term or FOL proposition
-
-    Exprs can be constructed with operator overloading: if x and y are Exprs,
-    then so are x + y and x & y, etc.  Also, if F and x are Exprs, then so is
-    F(x); it works by overloading the __call__ method of the Expr F.  Note
-    that in the Expr that is created by F(x), the op is the str 'F', not the
-    Expr F.   See http://www.python.org/doc/current/ref/specialnames.html
-    to learn more about operator overloading in Python.
-
-    WARNING: x == y and x != y are NOT Exprs.  The reason is that we want
-    to write code that tests 'if x == y:' and if x == y were the same
-    as Expr('==', x, y), then the result would always be true; not what a
-    programmer would expect.  But we still need to form Exprs representing
-    equalities and disequalities.  We concentrate on logical equality (or
-    equivalence) and logical disequality (or XOR).  You have 3 choices:
-        (1) Expr('<=>', x, y) and Expr('^', x, y)
-            Note that ^ is bitwose XOR in Python (and Java and C++)
-        (2) expr('x <=> y') and expr('x =/= y').
-            See the doc string for the function expr.
-        (3) (x % y) and (x ^ y).
-            It is very ugly to have (x % y) mean (x <=> y), but we need
-            SOME operator to make (2) work, and this seems the best choice.
-
-    WARNING: if x is an Expr, then so is x + 1, because the int 1 gets
-    coerced to an Expr by the constructor.  But 1 + x is an error, because
-    1 doesn't know how to add an Expr.  (Adding an __radd__ method to Expr
-    wouldn't help, because int.__add__ is still called first.) Therefore,
-    you should use Expr(1) + x instead, or ONE + x, or expr('1 + x').
-    """
+    def __init__(self, sentence=None):
+        self.solver = sat.Solver()
+        PropKB.__init__(self, sentence)
 
-    def __init__(self, op, *args):
-        "Op is a string or number; args are Exprs (or are coerced to Exprs)."
-        assert isinstance(op, str) or (isnumber(op) and not args)
-        self.op = num_or_str(op)
-        self.args = map(expr, args) ## Coerce args to Exprs
-
-    def __call__(self, *args):
-        """Self must be a symbol with no args, such as Expr('F').  Create a new
-        Expr with 'F' as op and the args as arguments."""
-        assert is_symbol(self.op) and not self.args
-        return Expr(self.op, *args)
-
-    def __repr__(self):
-        "Show something like 'P' or 'P(x, y)', or '~P' or '(P | Q | R)'"
-        if not self.args:         # Constant or proposition with arity 0
-            return str(self.op)
-        elif is_symbol(self.op):  # Functional or propositional operator
-            return '%s(%s)' % (self.op, ', '.join(map(repr, self.args)))
-        elif len(self.args) == 1: # Prefix operator
-            return self.op + repr(self.args[0])
-        else:                     # Infix operator
-            return '(%s)' % (' '+self.op+' ').join(map(repr, self.args))
-
-    def __eq__(self, other):
-        """x and y are equal iff their ops and args are equal."""
-        return (other is self) or (isinstance(other, Expr)
-            and self.op == other.op and self.args == other.args)
-
-    def __ne__(self, other):
-        return not self.__eq__(other)
-
-    def __hash__(self):
-        "Need a hash method so Exprs can live in dicts."
-        return hash(self.op) ^ hash(tuple(self.args))
-
-     # See http://www.python.org/doc/current/lib/module-operator.html
-    # Not implemented: not, abs, pos, concat, contains, *item, *slice
-    def __lt__(self, other):     return Expr('<',  self, other)
-    def __le__(self, other):     return Expr('<=', self, other)
-    def __ge__(self, other):     return Expr('>=', self, other)
-    def __gt__(self, other):     return Expr('>',  self, other)
-    def __add__(self, other):    return Expr('+',  self, other)
-    def __sub__(self, other):    return Expr('-',  self, other)
-    def __and__(self, other):    return Expr('&',  self, other)
-    def __div__(self, other):    return Expr('/',  self, other)
-    def __truediv__(self, other):return Expr('/',  self, other)
-    def __invert__(self):        return Expr('~',  self)
-    def __lshift__(self, other): return Expr('<<', self, other)
-    def __rshift__(self, other): return Expr('>>', self, other)
-    def __mul__(self, other):    return Expr('*',  self, other)
-    def __neg__(self):           return Expr('-',  self)
-    def __or__(self, other):     return Expr('|',  self, other)
-    def __pow__(self, other):    return Expr('**', self, other)
-    def __xor__(self, other):    return Expr('^',  self, other)
-    def __mod__(self, other):    return Expr('<=>',  self, other)
-
-
-
-def expr(s):
-    """Create an Expr representing a logic expression by parsing the input
-    string. Symbols and numbers are automatically converted to Exprs.
-    In addition you can use alternative spellings of these operators:
-      'x ==> y'   parses as   (x >> y)    # Implication
-      'x <== y'   parses as   (x << y)    # Reverse implication
-      'x <=> y'   parses as   (x % y)     # Logical equivalence
-      'x =/= y'   parses as   (x ^ y)     # Logical disequality (xor)
-    But BE CAREFUL; precedence of implication is wrong. expr('P & Q ==> R & S')
-    is ((P & (Q >> R)) & S); so you must use expr('(P & Q) ==> (R & S)').
-    >>> expr('P <=> Q(1)')
-    (P <=> Q(1))
-    >>> expr('P & Q | ~R(x, F(x))')
-    ((P & Q) | ~R(x, F(x)))
-    """
-    if isinstance(s, Expr): return s
-    if isnumber(s): return Expr(s)
-    ## Replace the alternative spellings of operators with canonical spellings
-    s = s.replace('==>', '>>').replace('<==', '<<')
-    s = s.replace('<=>', '%').replace('=/=', '^')
-    ## Replace a symbol or number, such as 'P' with 'Expr("P")'
-    s = re.sub(r'([a-zA-Z0-9_.]+)', r'Expr("\1")', s)
-    ## Now eval the string.  (A security hole; do not use with an adversary.)
-    return eval(s, {'Expr':Expr})
+    def tell(self, sentence):
+        "Add the sentence's clauses to the KB and the solver."
+        count = len(self.clauses)
+        PropKB.tell(self, sentence)
+        for c in self.clauses[count:]:
+            self._add(c, [])
+
+    def tell_clauses(self, clauses):
+        "Add clauses given as lists of literal strings to the KB and the solver."
+        count = len(self.clauses)
+        PropKB.tell_clauses(self, clauses)
+        for c in self.clauses[count:]:
+            self._add(c, [])
+
+    def ask_generator(self, query):
+        "Yield the empty substitution if KB & ~query is unsatisfiable."
+        negated = conjuncts(to_cnf(~expr(query)))
+        literals = [self._literals(c) for c in negated]
+        guard = None
+        if all(lits is not None and len(lits) == 1 for lits in literals):
+            # ~query is a conjunction of literals: solve under assumptions
+            assumptions = [lits[0] for lits in literals]
+        else:
+            # Guard the query clauses with a fresh literal, retired afterwards
+            guard = self.solver.new_var()
+            for c in negated:
+                self._add(c, [-guard])
+            assumptions = [guard]
+        entailed = not self.solver.solve(assumptions)
+        if guard is not None:
+            self.solver.add_clause([-guard])
+        if entailed:
+            yield {}
+
+    def entailed(self, queries):
+        """Return the set of queries (literals such as P or ~P) that the KB
+        entails, answering them all in one pass over the same solver.
+        Every model found refutes each query it makes false, so most queries
+        never need a solver call of their own."""
+        pending = {}
+        for query in queries:
+            lits = self._literals(expr(query))
+            if lits is None or len(lits) != 1:
+                raise ValueError("entailed() takes literals, not " + str(query))
+            pending.setdefault(lits[0], []).append(query)
+        # Steer the solver towards models that refute as many queries as possible
+        for lit in pending:
+            self.solver.set_phase(-lit)
+        if not self.solver.solve():
+            return set(q for qs in pending.values() for q in qs)
+        # Literals unit propagation already settles need no search
+        result = set()
+        for lit in list(pending):
+            value = self.solver.fixed(lit)
+            if value is not None:
+                queries = pending.pop(lit)
+                if value:
+                    result.update(queries)
+        satisfiable = True
+        while pending:
+            if satisfiable:
+                for lit in [l for l in pending if not self.solver.value(l)]:
+                    del pending[lit]
+                if not pending:
+                    break
+            lit = next(iter(pending))
+            for other in pending:
+                self.solver.set_phase(-other)
+            satisfiable = self.solver.solve([-lit])
+            if not satisfiable:
+                result.update(pending.pop(lit))
+        return result
+
+    def retract(self, sentence):
+        "Remove the sentence's clauses, rebuilding the solver without them."
+        PropKB.retract(self, sentence)
+        self.solver = sat.Solver()
+        for c in self.clauses:
+            self._add(c, [])
+
+    def _add(self, clause, extra):
+        literals = self._literals(clause)
+        if literals is not None:
+            self.solver.add_clause(literals + extra)
+
+    def _literals(self, clause):
+        """The solver literals of a CNF clause, or None if it is trivially
+        true.  Propositions become named solver variables."""
+        result = []
+        for literal in disjuncts(clause):
+            positive = True
+            while literal.op == '~':
+                positive, literal = not positive, literal.args[0]
+            if literal == TRUE or literal == FALSE:
+                if (literal == TRUE) == positive: return None
+                continue
+            var = self.solver.var(literal)
+            result.append(var if positive else -var)
+        return result
+
+#______________________________________________________________________________
+
+## Expr and expr live in logic_expr.py: Exprs are interned and immutable,
+## and expr() is a real parser rather than eval.
+from logic_expr import Expr, expr
 
 def is_symbol(s):
     "A string s is a symbol if it starts with an alphabetic char."
@@ -260,6 +290,14 @@ def tt_entails(kb, alpha):
     assert not variables(alpha)
     return tt_check_all(kb, alpha, prop_symbols(kb & alpha), {})
 
+def sat_entails(kb, alpha):
+    """Does kb entail the sentence alpha? Use the CDCL solver; unlike
+    tt_entails this stays fast with hundreds of symbols.
+    >>> sat_entails(expr('P & Q'), expr('Q'))
+    True
+    """
+    return SatKB(kb).ask(alpha) is not False
+
 def tt_check_all(kb, alpha, symbols, model):
     "Auxiliary routine to implement tt_entails."
     if not symbols:
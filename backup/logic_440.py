@@ -4,14 +4,15 @@ This module contains two items for use in assignment 3.
 
 resolution(KB, q): Given a propositional knowledge base and query, return
 whether the query can be inferred from the knowledgebase using resolution.
-The implementation is more efficient than pl_resolution in the AIMA code.
+The implementation is more efficient than pl_resolution in the AIMA code:
+the indexed, subsumption-aware prover in prover.py does the work.
 
 KnowledgeBasedAgent: An abstract class that makes decisions to navigate
 through a world based on its knowledge.
 """
 
-import collections
 import logic
+import prover as prover_module
 
 RESULT_DEATH = 0
 RESULT_GIVE_UP = 1
@@ -44,51 +45,31 @@ def resolution(KB, alpha):
   """
   # We do not want to waste effort resolving clauses of the KB against
   # one another directly, we only want to resolve clauses that contain
-  # information derived from alpha.  tainted_clauses will be the set
-  # we grow.
-  tainted_clauses = set(normalize(clause)
-      for clause in logic.conjuncts(logic.to_cnf(~alpha)))
-  KB_clauses = [normalize(clause) for clause in KB.clauses]
-  new = set()
-  while True:
-    # clausesWith is a map from literals to clauses containing that literal.
-    clausesWith = collections.defaultdict(list)
-    for clause in list(tainted_clauses) + KB_clauses:
-      for literal in clause:
-        clausesWith[literal].append(clause)
-
-    # For each tainted clause, add a pair of that clause and any
-    # tainted or KB clause that matches it (i.e. opposes on one literal).
-    pairs = []
-    for clause0 in tainted_clauses:
-      for literal in clause0:
-        for clause1 in clausesWith[negate(literal)]:
-          pairs.append((literal, clause0, clause1))
-
-    # Resolve all the pairs found above.  If any result in None, the 
-    # resolution is a bust (provides no new information).
-    # If any result in False (empty set), we have reached a contradiction
-    # and proven our goal.
-    for literal, clause0, clause1 in pairs:
-      result = resolve(clause0, clause1, literal)
-      if result is not None:
-        if result == set(): return True
-        else: new.add(frozenset(result))
-
-    # We now survey all the new clauses.  In order to want to keep them,
-    # they must not be a superset of any already-known clause (since that
-    # would provide no new information).
-    added = False
-    for clause in new:
-      if not any(old_clause.issubset(clause)
-          for old_clause in list(tainted_clauses) + KB_clauses):
-        tainted_clauses.add(clause)
-        added = True
-
-    # If we have not found any new information, we've reached the end
-    # and cannot prove our goal (it may be True, it may be False, but we
-    # can't definitively say either way).
-    if not added: return False
+  # information derived from alpha, so ~alpha is the set of support.
+  # The prover keeps the KB clauses indexed between queries.
+  support = [normalize(clause) for clause in logic.conjuncts(logic.to_cnf(~alpha))]
+  return kb_prover(KB).prove(support)
+
+
+def kb_prover(KB):
+  """Return the ResolutionProver for KB, reusing it while KB only grows.
+
+  The cache is keyed on KB.version: the prover built at some version stays
+  valid, with the clauses told since added to it, unless KB retracted
+  anything after that version."""
+  cached = getattr(KB, '_prover', None)
+  if cached is not None:
+    prover, version, seen = cached
+    if KB.version == version:
+      return prover
+    if KB.retracted_at <= version:
+      for clause in KB.clauses[seen:]:
+        prover.add_clause(normalize(clause))
+      KB._prover = (prover, KB.version, len(KB.clauses))
+      return prover
+  prover = prover_module.ResolutionProver(normalize(clause) for clause in KB.clauses)
+  KB._prover = (prover, KB.version, len(KB.clauses))
+  return prover
 
 
 def resolve(clause0, clause1, literal):
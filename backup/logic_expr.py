@@ -0,0 +1,333 @@
+"""Interned logical expressions and a parser for them.
+
+    Expr     An immutable, hash-consed expression: op plus a tuple of args
+    expr     Parse a string such as 'B1_1 <=> (P1_2 | P2_1)' into an Expr
+
+Every Expr is built through an intern table, so structurally equal
+expressions are the same object: subterms are shared, equality is usually
+an identity test, and the hash is computed once at construction.  The table
+holds its entries weakly, so expressions nobody references are freed.
+
+expr() is a recursive-descent parser with the usual logical precedence,
+loosest first:
+
+    <=>  =/=  (also % and ^)     equivalence, xor
+    ==>  <==  (also >> and <<)   implication (==> groups to the right)
+    |                            disjunction
+    &                            conjunction
+    <  >  <=  >=                 comparison
+    +  -                         sums
+    *  /                         products
+    ~  -                         negation (prefix)
+    **                           power (groups to the right)
+    F(x, y), symbols, numbers, ( ... )
+
+so expr('P & Q ==> R & S') is ((P & Q) >> (R & S)).  Binary operators build
+nested two-argument Exprs, the same shapes the old eval-based expr() built.
+Parsed strings are cached, since agents parse the same few strings often.
+
+Works under Python 2 and 3; logic.py imports Expr and expr from here.
+"""
+
+import numbers
+import re
+import weakref
+
+
+def _num_or_str(x):
+    "Convert a string to an int or float if possible, else strip it."
+    if not isinstance(x, str):
+        return x
+    if x[:1].isalpha() or x in _OPERATORS:
+        return x        # the common case: a symbol or an operator
+    try:
+        return int(x)
+    except ValueError:
+        try:
+            return float(x)
+        except ValueError:
+            return x.strip()
+
+
+def _is_symbol(s):
+    return isinstance(s, str) and s[:1].isalpha()
+
+
+# (op, args) -> weak reference to the one Expr with that structure
+_table = {}
+
+
+class _Forget(object):
+    "Weak reference callback dropping a dead Expr's entry from the table."
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __call__(self, ref):
+        if _table.get(self.key) is ref:
+            del _table[self.key]
+
+
+class Expr(object):
+    """A symbolic mathematical expression.  We use this class for logical
+    expressions, and for terms within logical expressions. In general, an
+    Expr has an op (operator) and a list of args.  The op can be:
+      Null-ary (no args) op:
+        A number, representing the number itself.  (e.g. Expr(42) => 42)
+        A symbol, representing a variable or constant (e.g. Expr('F') => F)
+      Unary (1 arg) op:
+        '~', '-', representing NOT, negation (e.g. Expr('~', Expr('P')) => ~P)
+      Binary (2 arg) op:
+        '>>', '<<', representing forward and backward implication
+        '+', '-', '*', '/', '**', representing arithmetic operators
+        '<', '>', '>=', '<=', representing comparison operators
+        '<=>', '^', representing logical equality and XOR
+      N-ary (0 or more args) op:
+        '&', '|', representing conjunction and disjunction
+        A symbol, representing a function term or FOL proposition
+
+    Exprs can be constructed with operator overloading: if x and y are Exprs,
+    then so are x + y and x & y, etc.  Also, if F and x are Exprs, then so is
+    F(x); it works by overloading the __call__ method of the Expr F.  Note
+    that in the Expr that is created by F(x), the op is the str 'F', not the
+    Expr F.   See http://www.python.org/doc/current/ref/specialnames.html
+    to learn more about operator overloading in Python.
+
+    WARNING: x == y and x != y are NOT Exprs.  The reason is that we want
+    to write code that tests 'if x == y:' and if x == y were the same
+    as Expr('==', x, y), then the result would always be true; not what a
+    programmer would expect.  But we still need to form Exprs representing
+    equalities and disequalities.  We concentrate on logical equality (or
+    equivalence) and logical disequality (or XOR).  You have 3 choices:
+        (1) Expr('<=>', x, y) and Expr('^', x, y)
+            Note that ^ is bitwose XOR in Python (and Java and C++)
+        (2) expr('x <=> y') and expr('x =/= y').
+            See the doc string for the function expr.
+        (3) (x % y) and (x ^ y).
+            It is very ugly to have (x % y) mean (x <=> y), but we need
+            SOME operator to make (2) work, and this seems the best choice.
+
+    WARNING: if x is an Expr, then so is x + 1, because the int 1 gets
+    coerced to an Expr by the constructor.  But 1 + x is an error, because
+    1 doesn't know how to add an Expr.  (Adding an __radd__ method to Expr
+    wouldn't help, because int.__add__ is still called first.) Therefore,
+    you should use Expr(1) + x instead, or ONE + x, or expr('1 + x').
+
+    Exprs are interned: constructing one that already exists returns the
+    existing object, so do not rely on "is not" to tell equal subterms apart.
+    They are also immutable; args is a tuple.
+
+    >>> Expr('&', 'P', Expr('Q')) is expr('P & Q')
+    True
+    """
+    __slots__ = ('op', 'args', '_hash', '__weakref__')
+
+    def __new__(cls, op, *args):
+        "Op is a string or number; args are Exprs (or are coerced to Exprs)."
+        assert isinstance(op, str) or (isinstance(op, numbers.Number) and not args)
+        op = _num_or_str(op)
+        for arg in args:
+            if not isinstance(arg, Expr):
+                args = tuple(expr(arg) for arg in args)
+                break
+        key = (op, args)
+        ref = _table.get(key)
+        self = ref() if ref is not None else None
+        if self is None:
+            self = object.__new__(cls)
+            object.__setattr__(self, 'op', op)
+            object.__setattr__(self, 'args', args)
+            object.__setattr__(self, '_hash', hash(key))
+            _table[key] = weakref.ref(self, _Forget(key))
+        return self
+
+    def __init__(self, op, *args):
+        pass    # everything happens in __new__
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Expr objects are immutable")
+
+    def __reduce__(self):
+        return (Expr, (self.op,) + self.args)
+
+    def __call__(self, *args):
+        """Self must be a symbol with no args, such as Expr('F').  Create a new
+        Expr with 'F' as op and the args as arguments."""
+        assert _is_symbol(self.op) and not self.args
+        return Expr(self.op, *args)
+
+    def __repr__(self):
+        "Show something like 'P' or 'P(x, y)', or '~P' or '(P | Q | R)'"
+        if not self.args:         # Constant or proposition with arity 0
+            return str(self.op)
+        elif _is_symbol(self.op): # Functional or propositional operator
+            return '%s(%s)' % (self.op, ', '.join(map(repr, self.args)))
+        elif len(self.args) == 1: # Prefix operator
+            return self.op + repr(self.args[0])
+        else:                     # Infix operator
+            return '(%s)' % (' '+self.op+' ').join(map(repr, self.args))
+
+    def __eq__(self, other):
+        """x and y are equal iff their ops and args are equal; interning makes
+        that an identity test in practice."""
+        return (other is self) or (isinstance(other, Expr)
+            and self._hash == other._hash
+            and self.op == other.op and self.args == other.args)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        return self._hash
+
+    def __lt__(self, other):     return Expr('<',  self, other)
+    def __le__(self, other):     return Expr('<=', self, other)
+    def __ge__(self, other):     return Expr('>=', self, other)
+    def __gt__(self, other):     return Expr('>',  self, other)
+    def __add__(self, other):    return Expr('+',  self, other)
+    def __sub__(self, other):    return Expr('-',  self, other)
+    def __and__(self, other):    return Expr('&',  self, other)
+    def __div__(self, other):    return Expr('/',  self, other)
+    def __truediv__(self, other):return Expr('/',  self, other)
+    def __invert__(self):        return Expr('~',  self)
+    def __lshift__(self, other): return Expr('<<', self, other)
+    def __rshift__(self, other): return Expr('>>', self, other)
+    def __mul__(self, other):    return Expr('*',  self, other)
+    def __neg__(self):           return Expr('-',  self)
+    def __or__(self, other):     return Expr('|',  self, other)
+    def __pow__(self, other):    return Expr('**', self, other)
+    def __xor__(self, other):    return Expr('^',  self, other)
+    def __mod__(self, other):    return Expr('<=>',  self, other)
+
+#______________________________________________________________________________
+
+_TOKEN = re.compile(r'\s*(?:(<=>|==>|<==|=/=|\*\*|>>|<<|<=|>=|[~&|^%<>+\-*/(),])'
+                    r'|([a-zA-Z0-9_.]+))')
+
+# Binary operators: spelling -> (op, level, right-associative); loosest level first
+_BINARY = {}
+for _level, (_spellings, _right) in enumerate((
+        ({'<=>': '<=>', '%': '<=>', '=/=': '^', '^': '^'}, False),
+        ({'==>': '>>', '>>': '>>', '<==': '<<', '<<': '<<'}, True),
+        ({'|': '|'}, False),
+        ({'&': '&'}, False),
+        ({'<': '<', '>': '>', '<=': '<=', '>=': '>='}, False),
+        ({'+': '+', '-': '-'}, False),
+        ({'*': '*', '/': '/'}, False))):
+    for _spelling, _op in _spellings.items():
+        _BINARY[_spelling] = (_op, _level, _right)
+
+_OPERATORS = frozenset(['~', '**'] + [op for op, _, _ in _BINARY.values()])
+
+_cache = {}
+_CACHE_LIMIT = 4096
+
+
+def expr(s):
+    """Create an Expr representing a logic expression by parsing the input
+    string. Symbols and numbers are automatically converted to Exprs.
+    In addition you can use alternative spellings of these operators:
+      'x ==> y'   parses as   (x >> y)    # Implication
+      'x <== y'   parses as   (x << y)    # Reverse implication
+      'x <=> y'   parses as   (x <=> y)   # Logical equivalence
+      'x =/= y'   parses as   (x ^ y)     # Logical disequality (xor)
+    >>> expr('P <=> Q(1)')
+    (P <=> Q(1))
+    >>> expr('P & Q | ~R(x, F(x))')
+    ((P & Q) | ~R(x, F(x)))
+    >>> expr('P & Q ==> R & S')
+    ((P & Q) >> (R & S))
+    """
+    if isinstance(s, Expr): return s
+    if isinstance(s, numbers.Number): return Expr(s)
+    result = _cache.get(s)
+    if result is None:
+        result = _Parser(s).parse()
+        if len(_cache) >= _CACHE_LIMIT:
+            _cache.clear()
+        _cache[s] = result
+    return result
+
+
+class _Parser(object):
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = []
+        pos = 0
+        text = text.rstrip()
+        while pos < len(text):
+            match = _TOKEN.match(text, pos)
+            if not match or match.end() == pos:
+                raise SyntaxError("bad character in expression %r at %d" % (self.text, pos))
+            self.tokens.append(match.group(1) or ('atom', match.group(2)))
+            pos = match.end()
+        self.pos = 0
+
+    def parse(self):
+        result = self.binary(0)
+        if self.pos != len(self.tokens):
+            self.fail()
+        return result
+
+    def fail(self):
+        raise SyntaxError("cannot parse expression %r" % self.text)
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def take(self, token):
+        if self.peek() != token:
+            self.fail()
+        self.pos += 1
+
+    def binary(self, min_level):
+        """Precedence climbing: parse operands joined by binary operators of
+        level min_level or tighter."""
+        left = self.unary()
+        tokens = self.tokens
+        while self.pos < len(tokens):
+            info = _BINARY.get(tokens[self.pos]) if isinstance(tokens[self.pos], str) else None
+            if info is None or info[1] < min_level:
+                break
+            op, level, right = info
+            self.pos += 1
+            left = Expr(op, left, self.binary(level if right else level + 1))
+        return left
+
+    def unary(self):
+        token = self.peek()
+        if token in ('~', '-'):
+            self.pos += 1
+            return Expr(token, self.unary())
+        return self.power()
+
+    def power(self):
+        base = self.primary()
+        if self.peek() == '**':
+            self.pos += 1
+            return Expr('**', base, self.unary())
+        return base
+
+    def primary(self):
+        token = self.peek()
+        self.pos += 1
+        if token == '(':
+            result = self.binary(0)
+            self.take(')')
+            return result
+        if not isinstance(token, tuple):
+            self.fail()
+        atom = Expr(token[1])
+        if self.peek() == '(':
+            self.pos += 1
+            args = []
+            if self.peek() != ')':
+                args.append(self.binary(0))
+                while self.peek() == ',':
+                    self.pos += 1
+                    args.append(self.binary(0))
+            self.take(')')
+            return atom(*args)
+        return atom
@@ -0,0 +1,164 @@
+"""Indexed resolution theorem prover for propositional clauses.
+
+This is the engine behind logic_440.resolution.  It proves KB |- alpha by
+refutation like before, resolving only clauses derived from ~alpha (the set
+of support) against each other and against the KB, but:
+
+  - literals are interned as ints (an atom a gives literals 2a and 2a+1), so
+    negation is lit ^ 1 instead of string slicing;
+  - KB clauses live in a literal -> clauses index that persists across
+    queries, and clauses derived for a query are added to it incrementally;
+  - clauses are processed one at a time in a given-clause loop, shortest
+    first, instead of building every pair of every saturation round;
+  - new clauses are dropped when an existing clause subsumes them (forward
+    subsumption), and derived clauses a new clause subsumes are retired
+    (backward subsumption); both look only at clauses sharing a literal and
+    use a 64-bit literal signature to skip most subset tests.
+
+Literals at the boundary are strings such as 'P1_2' and '~P1_2', as produced
+by logic_440.normalize.  Works under Python 2 and 3.
+"""
+
+import heapq
+
+SIGNATURE_BITS = 64
+
+
+class Clause(object):
+  __slots__ = ('literals', 'signature', 'derived', 'alive')
+
+  def __init__(self, literals, derived):
+    self.literals = literals      # frozenset of literal ids
+    signature = 0
+    for lit in literals:
+      signature |= 1 << (lit % SIGNATURE_BITS)
+    self.signature = signature
+    self.derived = derived        # False for KB clauses
+    self.alive = True
+
+  def subsumes(self, other):
+    return (len(self.literals) <= len(other.literals) and
+            not self.signature & ~other.signature and
+            self.literals <= other.literals)
+
+
+class ResolutionProver(object):
+  """A set of KB clauses, indexed once, that answers refutation queries.
+
+  >>> prover = ResolutionProver([['~B', 'P', 'Q'], ['B'], ['~Q']])
+  >>> prover.prove([['~P']])
+  True
+  >>> prover.prove([['P']])
+  False
+  """
+
+  def __init__(self, clauses=()):
+    self.atoms = {}               # atom name -> atom number
+    self.occurs = []              # literal id -> list of live clauses containing it
+    self.kb = []
+    self.clause_set = set()       # literal sets of the KB clauses, for duplicates
+    for clause in clauses:
+      self.add_clause(clause)
+
+  def literal(self, text):
+    """The id of a string literal, interning its atom on first use."""
+    negative = text.startswith('~')
+    atom = text[1:] if negative else text
+    number = self.atoms.get(atom)
+    if number is None:
+      number = self.atoms[atom] = len(self.atoms)
+      self.occurs.append([])
+      self.occurs.append([])
+    return 2 * number + negative
+
+  def add_clause(self, literals):
+    """Add a KB clause (an iterable of string literals)."""
+    ids = frozenset(self.literal(text) for text in literals)
+    if any(lit ^ 1 in ids for lit in ids) or ids in self.clause_set:
+      return                      # tautologies and duplicates add nothing
+    self.clause_set.add(ids)
+    clause = Clause(ids, False)
+    self.kb.append(clause)
+    self._index(clause)
+
+  def prove(self, support):
+    """Return True if the KB plus the support clauses (iterables of string
+    literals, normally the CNF of ~alpha) resolve to the empty clause."""
+    derived = []
+    queue = []
+    counter = 0
+    try:
+      for literals in support:
+        ids = frozenset(self.literal(text) for text in literals)
+        if not ids:
+          return True
+        if any(lit ^ 1 in ids for lit in ids):
+          continue
+        counter += 1
+        heapq.heappush(queue, (len(ids), counter, Clause(ids, True)))
+
+      while queue:
+        given = heapq.heappop(queue)[2]
+        if not given.alive or self._subsumed(given):
+          continue
+        self._retire_subsumed_by(given)
+        self._index(given)
+        derived.append(given)
+        for lit in given.literals:
+          for partner in list(self.occurs[lit ^ 1]):
+            if not partner.alive:
+              continue
+            resolvent = self._resolve(given, partner, lit)
+            if resolvent is None:
+              continue
+            if not resolvent:
+              return True
+            counter += 1
+            heapq.heappush(queue, (len(resolvent), counter, Clause(resolvent, True)))
+      return False
+    finally:
+      # Derived clauses belong to this query only
+      for clause in derived:
+        if clause.alive:
+          self._unindex(clause)
+
+  @staticmethod
+  def _resolve(clause0, clause1, lit):
+    """Resolvent of clause0 (containing lit) and clause1 (containing ~lit), or
+    None if it is a tautology."""
+    rest0 = clause0.literals - frozenset((lit,))
+    rest1 = clause1.literals - frozenset((lit ^ 1,))
+    for other in rest0:
+      if other ^ 1 in rest1:
+        return None
+    return rest0 | rest1
+
+  def _subsumed(self, clause):
+    """Forward subsumption: does a live clause subsume clause?  A subsumer
+    shares every one of its literals with clause, so the occurrence lists of
+    clause's literals hold every candidate."""
+    seen = set()
+    for lit in clause.literals:
+      for other in self.occurs[lit]:
+        if id(other) not in seen:
+          seen.add(id(other))
+          if other.subsumes(clause):
+            return True
+    return False
+
+  def _retire_subsumed_by(self, clause):
+    """Backward subsumption: drop derived clauses that clause subsumes.  Any
+    such clause contains clause's rarest literal."""
+    rarest = min(clause.literals, key=lambda lit: len(self.occurs[lit]))
+    for other in list(self.occurs[rarest]):
+      if other.derived and clause.subsumes(other):
+        self._unindex(other)
+
+  def _index(self, clause):
+    for lit in clause.literals:
+      self.occurs[lit].append(clause)
+
+  def _unindex(self, clause):
+    clause.alive = False
+    for lit in clause.literals:
+      self.occurs[lit].remove(clause)
@@ -0,0 +1,398 @@
+"""A conflict-driven clause-learning (CDCL) SAT solver.
+
+Used by logic.SatKB to answer propositional entailment queries without
+enumerating truth tables:  KB |= alpha  iff  KB & ~alpha  is unsatisfiable.
+
+    Solver        Clause database plus the CDCL search
+    luby          Restart schedule used by Solver.solve
+
+Variables are positive ints and literals are non-zero ints, DIMACS style:
+3 means variable 3 is true, -3 means it is false.  Internally a literal is
+2*var for the positive and 2*var+1 for the negative phase, so negation is
+lit ^ 1 and lists can be indexed by literal.
+
+The search is the usual one: two watched literals per clause for unit
+propagation, first-UIP conflict analysis with clause learning and
+non-chronological backjumping, VSIDS variable activities, phase saving,
+Luby restarts and periodic deletion of the least useful learnt clauses.
+Assumptions are solved as the first decisions, so clauses learnt under one
+set of assumptions stay valid for every later call; a Solver can therefore
+be reused for many related queries.
+
+Works under Python 2 and 3.
+"""
+
+import heapq
+
+
+def luby(i):
+    """The i-th term (from 0) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+    >>> [luby(i) for i in range(10)]
+    [1, 1, 2, 1, 1, 2, 4, 1, 1, 2]
+    """
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i = i % size
+    return 1 << seq
+
+
+class Solver:
+    """An incremental CDCL solver.
+
+    >>> s = Solver()
+    >>> s.add_clause([1, 2]); s.add_clause([-1, 2]); s.add_clause([-2, 3])
+    True
+    True
+    True
+    >>> s.solve(), s.value(3)
+    (True, True)
+    >>> s.solve([-3])
+    False
+    """
+
+    restart_base = 100      # conflicts in the first restart interval
+    var_decay = 0.95
+    learnt_factor = 3       # learnt clauses kept, relative to problem clauses
+
+    def __init__(self):
+        self.ok = True              # False once the clauses alone are unsat
+        self.clauses = []           # problem clauses (lists of internal lits)
+        self.learnts = []
+        self.watches = [[], []]     # watches[lit]: clauses watching lit
+        self.assigns = [0]          # per var: 0 unassigned, 1 true, -1 false
+        self.level = [0]
+        self.reason = [None]
+        self.activity = [0.0]
+        self.polarity = [False]     # saved phase, used for the next decision
+        self.trail = []
+        self.trail_lim = []         # trail length at the start of each level
+        self.qhead = 0
+        self.order = []             # heap of (-activity, var); may hold stale entries
+        self.var_inc = 1.0
+        self.names = {}             # optional name -> var mapping
+        self.conflicts = 0
+        self.decisions = 0
+        self.propagations = 0
+
+    # Variables and clauses
+
+    def num_vars(self):
+        return len(self.assigns) - 1
+
+    def new_var(self, name=None):
+        """Create a fresh variable and return it (a positive int)."""
+        var = len(self.assigns)
+        self.assigns.append(0)
+        self.level.append(0)
+        self.reason.append(None)
+        self.activity.append(0.0)
+        self.polarity.append(False)
+        self.watches.append([])
+        self.watches.append([])
+        heapq.heappush(self.order, (0.0, var))
+        if name is not None:
+            self.names[name] = var
+        return var
+
+    def var(self, name):
+        """The variable for name, created on first use."""
+        var = self.names.get(name)
+        if var is None:
+            var = self.new_var(name)
+        return var
+
+    def add_clause(self, literals):
+        """Add a clause (an iterable of DIMACS literals).  Returns False if the
+        clause set has become unsatisfiable, True otherwise."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        clause = []
+        seen = set()
+        for lit in literals:
+            var = abs(lit)
+            while var >= len(self.assigns):
+                self.new_var()
+            ilit = 2 * var + (lit < 0)
+            if ilit ^ 1 in seen:
+                return True                     # tautology
+            value = self._value(ilit)
+            if value == 1 and self.level[var] == 0:
+                return True                     # already satisfied
+            if ilit not in seen and not (value == -1 and self.level[var] == 0):
+                seen.add(ilit)
+                clause.append(ilit)
+        if not clause:
+            self.ok = False
+            return False
+        if len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+            return self.ok
+        self.clauses.append(clause)
+        self._attach(clause)
+        return True
+
+    # Search
+
+    def solve(self, assumptions=()):
+        """Search for a model of the clauses in which every assumption literal
+        holds.  Returns True (see value/model) or False."""
+        if not self.ok:
+            return False
+        assumptions = [2 * abs(lit) + (lit < 0) for lit in assumptions]
+        for lit in assumptions:
+            while lit >> 1 >= len(self.assigns):
+                self.new_var()
+        max_learnts = max(len(self.clauses) * self.learnt_factor, 1000)
+        restart = 0
+        while True:
+            budget = luby(restart) * self.restart_base
+            restart += 1
+            status = self._search(budget, assumptions, max_learnts)
+            if status is not None:
+                self.model = [a == 1 for a in self.assigns] if status else None
+                self._cancel_until(0)
+                return status
+            max_learnts += max_learnts // 10
+
+    def value(self, lit):
+        """Truth value of a DIMACS literal in the last model."""
+        return self.model[abs(lit)] == (lit > 0)
+
+    def set_phase(self, lit):
+        """Prefer making lit true when its variable is next decided."""
+        var = abs(lit)
+        while var >= len(self.assigns):
+            self.new_var()
+        self.polarity[var] = lit > 0
+
+    def fixed(self, lit):
+        """True or False if the clauses alone force the literal's value (it is
+        assigned at decision level 0), else None."""
+        var = abs(lit)
+        if var >= len(self.assigns) or self.assigns[var] == 0 or self.level[var] != 0:
+            return None
+        return (self.assigns[var] == 1) == (lit > 0)
+
+    def _search(self, budget, assumptions, max_learnts):
+        """Run CDCL for up to budget conflicts.  Returns True or False when the
+        question is settled, None to request a restart."""
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, back_level = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self.learnts.append(learnt)
+                    self._attach(learnt)
+                    self._enqueue(learnt[0], learnt)
+                self._decay_activity()
+                continue
+
+            if conflicts >= budget:
+                self._cancel_until(0)
+                return None
+            if len(self.learnts) - len(self.trail) >= max_learnts:
+                self._reduce_learnts()
+
+            # Assumptions are the first decisions, one level each
+            lit = None
+            while len(self.trail_lim) < len(assumptions):
+                assumption = assumptions[len(self.trail_lim)]
+                value = self._value(assumption)
+                if value == 1:
+                    self.trail_lim.append(len(self.trail))   # dummy level
+                elif value == -1:
+                    return False                # assumptions contradict the clauses
+                else:
+                    lit = assumption
+                    break
+            if lit is None:
+                lit = self._pick_branch()
+                if lit is None:
+                    return True                 # every variable assigned: a model
+                self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, None)
+
+    def _pick_branch(self):
+        order = self.order
+        assigns = self.assigns
+        while order:
+            var = heapq.heappop(order)[1]
+            if assigns[var] == 0:
+                return 2 * var + (not self.polarity[var])
+        return None
+
+    # Propagation
+
+    def _value(self, lit):
+        value = self.assigns[lit >> 1]
+        return -value if lit & 1 else value
+
+    def _enqueue(self, lit, reason):
+        var = lit >> 1
+        self.assigns[var] = -1 if lit & 1 else 1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _attach(self, clause):
+        self.watches[clause[0]].append(clause)
+        self.watches[clause[1]].append(clause)
+
+    def _propagate(self):
+        """Unit-propagate the trail.  Returns a conflicting clause or None.
+
+        Invariant: a clause's watched literals are clause[0] and clause[1],
+        and the literal a clause implied is kept at clause[0].
+        """
+        assigns = self.assigns
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            self.propagations += 1
+            watching = watches[false_lit]
+            kept = []
+            watches[false_lit] = kept
+            for index, clause in enumerate(watching):
+                if not clause:
+                    continue                    # deleted learnt clause
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+                first = clause[0]
+                first_value = assigns[first >> 1]
+                if first & 1:
+                    first_value = -first_value
+                if first_value == 1:
+                    kept.append(clause)
+                    continue
+                # Look for a new literal to watch
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    value = assigns[lit >> 1]
+                    if lit & 1:
+                        value = -value
+                    if value != -1:
+                        clause[1], clause[k] = lit, false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if first_value == -1:
+                        kept.extend(watching[index + 1:])
+                        self.qhead = len(trail)
+                        return clause
+                    self._enqueue(first, clause)
+        return None
+
+    def _cancel_until(self, level):
+        if len(self.trail_lim) <= level:
+            return
+        assigns = self.assigns
+        polarity = self.polarity
+        activity = self.activity
+        order = self.order
+        start = self.trail_lim[level]
+        for lit in self.trail[start:]:
+            var = lit >> 1
+            assigns[var] = 0
+            self.reason[var] = None
+            polarity[var] = not lit & 1
+            heapq.heappush(order, (-activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[level:]
+        self.qhead = len(self.trail)
+
+    # Conflict analysis
+
+    def _analyze(self, conflict):
+        """First-UIP learning.  Returns (learnt clause, backjump level) with the
+        asserting literal first and a literal of the backjump level second."""
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        current = len(self.trail_lim)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        lit = None
+        index = len(trail) - 1
+        clause = conflict
+        while True:
+            for q in (clause if lit is None else clause[1:]):
+                var = q >> 1
+                if var not in seen and level[var] > 0:
+                    seen.add(var)
+                    self._bump(var)
+                    if level[var] >= current:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while trail[index] >> 1 not in seen:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            clause = reason[lit >> 1]
+            seen.discard(lit >> 1)
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = lit ^ 1
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # Second watch: the literal assigned at the highest remaining level
+        best = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def _bump(self, var):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, len(self.assigns))
+                          if self.assigns[v] == 0]
+            heapq.heapify(self.order)
+        elif self.assigns[var] == 0:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def _decay_activity(self):
+        self.var_inc /= self.var_decay
+        if len(self.order) > 4 * len(self.assigns) + 100:
+            # Drop stale heap entries
+            self.order = [(-self.activity[v], v) for v in range(1, len(self.assigns))
+                          if self.assigns[v] == 0]
+            heapq.heapify(self.order)
+
+    def _reduce_learnts(self):
+        """Delete the longer half of the learnt clauses that are not reasons."""
+        def locked(clause):
+            var = clause[0] >> 1
+            return self.reason[var] is clause and self._value(clause[0]) == 1
+        self.learnts.sort(key=len)
+        keep = len(self.learnts) // 2
+        survivors = self.learnts[:keep]
+        for clause in self.learnts[keep:]:
+            if len(clause) <= 2 or locked(clause):
+                survivors.append(clause)
+            else:
+                del clause[:]       # emptied clauses are skipped and dropped by _propagate
+        self.learnts = survivors
@@ -0,0 +1,67 @@
+import itertools
+import random
+import unittest
+import cnf
+import sat
+from logic_expr import Expr, expr
+
+
+def evaluate(s, model):
+  if not s.args:
+    return model[s.op]
+  values = [evaluate(arg, model) for arg in s.args]
+  if s.op == '~': return not values[0]
+  if s.op == '&': return all(values)
+  if s.op == '|': return any(values)
+  if s.op == '>>': return not values[0] or values[1]
+  if s.op == '<<': return values[0] or not values[1]
+  if s.op == '<=>': return values[0] == values[1]
+  if s.op == '^': return values[0] != values[1]
+
+
+def random_sentence(rng, symbols, depth):
+  if depth == 0 or rng.random() < 0.2:
+    return Expr(rng.choice(symbols))
+  op = rng.choice(['~', '&', '|', '>>', '<=>', '^'])
+  if op == '~':
+    return Expr('~', random_sentence(rng, symbols, depth - 1))
+  count = rng.randint(2, 3) if op in ('&', '|') else 2
+  return Expr(op, *[random_sentence(rng, symbols, depth - 1) for _ in range(count)])
+
+
+class Test(unittest.TestCase):
+  def test_tseitin_is_equisatisfiable_per_model(self):
+    rng = random.Random(13)
+    symbols = ['A', 'B', 'C', 'D']
+    for _ in range(200):
+      sentence = random_sentence(rng, symbols, 4)
+      roots, definitions = cnf.TseitinEncoder().encode(sentence)
+      solver = sat.Solver()
+      for c in roots + definitions:
+        lits = []
+        for lit in cnf.flatten('|', [c]):
+          positive = lit.op != '~'
+          var = solver.var(lit if positive else lit.args[0])
+          lits.append(var if positive else -var)
+        solver.add_clause(lits)
+      # The encoding has a model extending exactly the models of the sentence
+      for values in itertools.product((False, True), repeat=len(symbols)):
+        model = dict(zip(symbols, values))
+        assumptions = [solver.var(Expr(s)) * (1 if model[s] else -1) for s in symbols]
+        self.assertEqual(solver.solve(assumptions), evaluate(sentence, model))
+
+  def test_cnf_size(self):
+    self.assertEqual(cnf.cnf_size(expr('B <=> (P | Q | R)')), 4)
+    self.assertEqual(cnf.cnf_size(expr('(A & B) | (C & D) | (E & F)')), 8)
+    self.assertEqual(cnf.cnf_size(expr('~(A | B)')), 2)
+
+  def test_shared_subformulas_are_defined_once(self):
+    encoder = cnf.TseitinEncoder()
+    _, first = encoder.encode(expr('(A & B) | C'))
+    _, second = encoder.encode(expr('(A & B) | D'))
+    self.assertEqual(len(first), 3)
+    self.assertEqual(second, [])
+
+
+if __name__ == '__main__':
+  unittest.main()
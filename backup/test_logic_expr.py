@@ -0,0 +1,33 @@
+import logic_expr
+import pickle
+import unittest
+
+expr = logic_expr.expr
+
+
+class Test(unittest.TestCase):
+  def test_precedence(self):
+    self.assertEqual(repr(expr('P & Q ==> R & S')), '((P & Q) >> (R & S))')
+    self.assertEqual(repr(expr('A | B & ~C')), '(A | (B & ~C))')
+    self.assertEqual(repr(expr('A <=> B | C')), '(A <=> (B | C))')
+    self.assertEqual(repr(expr('A ==> B ==> C')), '(A >> (B >> C))')
+    self.assertEqual(repr(expr('A =/= B')), '(A ^ B)')
+    self.assertEqual(repr(expr('P <=> Q(1)')), '(P <=> Q(1))')
+
+  def test_interning(self):
+    e = expr('B1_1 <=> (P1_2 | P2_1)')
+    self.assertTrue(e.args[1] is expr('P1_2 | P2_1'))
+    self.assertTrue(logic_expr.Expr('|', 'P1_2', 'P2_1') is e.args[1])
+    self.assertTrue(pickle.loads(pickle.dumps(e)) is e)
+    self.assertEqual(hash(e), hash(expr('B1_1 <=> (P1_2 | P2_1)')))
+
+  def test_immutable(self):
+    self.assertRaises(AttributeError, setattr, expr('P'), 'op', 'Q')
+
+  def test_bad_input(self):
+    self.assertRaises(SyntaxError, expr, 'P & ')
+    self.assertRaises(SyntaxError, expr, '(P | Q')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,77 @@
+import itertools
+import random
+import sat
+import unittest
+
+
+def brute_force(num_vars, clauses, assumptions=()):
+  for bits in itertools.product((False, True), repeat=num_vars):
+    model = (None,) + bits
+    if all(model[abs(lit)] == (lit > 0) for lit in assumptions) and \
+        all(any(model[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses):
+      return True
+  return False
+
+
+def pigeonhole(holes):
+  """Clauses saying holes+1 pigeons fit in holes holes (unsatisfiable)."""
+  var = lambda p, h: p * holes + h + 1
+  clauses = [[var(p, h) for h in range(holes)] for p in range(holes + 1)]
+  for h in range(holes):
+    for p, q in itertools.combinations(range(holes + 1), 2):
+      clauses.append([-var(p, h), -var(q, h)])
+  return clauses
+
+
+class Test(unittest.TestCase):
+  def test_random_3sat_matches_brute_force(self):
+    rng = random.Random(440)
+    for _ in range(300):
+      num_vars = rng.randint(3, 10)
+      clauses = [[rng.choice((1, -1)) * rng.randint(1, num_vars) for _ in range(3)]
+                 for _ in range(rng.randint(1, 5 * num_vars))]
+      solver = sat.Solver()
+      for clause in clauses:
+        solver.add_clause(clause)
+      result = solver.solve()
+      self.assertEqual(result, brute_force(num_vars, clauses))
+      if result:
+        for clause in clauses:
+          self.assertTrue(any(solver.value(lit) for lit in clause))
+
+  def test_assumptions_are_incremental(self):
+    rng = random.Random(7)
+    for _ in range(50):
+      num_vars = 8
+      clauses = [[rng.choice((1, -1)) * rng.randint(1, num_vars) for _ in range(3)]
+                 for _ in range(30)]
+      solver = sat.Solver()
+      for clause in clauses:
+        solver.add_clause(clause)
+      # Many queries against one solver, learnt clauses carried between them
+      for _ in range(10):
+        assumptions = [rng.choice((1, -1)) * v for v in rng.sample(range(1, num_vars + 1), 3)]
+        self.assertEqual(solver.solve(assumptions), brute_force(num_vars, clauses, assumptions))
+
+  def test_pigeonhole_is_unsat(self):
+    solver = sat.Solver()
+    for clause in pigeonhole(6):
+      solver.add_clause(clause)
+    self.assertFalse(solver.solve())
+
+  def test_named_variables(self):
+    solver = sat.Solver()
+    p, q = solver.var('P'), solver.var('Q')
+    solver.add_clause([-p, q])
+    self.assertEqual(solver.var('P'), p)
+    self.assertTrue(solver.solve([p]))
+    self.assertTrue(solver.value(q))
+    self.assertFalse(solver.solve([p, -q]))
+
+  def test_luby(self):
+    self.assertEqual([sat.luby(i) for i in range(15)],
+                     [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+
+if __name__ == '__main__':
+  unittest.main()
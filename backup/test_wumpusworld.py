@@ -10,6 +10,64 @@ class Test(unittest.TestCase):
     agent.KB.tell(logic.expr('B1_1'))
     agent.KB.tell(logic.expr('~P1_2'))
     self.assertTrue(logic_440.resolution(agent.KB, logic.expr('P2_1')))
+  def test_resolution_sees_later_tells(self):
+    agent = wumpusworld.WumpusWorldAgent(4)
+    kb = logic.PropKB()
+    for clause in agent.KB.clauses:
+      kb.tell(clause)
+    kb.tell(logic.expr('B1_1'))
+    self.assertFalse(logic_440.resolution(kb, logic.expr('P2_1')))
+    kb.tell(logic.expr('~P1_2'))
+    self.assertTrue(logic_440.resolution(kb, logic.expr('P2_1')))
+    kb.retract(logic.expr('~P1_2'))
+    self.assertFalse(logic_440.resolution(kb, logic.expr('P2_1')))
+
+  def test_resolution_after_retract_and_duplicate_tell(self):
+    kb = logic.PropKB()
+    kb.tell(logic.expr('A'))
+    kb.tell(logic.expr('B'))
+    self.assertTrue(logic_440.resolution(kb, logic.expr('A')))
+    kb.retract(logic.expr('A'))
+    kb.tell(logic.expr('B'))
+    self.assertEqual(kb.clauses, [logic.expr('B'), logic.expr('B')])
+    self.assertFalse(logic_440.resolution(kb, logic.expr('A')))
+    self.assertTrue(logic_440.resolution(kb, logic.expr('B')))
+
+  def test_tell_after_retract_defines_tseitin_names(self):
+    # Big enough for the Tseitin encoding: retracting it first must not
+    # leave its names behind without their definitions
+    sentence = logic.expr(' | '.join('(A%d & B%d)' % (i, i) for i in range(1, 8)))
+    for kb in [logic.PropKB(), logic.SatKB()]:
+      kb.retract(sentence)
+      kb.tell(sentence)
+      fresh = logic.PropKB(sentence)
+      self.assertEqual(kb.clauses, fresh.clauses)
+    for i in range(1, 8):
+      kb.tell(logic.expr('~A%d' % i))
+    self.assertFalse(kb.solver.solve())
+
+  def test_sat_kb_matches_resolution(self):
+    agent = wumpusworld.WumpusWorldAgent(4)
+    kb = logic.SatKB()
+    for clause in agent.KB.clauses:
+      kb.tell(clause)
+    for fact in ['B1_1', '~P1_2', 'S1_3', '~W1_1']:
+      agent.KB.tell(logic.expr(fact))
+      kb.tell(logic.expr(fact))
+    for query in ['P2_1', '~P2_1', 'W1_4', 'P1_3 | W2_3', 'P2_1 & ~P1_2']:
+      self.assertEqual(kb.ask(logic.expr(query)) is not False,
+                       logic_440.resolution(agent.KB, logic.expr(query)))
+
+  def test_batched_entailment_matches_ask(self):
+    agent = wumpusworld.WumpusWorldAgent(4)
+    for fact in ['~P1_1', '~W1_1', 'B1_1', '~S1_1', '~P1_2', '~W1_2', '~B1_2', 'S1_2']:
+      agent.KB.tell(logic.expr(fact))
+    queries = [logic.expr(p % (i, j)) for i in range(1, 5) for j in range(1, 5)
+               for p in ('P%d_%d', '~P%d_%d', 'W%d_%d', '~W%d_%d')]
+    expected = set(q for q in queries if agent.KB.ask(q) is not False)
+    self.assertEqual(agent.KB.entailed(queries), expected)
+    self.assertTrue(logic.expr('P2_1') in expected)
+
   def test_safe(self):
     agent = wumpusworld.WumpusWorldAgent(4)
     agent.KB.tell(logic.expr('P2_3'))
@@ -22,56 +22,65 @@ class WumpusWorldAgent(logic_440.KnowledgeBasedAgent):
   to a wumpus have a stench/one of the adjacent squares to a stench has a 
   wumpus. The goal here is to give the KB the minimum amount of information
   necessary, while still providing enough so that it can resolve any
-  information that it needs to obtain.
+  information that it needs to obtain. The clauses come straight from
+  cave_axioms, so no expression is parsed or converted to CNF.
   """
   def __init__(self, cave_size):
-    self.KB = logic.PropKB()
+    self.KB = logic.SatKB()
     self.size = cave_size
-    for i in range(1, cave_size + 1):
-      for j in range(1, cave_size + 1):
-        neighbors = get_neighbors(i, j, cave_size)
-        exp1 = 'B%d_%d <=> (' % (i,j)
-        exp2 = 'S%d_%d <=> (' % (i,j)
-        for k in range(len(neighbors)):
-          if k == len(neighbors) - 1:
-            exp1 += ' P%d_%d)' % neighbors[k]
-            exp2 += ' W%d_%d)' % neighbors[k]
-          else:
-            exp1 += ' P%d_%d |' % neighbors[k]
-            exp2 += ' W%d_%d |' % neighbors[k]
-        self.KB.tell(logic.expr(exp1))
-        self.KB.tell(logic.expr(exp2))
+    self._answers = None  # (KB version, entailed literals) for the current step
+    self.KB.tell_clauses(cave_axioms(cave_size))
+
+  """
+  Answer every per-cell question of this step in one batch: which of P, ~P,
+  W and ~W the KB entails for each cell.  The SAT solver behind the KB keeps
+  the clauses it learns between queries, and each model it finds rules out
+  many queries at once.  The answers are reused until the KB changes, so
+  safe() and not_unsafe() in the same step share one pass.
+  """
+  def entailed(self):
+    if self._answers is None or self._answers[0] != self.KB.version:
+      queries = []
+      for i in range(1, self.size + 1):
+        for j in range(1, self.size + 1):
+          for pattern in ('P%d_%d', '~P%d_%d', 'W%d_%d', '~W%d_%d'):
+            queries.append(logic.expr(pattern % (i,j)))
+      self._answers = (self.KB.version, self.KB.entailed(queries))
+    return self._answers[1]
 
   """
   Create a set of safe spaces, and, using two for loops, go throuh every space.
-  If we have safely visited the space, add it to the safe set. If we can resolve
+  If we have safely visited the space, add it to the safe set. If the KB entails
   that the space does not have a wumpus and does not have a pit, add it to the 
   safe set.
   """
   def safe(self):
+    entailed = self.entailed()
+    clauses = Set(self.KB.clauses)
     safe_set = Set([])
     for i in range(1, self.size + 1):
       for j in range(1, self.size + 1):
         not_pit    = logic.expr("~P%d_%d" % (i,j))
         not_wumpus = logic.expr("~W%d_%d" % (i,j))
-        if 'L%d_%d' in self.KB.clauses:
+        if logic.expr('L%d_%d' % (i,j)) in clauses:
           safe_set.add((i,j))
-        elif ((logic_440.resolution(self.KB, not_pit) and logic_440.resolution(self.KB, not_wumpus))):
+        elif not_pit in entailed and not_wumpus in entailed:
           safe_set.add((i,j))
     return safe_set
 
   """
   Create a set of not unsafe spaces, and, using two for loops, go through every space.
-  If we can resolve that the space does not contain a wumpus or a pit, add the space
+  If the KB does not entail that the space contains a wumpus or a pit, add the space
   to the set of not unsafe spaces.
   """
   def not_unsafe(self):
+    entailed = self.entailed()
     notunsafe_set = Set([])
     for i in range(1, self.size + 1):
       for j in range(1, self.size + 1):
         pit    = logic.expr("P%d_%d" % (i,j))
         wumpus = logic.expr("W%d_%d" % (i,j))
-        if not(((logic_440.resolution(self.KB, pit) or logic_440.resolution(self.KB, wumpus)))):
+        if pit not in entailed and wumpus not in entailed:
           notunsafe_set.add((i,j))
     return notunsafe_set
 
@@ -81,15 +90,32 @@ class WumpusWorldAgent(logic_440.KnowledgeBasedAgent):
   the set of unvisited spaces.
   """
   def unvisited(self):
+    clauses = Set(self.KB.clauses)
     unvisited = Set([])
     for i in range(1, self.size + 1):
       for j in range(1, self.size +1):
-        if logic.expr('L%d_%d' % (i,j)) not in self.KB.clauses:
+        if logic.expr('L%d_%d' % (i,j)) not in clauses:
           unvisited.add((i,j))
     return unvisited
 
 NEIGHBOR_DELTAS = ((+1, 0), (-1, 0), (0, +1), (0, -1))
 
+def cave_axioms(cave_size):
+  """
+  Generate the CNF clauses of B_i_j <=> (P_a | P_b | ...) and
+  S_i_j <=> (W_a | W_b | ...) for every square, as lists of literal strings.
+  These are exactly the clauses to_cnf makes of the biconditionals, in the
+  same order, in time and memory linear in the number of squares.
+  """
+  for i in range(1, cave_size + 1):
+    for j in range(1, cave_size + 1):
+      neighbors = ['%d_%d' % n for n in get_neighbors(i, j, cave_size)]
+      for percept, hazard in (('B', 'P'), ('S', 'W')):
+        square = '%s%d_%d' % (percept, i, j)
+        for n in neighbors:
+          yield ['~' + hazard + n, square]
+        yield [hazard + n for n in neighbors] + ['~' + square]
+
 def get_neighbors(x, y, cave_size):
   possible_neighbors = [(x + dx, y + dy) for dx, dy in NEIGHBOR_DELTAS]
   return [(x1, y1) for x1, y1 in possible_neighbors if 
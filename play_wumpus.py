@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from game.game import WumpusGame
 from agent.agent import Agent, AgentConfig
+from utils.constants import percept_text
 
 def main():
     """Main game entry point"""
@@ -74,8 +75,8 @@ def main():
                 elif user_input == 'test':
                     # Test percept detection
                     percepts = game.get_percepts()
-                    print(f"🧪 Current percepts: {percepts}")
-                    game.agent.update_knowledge(percepts)
+                    print(f"🧪 Current percepts: {percept_text(percepts)}")
+                    game.agent.infer_from_percept(percepts, game.agent.get_neighbors())
                     continue
                 elif user_input == 'auto':
                     # Let agent decide
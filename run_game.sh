@@ -187,7 +187,7 @@ main() {
     case $MODE in
         gui)
             print_info "Launching GUI mode..."
-            $PYTHON_CMD -m src.game.wumpus
+            $PYTHON_CMD -m src.game.wumpus --world "$WORLD_FILE"
             ;;
         console)
             print_info "Launching console mode..."
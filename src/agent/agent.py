@@ -1,21 +1,35 @@
 import random
-import time
 from dataclasses import dataclass
 from typing import Set, Tuple, List, Dict, Optional
-from ..utils.constants import percepts
+from ..utils.bitboard import BitGrid
+from ..utils.constants import DECISION_COST, PERCEPT_BREEZE, PERCEPT_GLITTER, PERCEPT_STENCH
+from .history import PathHistory
+from .knowledge import KnowledgeBase
+from .inference import CERTAINTY, HazardInference
+from .planning import PathPlanner, risky_path
+
+# Loop detection: some position more than LOOP_REPEATS times in the last LOOP_WINDOW
+LOOP_WINDOW = 6
+LOOP_REPEATS = 2
 
 @dataclass
 class AgentConfig:
-    starting_position: Tuple[int, int] = (9, 0)
+    starting_position: Optional[Tuple[int, int]] = None  # None: the world's start (bottom-left)
+    world_size: Tuple[int, int] = (10, 10)  # replaced by the loaded world's size
     movement_cost: int = 1
     arrow_count: int = 1
     arrow_cost: int = 10
     gold_reward: int = 1000
     death_penalty: int = 1000
+    pit_prior: float = 0.2  # hazard estimates for cells no percept says anything about
+    wumpus_prior: float = 0.05
     win_bonus: int = 500
     agent_symbol: str = 'A'
     trail_symbol: str = '.'
     expected_gold_count: int = 1
+    verbose: bool = True
+    seed: Optional[int] = None  # seeds the agent's own random choices; None: unseeded
+    history_size: int = 64  # latest path positions kept in memory; 10 or more keeps backtracking unchanged
 
     def get_config(self) -> Dict:
         return {k: v for k, v in self.__dict__.items()}
@@ -23,19 +37,22 @@ class AgentConfig:
 class Agent:
     def __init__(self, agent_config: AgentConfig):
         self.agent_config = agent_config
-        self.position = agent_config.starting_position
-        self.starting_position = agent_config.starting_position
-        self.path: List[Tuple[int, int]] = [self.position]
+        self.rng = random.Random(agent_config.seed)
+        self.grid = BitGrid(*agent_config.world_size)
+        self.starting_position = agent_config.starting_position or (self.grid.rows - 1, 0)
+        self.position = self.starting_position
+        self.path = PathHistory(agent_config.history_size, LOOP_WINDOW, LOOP_REPEATS)
+        self.path.append(self.position)
         self.arrow_count = agent_config.arrow_count
         self.gold_count = 0
         self.must_move = False
         self.is_alive = True
         self.score = 0
-        self.action_history: List[str] = []
-        self.position_history: List[Tuple[int, int]] = []
 
         # Knowledge base for tracking world state (from working version)
-        self.knowledge_base = [[[] for _ in range(10)] for _ in range(10)]
+        self.knowledge_base = KnowledgeBase(self.grid)
+        self.planner = PathPlanner(self.knowledge_base)
+        self.inference = HazardInference(self.agent_config.pit_prior, self.agent_config.wumpus_prior)
         self.found_gold = 0
         self.expected_gold = agent_config.expected_gold_count
         self.step_count = 0
@@ -52,7 +69,6 @@ class Agent:
 
         # Loop detection
         self.position_visit_count = {}
-        self.last_actions = []
         
         # Risky move tracking
         self.consecutive_no_safe_moves = 0
@@ -65,6 +81,12 @@ class Agent:
             'right': (0, 1)
         }
 
+    def set_world(self, world_size: Tuple[int, int], starting_position: Tuple[int, int]) -> None:
+        """Size the agent's knowledge for a world and start it afresh there"""
+        self.grid = BitGrid(*world_size)
+        self.starting_position = self.agent_config.starting_position or starting_position
+        self.reset()
+
     def get_position(self) -> Tuple[int, int]:
         return self.position
 
@@ -76,7 +98,7 @@ class Agent:
             return None
         dr, dc = self.directions[direction]
         row, col = self.position
-        if 0 <= row + dr < 10 and 0 <= col + dc < 10:
+        if 0 <= row + dr < self.grid.rows and 0 <= col + dc < self.grid.cols:
             return (row + dr, col + dc)
         return None
 
@@ -116,7 +138,7 @@ class Agent:
         return self.gold_count == self.agent_config.expected_gold_count
 
     def get_random_direction(self) -> str:
-        d_int = random.randint(1, 4)
+        d_int = self.rng.randint(1, 4)
         if d_int == 1:
             return "left"
         if d_int == 2:
@@ -131,7 +153,7 @@ class Agent:
         neighbors = []
         for dr, dc in self.directions.values():
             nr, nc = self.position[0] + dr, self.position[1] + dc
-            if 0 <= nr < 10 and 0 <= nc < 10:
+            if 0 <= nr < self.grid.rows and 0 <= nc < self.grid.cols:
                 neighbors.append((nr, nc))
         return neighbors
 
@@ -141,7 +163,7 @@ class Agent:
         directions = [(-1, 0), (1, 0), (0, -1), (0, 1)]
         for dx, dy in directions:
             new_x, new_y = x + dx, y + dy
-            if 0 <= new_x < 10 and 0 <= new_y < 10:
+            if 0 <= new_x < self.grid.rows and 0 <= new_y < self.grid.cols:
                 neighbors.append((new_x, new_y))
         return neighbors
 
@@ -154,65 +176,51 @@ class Agent:
             return 'down' if dx > 0 else 'up'
         return None
 
-    def AI_play(self, percept: str):
+    def AI_play(self, percept: int):
         """Enhanced AI logic from working version"""
-        global percepts
-        
-        # get the current cell
-        current_x, current_y = self.position
+        kb = self.knowledge_base
+        cell = self.position
         
         # Increment step count and decrease score
         self.step_count += 1
-        self.score -= 1  # -1 for each step
+        self.score -= DECISION_COST
         
         # Reset sensing information
         self.current_breeze = False
         self.current_stench = False
 
         # Get the valid neighboring cells
-        valid_neighbors = self.get_valid_neighbors(current_x, current_y)
+        valid_neighbors = self.get_valid_neighbors(*cell)
 
         # Mark the current position as visited
-        if 'V' not in self.knowledge_base[current_x][current_y]:
-            self.knowledge_base[current_x][current_y].append('V')
+        kb.add(cell, 'V')
 
         # Add knowledge that this cell doesn't have gold (since we would have found it)
-        if 'G' not in percept:
-            self.knowledge_base[current_x][current_y].append('~G')
+        if not percept & PERCEPT_GLITTER:
+            kb.add(cell, '~G')
 
         # Check if Breeze is Present
-        if 'B' in percept:
+        if percept & PERCEPT_BREEZE:
             self.current_breeze = True
-            self.knowledge_base[current_x][current_y].append('B')
-            for neighbor in valid_neighbors:
-                if 'P?' not in self.knowledge_base[neighbor[0]][neighbor[1]]:
-                    self.knowledge_base[neighbor[0]][neighbor[1]].append('P?')
+            kb.add(cell, 'B')
+            kb.add_all(valid_neighbors, 'P?')
         else:
-            self.knowledge_base[current_x][current_y].append('~B')
-            for neighbor in valid_neighbors:
-                if '~P' not in self.knowledge_base[neighbor[0]][neighbor[1]]:
-                    self.knowledge_base[neighbor[0]][neighbor[1]].append('~P')
+            kb.add(cell, '~B')
+            kb.add_all(valid_neighbors, '~P')
 
         # Check if Stench is Present
-        if 'S' in percept:
+        if percept & PERCEPT_STENCH:
             self.current_stench = True
-            self.knowledge_base[current_x][current_y].append('S')
-            for neighbor in valid_neighbors:
-                if 'W?' not in self.knowledge_base[neighbor[0]][neighbor[1]]:
-                    self.knowledge_base[neighbor[0]][neighbor[1]].append('W?')
+            kb.add(cell, 'S')
+            kb.add_all(valid_neighbors, 'W?')
         else:
-            self.knowledge_base[current_x][current_y].append('~S')
-            for neighbor in valid_neighbors:
-                if '~W' not in self.knowledge_base[neighbor[0]][neighbor[1]]:
-                    self.knowledge_base[neighbor[0]][neighbor[1]].append('~W')
-
-        # Update percepts for visited cells
-        for neighbor in valid_neighbors:
-            if 'V' in percepts[neighbor[0]][neighbor[1]]:
-                if '~P' not in self.knowledge_base[neighbor[0]][neighbor[1]]:
-                    self.knowledge_base[neighbor[0]][neighbor[1]].append('~P')
-                if '~W' not in self.knowledge_base[neighbor[0]][neighbor[1]]:
-                    self.knowledge_base[neighbor[0]][neighbor[1]].append('~W')
+            kb.add(cell, '~S')
+            kb.add_all(valid_neighbors, '~W')
+
+        # Visited neighbors are free of both hazards
+        visited_neighbors = [n for n in valid_neighbors if kb.has(n, 'V')]
+        kb.add_all(visited_neighbors, '~P')
+        kb.add_all(visited_neighbors, '~W')
 
         # Check for new sensing events
         if self.is_alive:
@@ -227,9 +235,8 @@ class Agent:
         # First priority: Find unvisited safe neighbors
         unvisited_safe = []
         for x, y in neighbors:
-            if ('V' not in self.knowledge_base[x][y] and 
-                '~P' in self.knowledge_base[x][y] and 
-                '~W' in self.knowledge_base[x][y]):
+            if (not self.knowledge_base.has((x, y), 'V') and 
+                self.knowledge_base.is_safe((x, y))):
                 unvisited_safe.append((x, y))
         
         # If we have unvisited safe neighbors, choose the least visited one
@@ -240,19 +247,31 @@ class Agent:
             unvisited_safe.sort(key=lambda pos: self.position_visit_count.get(pos, 0))
             return self._get_direction_to(unvisited_safe[0])
         
-        # If all gold is found, return to start
+        # If all gold is found, return to start (O(1) per step on the cached distance field)
         if self.found_gold >= self.expected_gold:
             if self.position != self.starting_position:
-                path_to_start = self.find_path_to_start()
-                if path_to_start:
-                    next_step = path_to_start[0]
+                next_step = self.planner.next_step(self.position, [self.starting_position])
+                if next_step:
                     return self._get_direction_to(next_step)
         
+        # Follow a safe path to the nearest unvisited safe cell
+        if self.knowledge_base.frontier:
+            next_step = self.planner.next_step(self.position, self.knowledge_base.frontier)
+            if next_step:
+                self.consecutive_no_safe_moves = 0
+                return self._get_direction_to(next_step)
+
+        # Nothing safe left to explore: wandering the visited cells cannot find the
+        # gold, so take the cheapest calculated risk instead
+        if self.found_gold < self.expected_gold:
+            risky_move = self.choose_risky_move()
+            if risky_move:
+                return risky_move
+
         # Find safe neighbors (visited or not)
         safe_neighbors = []
         for x, y in neighbors:
-            if ('~P' in self.knowledge_base[x][y] and 
-                '~W' in self.knowledge_base[x][y]):
+            if self.knowledge_base.is_safe((x, y)):
                 safe_neighbors.append((x, y))
         
         # If we have safe neighbors, prefer less visited ones
@@ -262,21 +281,6 @@ class Agent:
             safe_neighbors.sort(key=lambda pos: self.position_visit_count.get(pos, 0))
             return self._get_direction_to(safe_neighbors[0])
         
-        # If no safe moves, try to find a path to an unvisited safe cell
-        unvisited_safe_cells = []
-        for x in range(10):
-            for y in range(10):
-                if ('V' not in self.knowledge_base[x][y] and 
-                    '~P' in self.knowledge_base[x][y] and 
-                    '~W' in self.knowledge_base[x][y]):
-                    unvisited_safe_cells.append((x, y))
-        
-        if unvisited_safe_cells:
-            # Try to find a path to the nearest unvisited safe cell
-            path = self.find_path_to_target(unvisited_safe_cells[0])
-            if path:
-                return self._get_direction_to(path[0])
-        
         # Increment consecutive no safe moves counter
         self.consecutive_no_safe_moves += 1
         
@@ -284,141 +288,98 @@ class Agent:
         if self.consecutive_no_safe_moves >= self.risky_move_threshold:
             risky_move = self.choose_risky_move()
             if risky_move:
-                print(f"Taking risky move after {self.consecutive_no_safe_moves} consecutive no-safe-moves")
+                if self.agent_config.verbose:
+                    print(f"Taking risky move after {self.consecutive_no_safe_moves} consecutive no-safe-moves")
                 return risky_move
         
         # Last resort: backtrack intelligently
         if len(self.path) > 1:
             # Find a previous position that's safe and not recently visited
-            for i in range(len(self.path) - 2, max(0, len(self.path) - 10), -1):
-                prev_pos = self.path[i]
+            for back in range(2, min(10, len(self.path))):
+                prev_pos = self.path[-back]
                 if (prev_pos != self.position and 
-                    '~P' in self.knowledge_base[prev_pos[0]][prev_pos[1]] and 
-                    '~W' in self.knowledge_base[prev_pos[0]][prev_pos[1]]):
+                    self.knowledge_base.is_safe(prev_pos)):
                     return self._get_direction_to(prev_pos)
         
         return None
 
     def choose_risky_move(self) -> Optional[str]:
-        """Choose a risky move when no safe moves are available"""
-        current_x, current_y = self.position
-        neighbors = self.get_valid_neighbors(current_x, current_y)
-        
-        # Categorize neighbors by risk level
-        unknown_neighbors = []  # Neighbors with no knowledge (could be anything)
-        pit_suspected = []      # Neighbors suspected to have pits
-        wumpus_suspected = []   # Neighbors suspected to have wumpus
-        
-        for x, y in neighbors:
-            # Skip if we know for certain it's dangerous
-            if ('P' in self.knowledge_base[x][y] or 
-                'W' in self.knowledge_base[x][y]):
+        """Choose a risky move when no safe moves are available.
+
+        Plans the cheapest route into an unexplored cell, where each step costs
+        movement_cost plus death_penalty times the cell's estimated hazard.
+        """
+        path = risky_path(self.knowledge_base, self.position, self.hazard_probability,
+                          self.agent_config.movement_cost, self.agent_config.death_penalty)
+        if not path:
+            return None
+        next_step = path[0]
+
+        # If the best risky cell next to us may hold the Wumpus, let decide_action shoot first
+        if (len(path) == 1 and self.arrow_count > 0 and
+                self.knowledge_base.has(next_step, 'W?') and
+                not self.knowledge_base.has(next_step, '~W')):
+            return None
+
+        if self.agent_config.verbose and len(path) == 1:
+            print(f"WARNING: Taking risky move to {next_step} "
+                  f"(estimated hazard {self.hazard_probability(next_step):.2f})")
+        return self._get_direction_to(next_step)
+
+    def hazard_probability(self, cell: Tuple[int, int]) -> float:
+        """Estimated probability that entering cell is fatal (pit or Wumpus)"""
+        pit = self.inference.pit_probability(cell)
+        if pit is None or self.knowledge_base.has(cell, '~P'):
+            pit = self._suspicion(cell, 'P', '~P', 'B', self.agent_config.pit_prior)
+        wumpus = self.inference.wumpus_probability(cell)
+        if wumpus is None or self.knowledge_base.has(cell, '~W'):
+            wumpus = self._suspicion(cell, 'W', '~W', 'S', self.agent_config.wumpus_prior)
+        return 1.0 - (1.0 - pit) * (1.0 - wumpus)
+
+    def _suspicion(self, cell: Tuple[int, int], known: str, cleared: str,
+                   sensed: str, prior: float) -> float:
+        """Heuristic hazard probability for cells the exact inference does not cover.
+
+        Each neighbor that sensed the hazard has it in one of its uncleared
+        neighbors, so it contributes 1/(number of uncleared candidates).
+        """
+        kb = self.knowledge_base
+        if kb.has(cell, cleared):
+            return 0.0
+        if kb.has(cell, known):
+            return 1.0
+        probability = None
+        for neighbor in self.get_valid_neighbors(*cell):
+            if not kb.has(neighbor, sensed):
                 continue
-                
-            # Check if it's completely unknown
-            if (not any(item in self.knowledge_base[x][y] for item in ['P?', 'W?', '~P', '~W']) and
-                'V' not in self.knowledge_base[x][y]):
-                unknown_neighbors.append((x, y))
-            # Check if only pit is suspected
-            elif ('P?' in self.knowledge_base[x][y] and 
-                  'W?' not in self.knowledge_base[x][y] and
-                  '~W' in self.knowledge_base[x][y]):
-                pit_suspected.append((x, y))
-            # Check if only wumpus is suspected  
-            elif ('W?' in self.knowledge_base[x][y] and 
-                  'P?' not in self.knowledge_base[x][y] and
-                  '~P' in self.knowledge_base[x][y]):
-                wumpus_suspected.append((x, y))
-        
-        # Prefer unknown neighbors (lowest risk)
-        if unknown_neighbors:
-            target = random.choice(unknown_neighbors)
-            return self._get_direction_to(target)
-        
-        # If we have arrows and there are wumpus-suspected neighbors, try shooting first
-        if self.arrow_count > 0 and wumpus_suspected:
-            target = random.choice(wumpus_suspected)
-            direction = self._get_direction_to(target)
-            if direction:
-                # This will be handled in decide_action as a shoot action
-                return None
-        
-        # If we must move and only have risky options, prefer pit over wumpus
-        # (pit might be survivable with luck, wumpus is certain death)
-        if pit_suspected:
-            target = random.choice(pit_suspected)
-            print(f"WARNING: Taking risky move to suspected pit at {target}")
-            return self._get_direction_to(target)
-        
-        if wumpus_suspected:
-            target = random.choice(wumpus_suspected)
-            print(f"WARNING: Taking risky move to suspected wumpus at {target}")
-            return self._get_direction_to(target)
-        
-        # If no risky moves available, return None
-        return None
+            candidates = sum(1 for n in self.get_valid_neighbors(*neighbor)
+                             if not kb.has(n, cleared))
+            probability = max(probability or 0.0, 1.0 / max(candidates, 1))
+        return prior if probability is None else probability
 
     def find_path_to_start(self) -> Optional[List[Tuple[int, int]]]:
-        """Find a path back to the starting position using BFS"""
-        from collections import deque
-        
-        start = self.position
-        target = self.starting_position
-        
-        if start == target:
-            return [target]
-        
-        queue = deque([(start, [start])])
-        visited = {start}
-        
-        while queue:
-            (current, path) = queue.popleft()
-            
-            for neighbor in self.get_valid_neighbors(current[0], current[1]):
-                if (neighbor not in visited and 
-                    '~P' in self.knowledge_base[neighbor[0]][neighbor[1]] and
-                    '~W' in self.knowledge_base[neighbor[0]][neighbor[1]]):
-                    new_path = path + [neighbor]
-                    if neighbor == target:
-                        return new_path[1:]  # Return path excluding current position
-                    queue.append((neighbor, new_path))
-                    visited.add(neighbor)
-        
-        return None  # No path found
+        """Find a path back to the starting position over known-safe cells"""
+        return self.find_path_to_target(self.starting_position)
 
     def find_path_to_target(self, target: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
-        """Find a path to a target position using BFS"""
-        from collections import deque
-        
-        start = self.position
-        
-        if start == target:
+        """Find a path to a target position using the cached distance field"""
+        if self.position == target:
             return [target]
-        
-        queue = deque([(start, [start])])
-        visited = {start}
-        
-        while queue:
-            (current, path) = queue.popleft()
-            
-            for neighbor in self.get_valid_neighbors(current[0], current[1]):
-                if (neighbor not in visited and 
-                    '~P' in self.knowledge_base[neighbor[0]][neighbor[1]] and
-                    '~W' in self.knowledge_base[neighbor[0]][neighbor[1]]):
-                    new_path = path + [neighbor]
-                    if neighbor == target:
-                        return new_path[1:]  # Return path excluding current position
-                    queue.append((neighbor, new_path))
-                    visited.add(neighbor)
-        
-        return None  # No path found
+        path = self.planner.path(self.position, [target])
+        return path or None  # No path found
+
+    def find_path_to_frontier(self) -> Optional[List[Tuple[int, int]]]:
+        """Find a safe path to the nearest frontier cell (safe but unvisited)"""
+        frontier = self.knowledge_base.frontier
+        if not frontier:
+            return None
+        return self.planner.path(self.position, frontier) or None
 
     def has_safe_moves(self) -> bool:
         """Check if agent has any safe moves available"""
         neighbors = self.get_valid_neighbors(self.position[0], self.position[1])
         for x, y in neighbors:
-            if ('~P' in self.knowledge_base[x][y] and 
-                '~W' in self.knowledge_base[x][y]):
+            if self.knowledge_base.is_safe((x, y)):
                 return True
         return False
 
@@ -429,109 +390,87 @@ class Agent:
         if current_visits > 3:
             return True
         
-        # Check if we've been oscillating between same positions
-        if len(self.path) < 6:
-            return False
-        
-        recent_positions = self.path[-6:]
-        position_counts = {}
-        for pos in recent_positions:
-            position_counts[pos] = position_counts.get(pos, 0) + 1
-        
-        # If any position appears more than 2 times in last 6 moves, we're likely in a loop
-        for count in position_counts.values():
-            if count > 2:
-                return True
-        
-        return False
+        # Check if we've been oscillating between same positions: any position more
+        # than LOOP_REPEATS times in the last LOOP_WINDOW moves, from rolling counts
+        return self.path.looping()
 
     def infer_wumpus_shoot(self, neighbors) -> Tuple[str, str]:
-        """Enhanced Wumpus shooting logic with knowledge base"""
-        pot_cells = []
-        definite_wumpus = []
-        
-        # Check for definite wumpus locations (only one possible location for stench)
+        """Wumpus shooting logic driven by the exact P(wumpus) of each neighbor"""
+        # Neighbors that may hold the Wumpus, most likely first
+        chances = {}
         for neighbor in neighbors:
-            r, c = neighbor
-            if 'W?' in self.knowledge_base[r][c] and '~W' not in self.knowledge_base[r][c]:
-                pot_cells.append(neighbor)
-                
-                # Check if this is the only possible wumpus location
-                # by counting other possible wumpus locations
-                other_wumpus_candidates = 0
-                for other_neighbor in neighbors:
-                    or_r, or_c = other_neighbor
-                    if (other_neighbor != neighbor and 
-                        'W?' in self.knowledge_base[or_r][or_c] and 
-                        '~W' not in self.knowledge_base[or_r][or_c]):
-                        other_wumpus_candidates += 1
-                
-                if other_wumpus_candidates == 0:
-                    definite_wumpus.append(neighbor)
-        
-        # Shoot at definite wumpus locations first
-        if definite_wumpus:
-            target = definite_wumpus[0]
-            direction = self._get_direction_to(target)
+            probability = self.inference.wumpus_probability(neighbor)
+            if probability is not None and probability > CERTAINTY:
+                chances[neighbor] = probability
+        pot_cells = sorted(chances, key=chances.get, reverse=True)
+        if not pot_cells:
+            return "pass", "pass"
+
+        # Shoot at a certain wumpus location first
+        if chances[pot_cells[0]] >= 1 - CERTAINTY:
+            direction = self._get_direction_to(pot_cells[0])
             if direction:
                 return "shoot", direction
-        
+
         # If we have a stench and only one possible wumpus location, shoot
         if self.current_stench and len(pot_cells) == 1:
             direction = self._get_direction_to(pot_cells[0])
             if direction:
                 return "shoot", direction
-        
-        # If we're in a loop and have arrows, shoot at suspected wumpus
-        if self.is_in_loop() and len(pot_cells) > 0:
-            target = random.choice(pot_cells)
-            direction = self._get_direction_to(target)
-            if direction:
-                return "shoot", direction
-        
-        # If no safe moves and we're considering risky moves, shoot at wumpus suspects
-        if (self.consecutive_no_safe_moves >= self.risky_move_threshold and 
-            len(pot_cells) > 0):
-            target = random.choice(pot_cells)
-            direction = self._get_direction_to(target)
-            if direction:
-                return "shoot", direction
-        
-        # If we're stuck and have arrows, try shooting at any suspected wumpus
-        if len(pot_cells) > 0 and not self.has_safe_moves():
-            target = random.choice(pot_cells)
-            direction = self._get_direction_to(target)
+
+        # If we're in a loop, considering risky moves or stuck, shoot the likeliest suspect
+        if (self.is_in_loop() or
+                self.consecutive_no_safe_moves >= self.risky_move_threshold or
+                not self.has_safe_moves()):
+            direction = self._get_direction_to(pot_cells[0])
             if direction:
                 return "shoot", direction
-                
-        return "pass", "pass"
-
-    def infer_pit(self, neighbors) -> None:
-        """Pit inference logic with knowledge base"""
-        pot_cell = set()
-        for neighbor in neighbors:
-            r, c = neighbor
-            if 'P?' in self.knowledge_base[r][c] and '~P' not in self.knowledge_base[r][c]:
-                pot_cell.add((r, c))
-        
-        if len(pot_cell) == 1:
-            r, c = pot_cell.pop()
-            self.knowledge_base[r][c].append('P')
-            if 'P?' in self.knowledge_base[r][c]:
-                self.knowledge_base[r][c].remove('P?')
 
-    def decide_action(self, percept: str) -> Tuple[str, str]:
-        """Enhanced decision making with AI logic, loop prevention, and risky moves"""
-        global percepts
-        time.sleep(0.1)  # Reduced delay to prevent excessive waiting
+        return "pass", "pass"
 
+    def infer_from_percept(self, percept: int, neighbors: List[Tuple[int, int]]) -> None:
+        """Mark the neighbors a breeze or stench implicates and update the hazard probabilities"""
+        visited_neighbors = [n for n in neighbors if self.knowledge_base.has(n, 'V')]
+        unvisited_neighbors = [n for n in neighbors if n not in visited_neighbors]
+        if percept & PERCEPT_STENCH:
+            self.knowledge_base.add_all(visited_neighbors, '~W')
+            self.knowledge_base.add_all(unvisited_neighbors, 'W?')
+
+        if percept & PERCEPT_BREEZE:
+            self.knowledge_base.add_all(visited_neighbors, '~P')
+            self.knowledge_base.add_all(unvisited_neighbors, 'P?')
+
+        self.inference.update(self.knowledge_base)
+
+    def infer_pit(self) -> None:
+        """Record the pits and pit-free cells the exact inference proves"""
+        self._apply_certainties(self.inference.pit.probabilities, 'P', '~P', 'P?')
+
+    def infer_wumpus(self) -> None:
+        """Record the Wumpus and Wumpus-free cells the exact inference proves"""
+        self._apply_certainties(self.inference.wumpus.probabilities, 'W', '~W', 'W?')
+
+    def _apply_certainties(self, probabilities: Dict[Tuple[int, int], float],
+                           present: str, absent: str, suspected: str) -> None:
+        kb = self.knowledge_base
+        for cell, probability in probabilities.items():
+            if probability >= 1 - CERTAINTY and not kb.has(cell, present):
+                kb.add(cell, present)
+                kb.discard(cell, suspected)
+            elif probability <= CERTAINTY and not kb.has(cell, absent):
+                kb.add(cell, absent)
+                kb.discard(cell, suspected)
+
+    def decide_action(self, percept: int) -> Tuple[str, str]:
+        """Enhanced decision making with AI logic, loop prevention, and risky moves.
+        percept is the bitmask of the agent's cell (utils.constants PERCEPT_* bits)."""
         # Run AI analysis
         self.AI_play(percept)
 
         if self.gold_count == self.agent_config.expected_gold_count:
             return 'win', "congratulations!"
 
-        if 'G' in percept and '~G' not in percept:
+        if percept & PERCEPT_GLITTER:
             return 'grab', "Grabbing gold"
 
         neighbors = self.get_neighbors()
@@ -545,34 +484,16 @@ class Agent:
             
             # If we're in a loop and no arrows, try to break out with exploration
             for r, c in neighbors:
-                if ('~P' in self.knowledge_base[r][c] and 
-                    '~W' in self.knowledge_base[r][c] and
+                if (self.knowledge_base.is_safe((r, c)) and
                     self.position_visit_count.get((r, c), 0) < 2):
                     direction = self._get_direction_to((r, c))
                     if direction:
                         return 'move', direction
 
-        # Add inference if breeze or stench is detected
-        if 'S' in percept:
-            for r, c in neighbors:
-                if 'V' in percepts[r][c]:
-                    if '~W' not in self.knowledge_base[r][c]:
-                        self.knowledge_base[r][c].append('~W')
-                else:
-                    if 'W?' not in self.knowledge_base[r][c]:
-                        self.knowledge_base[r][c].append('W?')
-
-        if 'B' in percept:
-            for r, c in neighbors:
-                if 'V' in percepts[r][c]:
-                    if '~P' not in self.knowledge_base[r][c]:
-                        self.knowledge_base[r][c].append('~P')
-                else:
-                    if 'P?' not in self.knowledge_base[r][c]:
-                        self.knowledge_base[r][c].append('P?')
-
-        # Infer pit locations
-        self.infer_pit(neighbors)
+        # Infer hazard probabilities and record what they prove
+        self.infer_from_percept(percept, neighbors)
+        self.infer_pit()
+        self.infer_wumpus()
         
         # Try shooting if we have arrows and good targets
         if self.arrow_count > 0:
@@ -593,9 +514,9 @@ class Agent:
 
         # Explore unknown neighbors if no threat known
         for r, c in neighbors:
-            if ('V' not in percepts[r][c] and 
-                'W?' not in self.knowledge_base[r][c] and 
-                'P?' not in self.knowledge_base[r][c]):
+            if (not self.knowledge_base.has((r, c), 'V') and 
+                not self.knowledge_base.has((r, c), 'W?') and 
+                not self.knowledge_base.has((r, c), 'P?')):
                 direction = self._get_direction_to((r, c))
                 if direction:
                     return 'move', direction
@@ -603,7 +524,7 @@ class Agent:
         # If we're really stuck, try shooting at any suspected wumpus
         if self.arrow_count > 0:
             for r, c in neighbors:
-                if 'W?' in self.knowledge_base[r][c]:
+                if self.knowledge_base.has((r, c), 'W?'):
                     direction = self._get_direction_to((r, c))
                     if direction:
                         return 'shoot', direction
@@ -611,8 +532,7 @@ class Agent:
         # Emergency fallback: move to least visited safe neighbor
         safe_neighbors = []
         for r, c in neighbors:
-            if ('~P' in self.knowledge_base[r][c] and 
-                '~W' in self.knowledge_base[r][c]):
+            if self.knowledge_base.is_safe((r, c)):
                 safe_neighbors.append((r, c))
         
         if safe_neighbors:
@@ -674,6 +594,7 @@ class Agent:
         }
 
     def reset(self) -> None:
+        self.rng = random.Random(self.agent_config.seed)
         self.position = self.starting_position
         self.arrow_count = self.agent_config.arrow_count
         self.gold_count = 0
@@ -682,13 +603,13 @@ class Agent:
         self.score = 0
         self.step_count = 0
         self.game_won = False
-        self.path = [self.starting_position]
-        self.action_history.clear()
-        self.position_history.clear()
-        self.knowledge_base = [[[] for _ in range(10)] for _ in range(10)]
+        self.path.clear()
+        self.path.append(self.starting_position)
+        self.knowledge_base = KnowledgeBase(self.grid)
+        self.planner = PathPlanner(self.knowledge_base)
+        self.inference = HazardInference(self.agent_config.pit_prior, self.agent_config.wumpus_prior)
         self.recent_events = []
         self.last_sensing_state = {"breeze": False, "stench": False}
         self.must_move = False
         self.position_visit_count = {}
-        self.last_actions = []
         self.consecutive_no_safe_moves = 0
\ No newline at end of file
@@ -0,0 +1,98 @@
+from collections import deque
+from typing import Callable, Deque, Dict, Iterator, Optional, Tuple
+
+Cell = Tuple[int, int]
+
+
+class PathHistory:
+    """The cells an agent has stood on, in bounded memory.
+
+    The latest capacity positions are kept in a ring buffer.  Rolling counts of
+    the last window positions answer the loop check (some cell seen more than
+    repeat_limit times in the window) in O(1), and counts over the whole path
+    answer membership without keeping it.  Positions that fall off the buffer
+    are passed to spill when it is set, e.g. list.append to keep the full path.
+
+    Indexing and len() cover the buffered positions only; pop() undoes the
+    latest append, as long as some positions are still buffered.
+    """
+    __slots__ = ('capacity', 'window', 'repeat_limit', 'spill',
+                 '_cells', '_counts', '_window_counts', '_repeated')
+
+    def __init__(self, capacity: int = 64, window: int = 6, repeat_limit: int = 2,
+                 spill: Optional[Callable[[Cell], None]] = None):
+        if capacity <= window:
+            raise ValueError(f"History capacity {capacity} must exceed the loop window {window}")
+        self.capacity = capacity
+        self.window = window
+        self.repeat_limit = repeat_limit
+        self.spill = spill
+        self.clear()
+
+    def clear(self) -> None:
+        """Forget every position (spill is kept)"""
+        self._cells: Deque[Cell] = deque()
+        self._counts: Dict[Cell, int] = {}
+        self._window_counts: Dict[Cell, int] = {}
+        self._repeated = 0  # cells seen more than repeat_limit times in the window
+
+    def append(self, cell: Cell) -> None:
+        cells = self._cells
+        cells.append(cell)
+        self._counts[cell] = self._counts.get(cell, 0) + 1
+        self._enter_window(cell)
+        if len(cells) > self.window:
+            self._leave_window(cells[-self.window - 1])
+        if len(cells) > self.capacity:
+            dropped = cells.popleft()
+            if self.spill is not None:
+                self.spill(dropped)
+
+    def pop(self) -> Cell:
+        """Remove and return the latest position"""
+        cells = self._cells
+        cell = cells.pop()
+        count = self._counts[cell] - 1
+        if count:
+            self._counts[cell] = count
+        else:
+            del self._counts[cell]
+        self._leave_window(cell)
+        if len(cells) >= self.window:
+            self._enter_window(cells[-self.window])
+        return cell
+
+    def _enter_window(self, cell: Cell) -> None:
+        count = self._window_counts.get(cell, 0) + 1
+        self._window_counts[cell] = count
+        if count == self.repeat_limit + 1:
+            self._repeated += 1
+
+    def _leave_window(self, cell: Cell) -> None:
+        count = self._window_counts[cell]
+        if count == self.repeat_limit + 1:
+            self._repeated -= 1
+        if count == 1:
+            del self._window_counts[cell]
+        else:
+            self._window_counts[cell] = count - 1
+
+    def looping(self) -> bool:
+        """Whether the window is full and some cell appears in it more than repeat_limit times"""
+        return self._repeated > 0 and len(self._cells) >= self.window
+
+    def count(self, cell: Cell) -> int:
+        """Times cell appears in the whole path"""
+        return self._counts.get(cell, 0)
+
+    def __contains__(self, cell: Cell) -> bool:
+        return cell in self._counts
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def __getitem__(self, index: int) -> Cell:
+        return self._cells[index]
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self._cells)
@@ -0,0 +1,219 @@
+"""Exact hazard probabilities for the cells bordering the explored region.
+
+Pits and Wumpuses are modelled as independent per-cell Bernoulli variables
+with the agent's priors.  Every visited cell that sensed a breeze (stench)
+contributes a constraint "at least one of my uncleared neighbours holds a pit
+(Wumpus)"; cells that sensed nothing have already cleared their neighbours in
+the knowledge base.  Two fringe cells interact only if they share such a
+constraint, so the fringe splits into independent connected components and the
+posterior of each component is enumerated on its own with NumPy: the cost is
+exponential in the largest component, not in the whole fringe.
+
+Evidence only accumulates, so most components are unchanged from one step to
+the next.  The models keep their constraints and components between updates
+and rebuild only those touched by cells whose tags changed.
+"""
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+import numpy as np
+from .knowledge import KnowledgeBase
+
+Cell = Tuple[int, int]
+Constraint = FrozenSet[Cell]
+
+
+class Component(NamedTuple):
+    key: Tuple[FrozenSet[Cell], FrozenSet[Constraint]]  # its cells and constraints
+    owners: List[Cell]  # the sensed cells whose constraints it holds
+    probabilities: Optional[Dict[Cell, float]]  # None: too large or contradictory
+
+# Components larger than this are not enumerated (2^16 assignments take ~30 ms,
+# and each extra cell doubles that); their cells get no estimate here, and
+# Agent.hazard_probability falls back to its per-neighbor heuristic for them
+MAX_COMPONENT_SIZE = 16
+# Assignments enumerated per NumPy batch (bounds peak memory)
+BATCH_BITS = 16
+# Probabilities this close to 0 or 1 are treated as certain
+CERTAINTY = 1e-9
+
+
+class HazardModel:
+    """Posterior probabilities of one hazard (pit or Wumpus) over the fringe"""
+
+    def __init__(self, cleared: str, sensed: str, prior: float):
+        self.cleared = cleared  # tag marking cells known free of the hazard
+        self.sensed = sensed    # tag marking visited cells that sensed it
+        self.prior = prior
+        self.probabilities: Dict[Cell, float] = {}
+        # The evidence as of the last update: the two planes' rows, the
+        # constraint of every sensed cell, and the components they form
+        self._sensed_rows: List[int] = []
+        self._cleared_rows: List[int] = []
+        self._constraints: Dict[Cell, Constraint] = {}
+        self._components: Dict[int, Component] = {}
+        self._component_of: Dict[Cell, int] = {}  # fringe cell -> component id
+        self._next_id = 0
+
+    def update(self, knowledge: KnowledgeBase) -> None:
+        """Bring the posteriors up to date with the evidence added since the last call.
+
+        Only the constraints of sensed cells whose own tag changed, or next to a
+        cell whose cleared tag changed, are recomputed, and only the components
+        they touch are regrouped and enumerated again."""
+        grid = knowledge.grid
+        sensed_rows, cleared_rows = knowledge.planes[self.sensed], knowledge.planes[self.cleared]
+        if sensed_rows == self._sensed_rows and cleared_rows == self._cleared_rows:
+            return
+        if len(self._sensed_rows) != grid.rows:
+            self._sensed_rows, self._cleared_rows = [0] * grid.rows, [0] * grid.rows
+
+        dirty = set(changed_cells(sensed_rows, self._sensed_rows))
+        for cell in changed_cells(cleared_rows, self._cleared_rows):
+            dirty.update(grid_neighbors(grid.rows, grid.cols, cell))
+        self._sensed_rows, self._cleared_rows = sensed_rows[:], cleared_rows[:]
+
+        affected = set()  # ids of components to regroup
+        owners = set()    # sensed cells whose constraints they (and new constraints) hold
+        for cell in dirty:
+            old = self._constraints.get(cell)
+            new = None
+            if knowledge.has(cell, self.sensed):
+                new = frozenset(n for n in grid_neighbors(grid.rows, grid.cols, cell)
+                                if not knowledge.has(n, self.cleared)) or None
+            if new == old:
+                continue
+            for constraint in (old, new):
+                for member in constraint or ():
+                    if member in self._component_of:
+                        affected.add(self._component_of[member])
+            if new is None:
+                del self._constraints[cell]
+            else:
+                self._constraints[cell] = new
+                owners.add(cell)
+        if not affected and not owners:
+            return
+
+        previous = {}  # results of the regrouped components, reused if one comes back unchanged
+        for component_id in affected:
+            component = self._components.pop(component_id)
+            previous[component.key] = component.probabilities
+            owners.update(component.owners)
+            for cell in component.key[0]:
+                del self._component_of[cell]
+                self.probabilities.pop(cell, None)
+
+        for cells, members, component_owners in self._components_of(
+                [owner for owner in owners if owner in self._constraints]):
+            key = (cells, members)
+            probabilities = previous[key] if key in previous else self._enumerate(sorted(cells), members)
+            component_id = self._next_id
+            self._next_id += 1
+            self._components[component_id] = Component(key, component_owners, probabilities)
+            for cell in cells:
+                self._component_of[cell] = component_id
+            if probabilities is not None:
+                self.probabilities.update(probabilities)
+
+    def _components_of(self, owners: List[Cell]
+                       ) -> List[Tuple[FrozenSet[Cell], FrozenSet[Constraint], List[Cell]]]:
+        """Group the constraints of some sensed cells into components that share
+        no cells (union-find); returns (cells, constraints, sensed cells) of each"""
+        parent: Dict[Cell, Cell] = {}
+
+        def find(cell: Cell) -> Cell:
+            while parent[cell] != cell:
+                parent[cell] = parent[parent[cell]]
+                cell = parent[cell]
+            return cell
+
+        for owner in owners:
+            cells = iter(self._constraints[owner])
+            root = next(cells)
+            parent.setdefault(root, root)
+            root = find(root)
+            for cell in cells:
+                parent.setdefault(cell, cell)
+                other = find(cell)
+                if other != root:
+                    parent[other] = root
+
+        groups: Dict[Cell, Tuple[set, set, list]] = {}
+        for owner in owners:
+            constraint = self._constraints[owner]
+            cells, members, group_owners = groups.setdefault(
+                find(next(iter(constraint))), (set(), set(), []))
+            cells.update(constraint)
+            members.add(constraint)
+            group_owners.append(owner)
+        return [(frozenset(cells), frozenset(members), group_owners)
+                for cells, members, group_owners in groups.values()]
+
+    def _enumerate(self, cells: List[Cell], constraints) -> Optional[Dict[Cell, float]]:
+        """Marginals of one component by weighted enumeration of all its assignments.
+
+        Returns None if the component is too large or its evidence is
+        contradictory (e.g. a stench left behind by a Wumpus that was shot).
+        """
+        size = len(cells)
+        if size > MAX_COMPONENT_SIZE:
+            return None
+        column = {cell: i for i, cell in enumerate(cells)}
+        # One row per constraint, one column per cell
+        incidence = np.zeros((len(constraints), size), dtype=np.int8)
+        for row, constraint in enumerate(constraints):
+            incidence[row, [column[cell] for cell in constraint]] = 1
+
+        shifts = np.arange(size, dtype=np.int64)
+        log_odds = np.log(self.prior) - np.log1p(-self.prior)
+        total = 0.0
+        marginals = np.zeros(size)
+        batch = 1 << min(size, BATCH_BITS)
+        for start in range(0, 1 << size, batch):
+            codes = np.arange(start, start + batch, dtype=np.int64)
+            assignments = ((codes[:, None] >> shifts) & 1).astype(np.int8)
+            satisfied = (assignments @ incidence.T > 0).all(axis=1)
+            # Weight relative to the all-clear assignment: prior odds per hazard
+            weights = np.exp(assignments.sum(axis=1) * log_odds) * satisfied
+            total += weights.sum()
+            marginals += weights @ assignments
+
+        if total <= 0:
+            return None
+        marginals /= total
+        return {cell: float(marginals[i]) for i, cell in enumerate(cells)}
+
+
+def changed_cells(rows: List[int], previous: List[int]) -> Iterator[Cell]:
+    """Cells whose bit differs between two per-row planes of the same grid"""
+    for row, (bits, old) in enumerate(zip(rows, previous)):
+        changed = bits ^ old
+        while changed:
+            low = changed & -changed
+            yield row, low.bit_length() - 1
+            changed ^= low
+
+
+def grid_neighbors(rows: int, cols: int, cell: Cell) -> List[Cell]:
+    r, c = cell
+    return [(nr, nc) for nr, nc in ((r - 1, c), (r + 1, c), (r, c - 1), (r, c + 1))
+            if 0 <= nr < rows and 0 <= nc < cols]
+
+
+class HazardInference:
+    """P(pit) and P(wumpus) for every fringe cell, refreshed once per decision"""
+
+    def __init__(self, pit_prior: float, wumpus_prior: float):
+        self.pit = HazardModel('~P', 'B', pit_prior)
+        self.wumpus = HazardModel('~W', 'S', wumpus_prior)
+
+    def update(self, knowledge: KnowledgeBase) -> None:
+        self.pit.update(knowledge)
+        self.wumpus.update(knowledge)
+
+    def pit_probability(self, cell: Cell) -> Optional[float]:
+        """Posterior P(pit), or None if the cell is not on an enumerated fringe"""
+        return self.pit.probabilities.get(cell)
+
+    def wumpus_probability(self, cell: Cell) -> Optional[float]:
+        """Posterior P(wumpus), or None if the cell is not on an enumerated fringe"""
+        return self.wumpus.probabilities.get(cell)
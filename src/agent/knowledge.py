@@ -0,0 +1,122 @@
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+from ..utils.bitboard import BitGrid
+
+Cell = Tuple[int, int]
+
+# Tags the agent can hold about a cell, one bitboard plane each:
+#   V visited, ~G no gold, B/~B breeze sensed or not, S/~S stench sensed or not,
+#   P?/W? suspected pit/wumpus, ~P/~W known free of pit/wumpus, P/W known pit/wumpus
+TAGS = ('V', '~G', 'B', '~B', 'S', '~S', 'P?', 'W?', '~P', '~W', 'P', 'W')
+
+# Tags whose change can move a cell into or out of the frontier or passable set
+FRONTIER_TAGS = frozenset(('V', '~P', '~W'))
+
+
+class KnowledgeBase:
+    """What the agent knows about each cell, stored as bitboard planes.
+
+    Each plane is a list of per-row ints (bit ``col`` set for a tagged cell), so
+    testing or setting a cell touches one small int no matter how large the
+    cave is.  copy() takes the same time whatever the size of the cave: the
+    copy and the original share every row list and both indexes, and the first
+    write to a shared plane or index, on either side, copies only that one.
+
+    The frontier (known-safe cells not yet visited) and the passable set
+    (cells known safe or already visited) are kept as indexes that are updated
+    whenever V, ~P or ~W change, so neither needs a grid scan.  version is
+    bumped whenever the passable set changes, which lets planners cache
+    distance fields until the known-safe map actually changes.
+    """
+    __slots__ = ('grid', 'planes', 'frontier', 'passable', 'version', '_owned', '_owns_indexes')
+
+    def __init__(self, grid: BitGrid):
+        self.grid = grid
+        self.planes: Dict[str, List[int]] = {tag: [0] * grid.rows for tag in TAGS}
+        self.frontier: Set[Cell] = set()
+        self.passable: Set[Cell] = set()
+        self.version = 0
+        self._owned: Set[str] = set(TAGS)  # tags whose row lists no copy shares
+        self._owns_indexes = True          # whether no copy shares frontier and passable
+
+    def has(self, cell: Cell, tag: str) -> bool:
+        return bool(self.planes[tag][cell[0]] >> cell[1] & 1)
+
+    def _rows(self, tag: str) -> List[int]:
+        """A plane's row list, ready to write: copied first if a copy still shares it"""
+        if tag not in self._owned:
+            self.planes[tag] = self.planes[tag][:]
+            self._owned.add(tag)
+        return self.planes[tag]
+
+    def add(self, cell: Cell, tag: str) -> None:
+        self._rows(tag)[cell[0]] |= 1 << cell[1]
+        if tag in FRONTIER_TAGS:
+            self._update_frontier(cell)
+
+    def discard(self, cell: Cell, tag: str) -> None:
+        self._rows(tag)[cell[0]] &= ~(1 << cell[1])
+        if tag in FRONTIER_TAGS:
+            self._update_frontier(cell)
+
+    def add_all(self, cells: Iterable[Cell], tag: str) -> None:
+        rows = self._rows(tag)
+        for cell in cells:
+            rows[cell[0]] |= 1 << cell[1]
+            if tag in FRONTIER_TAGS:
+                self._update_frontier(cell)
+
+    def _update_frontier(self, cell: Cell) -> None:
+        if not self._owns_indexes:
+            self.frontier, self.passable = set(self.frontier), set(self.passable)
+            self._owns_indexes = True
+        safe = self.is_safe(cell)
+        visited = self.has(cell, 'V')
+        if safe and not visited:
+            self.frontier.add(cell)
+        else:
+            self.frontier.discard(cell)
+
+        if (safe or visited) != (cell in self.passable):
+            if safe or visited:
+                self.passable.add(cell)
+            else:
+                self.passable.discard(cell)
+            self.version += 1
+
+    def is_safe(self, cell: Cell) -> bool:
+        """Known to hold neither a pit nor a Wumpus"""
+        row, col = cell
+        return bool((self.planes['~P'][row] & self.planes['~W'][row]) >> col & 1)
+
+    def mask(self, tag: str) -> int:
+        """The whole plane as a single grid-wide int (O(cells); for bulk operations)"""
+        cols = self.grid.cols
+        plane = 0
+        for row, bits in enumerate(self.planes[tag]):
+            if bits:
+                plane |= bits << (row * cols)
+        return plane
+
+    def cells(self, tag: str) -> Iterator[Cell]:
+        """Yield the cells carrying tag in row-major order"""
+        for row, bits in enumerate(self.planes[tag]):
+            while bits:
+                low = bits & -bits
+                yield row, low.bit_length() - 1
+                bits ^= low
+
+    def tags(self, cell: Cell) -> List[str]:
+        """The tags set on a cell, for display and debugging"""
+        return [tag for tag in TAGS if self.has(cell, tag)]
+
+    def copy(self) -> 'KnowledgeBase':
+        """A copy sharing every row list and index with this one until either writes"""
+        clone = KnowledgeBase.__new__(KnowledgeBase)
+        clone.grid = self.grid
+        clone.planes = dict(self.planes)
+        clone.frontier = self.frontier
+        clone.passable = self.passable
+        clone.version = self.version
+        self._owned, clone._owned = set(), set()
+        self._owns_indexes = clone._owns_indexes = False
+        return clone
@@ -0,0 +1,130 @@
+import heapq
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from .knowledge import KnowledgeBase
+
+Cell = Tuple[int, int]
+
+# Same neighbor order as Agent.get_valid_neighbors: up, down, left, right
+NEIGHBOR_DELTAS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class DistanceField:
+    """Path length from every reachable passable cell to the nearest source.
+
+    Built with one multi-source BFS over the cells the agent knows it can walk
+    on (known safe or already visited).  Following decreasing distances from
+    any cell in the field walks a shortest safe path to some source.
+    """
+    __slots__ = ('distance', 'version')
+
+    def __init__(self, knowledge: KnowledgeBase, sources: Iterable[Cell]):
+        rows, cols = knowledge.grid.rows, knowledge.grid.cols
+        passable = knowledge.passable
+        self.version = knowledge.version
+        self.distance: Dict[Cell, int] = {}
+        queue = deque()
+        for source in sources:
+            if source not in self.distance:
+                self.distance[source] = 0
+                queue.append(source)
+
+        while queue:
+            current = queue.popleft()
+            next_distance = self.distance[current] + 1
+            for dr, dc in NEIGHBOR_DELTAS:
+                neighbor = (current[0] + dr, current[1] + dc)
+                if (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and
+                        neighbor not in self.distance and neighbor in passable):
+                    self.distance[neighbor] = next_distance
+                    queue.append(neighbor)
+
+    def next_step(self, cell: Cell) -> Optional[Cell]:
+        """The neighbor one step closer to a source, or None if unreachable or already there"""
+        distance = self.distance.get(cell)
+        if not distance:
+            return None
+        for dr, dc in NEIGHBOR_DELTAS:
+            neighbor = (cell[0] + dr, cell[1] + dc)
+            if self.distance.get(neighbor) == distance - 1:
+                return neighbor
+        return None
+
+    def path_from(self, cell: Cell) -> Optional[List[Cell]]:
+        """Cells from cell (exclusive) down to the nearest source (inclusive)"""
+        if cell not in self.distance:
+            return None
+        path = []
+        step = self.next_step(cell)
+        while step is not None:
+            path.append(step)
+            step = self.next_step(step)
+        return path
+
+
+class PathPlanner:
+    """Caches distance fields per source set until the known-passable map changes"""
+
+    def __init__(self, knowledge: KnowledgeBase):
+        self.knowledge = knowledge
+        self._fields: Dict[frozenset, DistanceField] = {}
+
+    def distance_field(self, sources: Iterable[Cell]) -> DistanceField:
+        key = frozenset(sources)
+        field = self._fields.get(key)
+        if field is None or field.version != self.knowledge.version:
+            if field is None and len(self._fields) > 8:
+                # Stale source sets (old frontiers) are rarely asked for again
+                self._fields.clear()
+            field = DistanceField(self.knowledge, key)
+            self._fields[key] = field
+        return field
+
+    def next_step(self, position: Cell, sources: Iterable[Cell]) -> Optional[Cell]:
+        """First step of a shortest known-safe path from position to any of sources"""
+        return self.distance_field(sources).next_step(position)
+
+    def path(self, position: Cell, sources: Iterable[Cell]) -> Optional[List[Cell]]:
+        """Shortest known-safe path from position (exclusive) to the nearest source"""
+        return self.distance_field(sources).path_from(position)
+
+
+def risky_path(knowledge: KnowledgeBase, position: Cell, hazard: Callable[[Cell], float],
+               movement_cost: float, death_penalty: float) -> Optional[List[Cell]]:
+    """Cheapest path from position into one unexplored cell, weighing distance against danger.
+
+    Dijkstra over the passable cells, where entering a cell costs
+    ``movement_cost + death_penalty * hazard(cell)``.  Cells outside the passable
+    set are goals rather than waypoints: stepping into one yields new percepts,
+    so the plan ends there.  Known-deadly cells (hazard 1) are never entered.
+    Returns the cells from position (exclusive) to the chosen cell (inclusive).
+    """
+    rows, cols = knowledge.grid.rows, knowledge.grid.cols
+    passable = knowledge.passable
+    cost: Dict[Cell, float] = {position: 0.0}
+    parent: Dict[Cell, Cell] = {}
+    heap = [(0.0, 0, position)]
+    order = 1  # insertion counter keeps heap ordering stable between equal costs
+    while heap:
+        current_cost, _, current = heapq.heappop(heap)
+        if current_cost > cost[current]:
+            continue
+        if current != position and current not in passable:
+            path = [current]
+            while path[-1] in parent and parent[path[-1]] != position:
+                path.append(parent[path[-1]])
+            return path[::-1]
+        for dr, dc in NEIGHBOR_DELTAS:
+            neighbor = (current[0] + dr, current[1] + dc)
+            if not (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols):
+                continue
+            risk = 0.0 if neighbor in passable else hazard(neighbor)
+            if risk >= 1.0:
+                continue
+            next_cost = current_cost + movement_cost + death_penalty * risk
+            if next_cost < cost.get(neighbor, float('inf')):
+                cost[neighbor] = next_cost
+                parent[neighbor] = current
+                heapq.heappush(heap, (next_cost, order, neighbor))
+                order += 1
+    return None
@@ -0,0 +1,100 @@
+"""Per-phase timing of Agent.decide_action.
+
+A DecisionProfiler attached to an agent replaces the agent's phase methods
+with timed wrappers on that one instance; detaching (or never attaching)
+leaves the class methods untouched, so agents that are not profiled pay
+nothing.  Every call of a phase is timed with a pluggable integer timer
+(time.perf_counter_ns by default) into that phase's LatencyHistogram, and a
+few outcomes (actions chosen, loops detected, risky moves planned) are
+counted.  Phases nest: choose_next_move includes the choose_risky_move it
+calls, infer_wumpus_shoot the is_in_loop it calls, and decide_action all of
+them.
+
+Profilers merge, so per-process profiles of a benchmark add up exactly.
+"""
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional
+from ..utils.histogram import LatencyHistogram
+
+PHASES = ("decide_action", "AI_play", "is_in_loop", "infer_from_percept", "infer_pit",
+          "infer_wumpus", "infer_wumpus_shoot", "choose_next_move", "choose_risky_move")
+
+# Counter name for a phase's return value (None: nothing to count)
+OUTCOMES: Dict[str, Callable[[Any], Optional[str]]] = {
+    "decide_action": lambda result: "action:" + result[0],
+    "is_in_loop": lambda result: "loop_detected" if result else None,
+    "choose_risky_move": lambda result: "risky_move" if result else None,
+}
+
+
+class DecisionProfiler:
+    def __init__(self, timer: Callable[[], int] = time.perf_counter_ns,
+                 ticks_per_second: float = 1e9, phases: Iterable[str] = PHASES,
+                 precision_bits: int = 7):
+        self.timer = timer
+        self.ticks_per_second = ticks_per_second
+        self.phases = tuple(phases)
+        self.histograms = {phase: LatencyHistogram(precision_bits) for phase in self.phases}
+        self.counters: Counter = Counter()
+
+    def attach(self, agent) -> None:
+        """Time the agent's phases from now on"""
+        for phase in self.phases:
+            method = getattr(type(agent), phase).__get__(agent)
+            setattr(agent, phase, self._timed(phase, method))
+
+    def detach(self, agent) -> None:
+        for phase in self.phases:
+            agent.__dict__.pop(phase, None)
+
+    def _timed(self, phase: str, method: Callable) -> Callable:
+        histogram = self.histograms[phase]
+        timer = self.timer
+        outcome = OUTCOMES.get(phase)
+        counters = self.counters
+
+        def timed(*args, **kwargs):
+            started = timer()
+            try:
+                result = method(*args, **kwargs)
+            finally:
+                histogram.record(timer() - started)
+            if outcome is not None:
+                name = outcome(result)
+                if name:
+                    counters[name] += 1
+            return result
+        return timed
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] += n
+
+    def merge(self, other: 'DecisionProfiler') -> None:
+        for phase, histogram in other.histograms.items():
+            if phase in self.histograms:
+                self.histograms[phase].merge(histogram)
+            else:
+                self.histograms[phase] = histogram
+        self.counters.update(other.counters)
+
+    def summary(self) -> Dict:
+        """Latency distribution of each phase that ran, in milliseconds, and the counters"""
+        scale = 1000.0 / self.ticks_per_second
+        return {
+            "phases_ms": {phase: histogram.summary(scale)
+                          for phase, histogram in self.histograms.items() if histogram.count},
+            "counters": dict(self.counters),
+        }
+
+    def report(self) -> str:
+        """The summary as a text table"""
+        summary = self.summary()
+        lines = [f"{'phase (ms)':20s} {'calls':>8s} {'mean':>8s} {'p50':>8s} {'p90':>8s} "
+                 f"{'p99':>8s} {'p99.9':>8s} {'max':>8s}"]
+        for phase, s in summary["phases_ms"].items():
+            lines.append(f"{phase:20s} {s['count']:8d} {s['mean']:8.3f} {s['p50']:8.3f} "
+                         f"{s['p90']:8.3f} {s['p99']:8.3f} {s['p99.9']:8.3f} {s['max']:8.3f}")
+        if summary["counters"]:
+            lines.append("  ".join(f"{name}={n}" for name, n in sorted(summary["counters"].items())))
+        return "\n".join(lines)
@@ -0,0 +1,70 @@
+import random
+import unittest
+from .history import PathHistory
+
+
+def looping(path, window=6, repeat_limit=2):
+    """The loop check on a plain list, as Agent.is_in_loop used to do it"""
+    if len(path) < window:
+        return False
+    recent = path[-window:]
+    return any(recent.count(cell) > repeat_limit for cell in recent)
+
+
+class Test(unittest.TestCase):
+    def test_loop_window(self):
+        history = PathHistory(capacity=10)
+        for cell in [(0, 0), (0, 1), (0, 0), (0, 1), (0, 0)]:
+            history.append(cell)
+        self.assertFalse(history.looping())  # window not yet full
+        history.append((1, 1))
+        self.assertTrue(history.looping())   # (0, 0) three times in six
+        history.append((1, 2))
+        self.assertFalse(history.looping())  # the first (0, 0) left the window
+        self.assertEqual(history.pop(), (1, 2))
+        self.assertTrue(history.looping())   # and came back
+
+    def test_spill_when_full(self):
+        spilled = []
+        history = PathHistory(capacity=8, spill=spilled.append)
+        cells = [(0, col) for col in range(12)]
+        for cell in cells:
+            history.append(cell)
+        self.assertEqual(len(history), 8)
+        self.assertEqual(list(history), cells[4:])
+        self.assertEqual(spilled, cells[:4])
+        self.assertEqual(history[-1], (0, 11))
+        # Membership and counts still cover the spilled positions
+        self.assertIn((0, 0), history)
+        self.assertEqual(history.count((0, 0)), 1)
+        history.clear()
+        self.assertNotIn((0, 0), history)
+        self.assertIsNotNone(history.spill)  # kept across clear()
+
+    def test_capacity_must_exceed_window(self):
+        with self.assertRaises(ValueError):
+            PathHistory(capacity=6, window=6)
+
+    def test_matches_plain_list(self):
+        rng = random.Random(25)
+        cells = [(row, col) for row in range(3) for col in range(3)]
+        for _ in range(200):
+            spilled = []
+            history = PathHistory(rng.randint(7, 20), spill=spilled.append)
+            path = []
+            for _ in range(rng.randint(0, 150)):
+                if len(history) > history.window and rng.random() < 0.2:
+                    self.assertEqual(history.pop(), path.pop())
+                else:
+                    cell = rng.choice(cells)
+                    history.append(cell)
+                    path.append(cell)
+                self.assertEqual(history.looping(), looping(path))
+                self.assertEqual(spilled + list(history), path)
+                for cell in cells:
+                    self.assertEqual(cell in history, cell in path)
+                    self.assertEqual(history.count(cell), path.count(cell))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+from .knowledge import KnowledgeBase
+from ..utils.bitboard import BitGrid
+
+
+class Test(unittest.TestCase):
+    def test_copy_on_write(self):
+        kb = KnowledgeBase(BitGrid(4, 5))
+        kb.add_all([(0, 0), (0, 1)], '~P')
+        kb.add_all([(0, 0), (0, 1)], '~W')
+        kb.add((0, 0), 'V')
+        clone = kb.copy()
+        self.assertIs(clone.planes['V'], kb.planes['V'])
+        self.assertIs(clone.frontier, kb.frontier)
+
+        clone.add((0, 1), 'V')
+        clone.add((1, 1), 'B')
+        self.assertTrue(clone.has((0, 1), 'V'))
+        self.assertFalse(kb.has((0, 1), 'V'))
+        self.assertFalse(kb.has((1, 1), 'B'))
+        self.assertEqual(kb.frontier, {(0, 1)})
+        self.assertEqual(clone.frontier, set())
+        self.assertEqual(kb.passable, clone.passable)
+        self.assertIs(clone.planes['~P'], kb.planes['~P'])  # never written: still shared
+
+        # The original copies on its own first write too
+        kb.discard((0, 0), '~W')
+        self.assertFalse(kb.has((0, 0), '~W'))
+        self.assertTrue(clone.has((0, 0), '~W'))
+        self.assertEqual(kb.passable, {(0, 0), (0, 1)})  # (0, 0) stays passable: visited
+        self.assertEqual(kb.frontier, {(0, 1)})
+
+    def test_copy_of_copy(self):
+        kb = KnowledgeBase(BitGrid(3, 3))
+        first = kb.copy()
+        second = first.copy()
+        second.add((2, 2), '~P')
+        first.add((1, 1), '~P')
+        self.assertEqual(list(kb.cells('~P')), [])
+        self.assertEqual(list(first.cells('~P')), [(1, 1)])
+        self.assertEqual(list(second.cells('~P')), [(2, 2)])
+
+
+if __name__ == '__main__':
+    unittest.main()
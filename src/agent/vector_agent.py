@@ -0,0 +1,281 @@
+"""Batched agent for VectorWumpusEnv: one policy call decides for all N worlds.
+
+BatchedKnowledge is Agent.AI_play's knowledge update ported to stacked
+(N, rows, cols) planes, one per KnowledgeBase tag.  VectorExplorer is a
+simple policy on top of it that needs no per-world Python code:
+
+    1. grab gold when it glitters
+    2. step into the least visited unvisited neighbor known to be safe
+    3. otherwise walk (through visited cells) to the nearest such cell
+    4. shoot a suspected Wumpus next to a stench, if an arrow is left and it
+       is the only suspect or nothing safe is left to explore
+    5. otherwise walk to the nearest unvisited cell with the lowest estimated
+       hazard (Agent._suspicion's estimate), taking the risk
+
+It lacks Agent's exact probabilistic inference, so it plays worse, but it
+evaluates thousands of worlds per call.
+
+    python -m src.agent.vector_agent corpus.wcorp --count 100000
+"""
+import time
+from typing import Dict, Optional
+import numpy as np
+from .agent import AgentConfig
+from .knowledge import TAGS
+from ..environment.vector_env import (DELTA_COLS, DELTA_ROWS, GRAB, MOVE, SHOOT,
+                                      VectorWumpusEnv, neighbors)
+from ..utils.constants import PERCEPT_BREEZE, PERCEPT_GLITTER, PERCEPT_STENCH
+
+
+class BatchedKnowledge:
+    """KnowledgeBase tags of N worlds as (N, rows, cols) boolean planes"""
+
+    def __init__(self, n: int, rows: int, cols: int):
+        self.n, self.rows, self.cols = n, rows, cols
+        self.planes: Dict[str, np.ndarray] = {tag: np.zeros((n, rows, cols), dtype=bool)
+                                              for tag in TAGS}
+        self.index = np.arange(n)
+
+    def reset(self) -> None:
+        for plane in self.planes.values():
+            plane[:] = False
+
+    def safe(self, worlds: np.ndarray) -> np.ndarray:
+        """Cells known to hold neither a pit nor a Wumpus, in some worlds"""
+        return self.planes['~P'][worlds] & self.planes['~W'][worlds]
+
+    def suspicion(self, worlds: np.ndarray, known: str, cleared: str, sensed: str,
+                  prior: float) -> np.ndarray:
+        """Agent._suspicion for every cell of some worlds: each neighbor that sensed
+        the hazard contributes 1 / (its uncleared neighbors), the largest one wins"""
+        cleared, sensed = self.planes[cleared][worlds], self.planes[sensed][worlds]
+        candidates = _neighbor_sum(~cleared)
+        contribution = np.where(sensed, 1.0 / np.maximum(candidates, 1), 0.0)
+        probability = np.where(neighbors(sensed), _neighbor_max(contribution), prior)
+        probability[self.planes[known][worlds]] = 1.0
+        probability[cleared] = 0.0
+        return probability
+
+    def hazard(self, worlds: np.ndarray, pit_prior: float, wumpus_prior: float) -> np.ndarray:
+        """Estimated probability that entering each cell of some worlds is fatal"""
+        pit = self.suspicion(worlds, 'P', '~P', 'B', pit_prior)
+        wumpus = self.suspicion(worlds, 'W', '~W', 'S', wumpus_prior)
+        return 1.0 - (1.0 - pit) * (1.0 - wumpus)
+
+    def update(self, position: np.ndarray, percept: np.ndarray,
+               worlds: Optional[np.ndarray] = None) -> None:
+        """AI_play's update for the agents in worlds (default: all) at their positions"""
+        worlds = self.index if worlds is None else worlds
+        planes = self.planes
+        rows, cols = position[worlds, 0], position[worlds, 1]
+        percept = percept[worlds]
+        breeze = (percept & PERCEPT_BREEZE) != 0
+        stench = (percept & PERCEPT_STENCH) != 0
+
+        planes['V'][worlds, rows, cols] = True
+        no_gold = (percept & PERCEPT_GLITTER) == 0
+        planes['~G'][worlds[no_gold], rows[no_gold], cols[no_gold]] = True
+        planes['B'][worlds[breeze], rows[breeze], cols[breeze]] = True
+        planes['~B'][worlds[~breeze], rows[~breeze], cols[~breeze]] = True
+        planes['S'][worlds[stench], rows[stench], cols[stench]] = True
+        planes['~S'][worlds[~stench], rows[~stench], cols[~stench]] = True
+
+        for dr, dc in zip(DELTA_ROWS, DELTA_COLS):
+            n_rows, n_cols = rows + dr, cols + dc
+            inside = (n_rows >= 0) & (n_rows < self.rows) & (n_cols >= 0) & (n_cols < self.cols)
+            w, r, c = worlds[inside], n_rows[inside], n_cols[inside]
+            b, s = breeze[inside], stench[inside]
+            planes['P?'][w[b], r[b], c[b]] = True
+            planes['~P'][w[~b], r[~b], c[~b]] = True
+            planes['W?'][w[s], r[s], c[s]] = True
+            planes['~W'][w[~s], r[~s], c[~s]] = True
+            # Visited neighbors are free of both hazards
+            visited = planes['V'][w, r, c]
+            planes['~P'][w[visited], r[visited], c[visited]] = True
+            planes['~W'][w[visited], r[visited], c[visited]] = True
+
+
+def _neighbor_sum(planes: np.ndarray) -> np.ndarray:
+    """For each cell, how many of its 4 neighbors are set"""
+    total = np.zeros(planes.shape, dtype=np.int8)
+    total[:, 1:, :] += planes[:, :-1, :]
+    total[:, :-1, :] += planes[:, 1:, :]
+    total[:, :, 1:] += planes[:, :, :-1]
+    total[:, :, :-1] += planes[:, :, 1:]
+    return total
+
+
+def _neighbor_max(values: np.ndarray) -> np.ndarray:
+    """For each cell, the largest value among its 4 neighbors (0 off the board)"""
+    best = np.zeros_like(values)
+    np.maximum(best[:, 1:, :], values[:, :-1, :], out=best[:, 1:, :])
+    np.maximum(best[:, :-1, :], values[:, 1:, :], out=best[:, :-1, :])
+    np.maximum(best[:, :, 1:], values[:, :, :-1], out=best[:, :, 1:])
+    np.maximum(best[:, :, :-1], values[:, :, 1:], out=best[:, :, :-1])
+    return best
+
+
+class VectorExplorer:
+    def __init__(self, n: int, rows: int, cols: int, agent_config: Optional[AgentConfig] = None,
+                 seed: Optional[int] = None):
+        self.config = agent_config or AgentConfig()
+        self.knowledge = BatchedKnowledge(n, rows, cols)
+        self.visits = np.zeros((n, rows, cols), dtype=np.int32)
+        self.arrows = np.zeros(n, dtype=np.int32)
+        self.actions = np.zeros(n, dtype=np.intp)
+        self.rng = np.random.default_rng(seed)
+        self.reset()
+
+    def reset(self) -> None:
+        self.knowledge.reset()
+        self.visits[:] = 0
+        self.arrows[:] = self.config.arrow_count
+
+    def act(self, observation: Dict[str, np.ndarray], done: Optional[np.ndarray] = None) -> np.ndarray:
+        """One action code per world (those already done get an arbitrary one)"""
+        kb = self.knowledge
+        position, percept = observation["position"], observation["percept"]
+        live = kb.index if done is None else np.flatnonzero(~done)
+        kb.update(position, percept, live)
+        rows, cols = position[:, 0], position[:, 1]
+        self.visits[live, rows[live], cols[live]] += 1
+
+        actions = self.actions
+        actions[:] = -1
+        grab = live[(percept[live] & PERCEPT_GLITTER) != 0]
+        actions[grab] = GRAB
+        undecided = live[actions[live] < 0]
+
+        # Safe, unvisited neighbors: the least visited one first
+        safe_unvisited = kb.safe(undecided) & ~kb.planes['V'][undecided]
+        remaining = self._step_to_neighbor(undecided, safe_unvisited, position)
+        if len(remaining) < len(undecided):
+            safe_unvisited = safe_unvisited[np.isin(undecided, remaining)]
+        undecided = self._walk_towards(remaining, safe_unvisited, position)
+
+        # A suspected Wumpus next to a stench: shoot it (once per arrow)
+        if len(undecided):
+            shooters = undecided[(self.arrows[undecided] > 0)
+                                 & ((percept[undecided] & PERCEPT_STENCH) != 0)]
+            suspects = kb.planes['W?'][shooters] & ~kb.planes['~W'][shooters]
+            targets = self._neighbor_mask(shooters, suspects, position)
+            shoot = targets.any(axis=1)
+            shooters, direction = shooters[shoot], targets[shoot].argmax(axis=1)
+            actions[shooters] = SHOOT + direction
+            self.arrows[shooters] -= 1
+            # Whatever happens, the target cell holds no live Wumpus afterwards
+            kb.planes['~W'][shooters, rows[shooters] + DELTA_ROWS[direction],
+                            cols[shooters] + DELTA_COLS[direction]] = True
+            undecided = undecided[actions[undecided] < 0]
+
+        # Take a risk: the nearest unvisited cell of the lowest estimated hazard
+        if len(undecided):
+            hazard = kb.hazard(undecided, self.config.pit_prior, self.config.wumpus_prior)
+            reachable = ~kb.planes['V'][undecided] & neighbors(kb.planes['V'][undecided])
+            hazard = np.where(reachable, hazard, 2.0)
+            least = hazard.reshape(len(undecided), -1).min(axis=1)
+            targets = reachable & (hazard <= least[:, None, None] + 1e-9)
+            undecided = self._walk_towards(undecided, targets, position)
+        if len(undecided):
+            actions[undecided] = MOVE + self.rng.integers(0, 4, len(undecided))
+        return actions
+
+    def _neighbor_mask(self, worlds: np.ndarray, targets: np.ndarray,
+                       position: np.ndarray) -> np.ndarray:
+        """(len(worlds), 4): whether the neighbor in each direction is a target"""
+        rows, cols = position[worlds, 0], position[worlds, 1]
+        local = np.arange(len(worlds))
+        mask = np.zeros((len(worlds), 4), dtype=bool)
+        for d, (dr, dc) in enumerate(zip(DELTA_ROWS, DELTA_COLS)):
+            n_rows, n_cols = rows + dr, cols + dc
+            inside = ((n_rows >= 0) & (n_rows < self.knowledge.rows)
+                      & (n_cols >= 0) & (n_cols < self.knowledge.cols))
+            mask[inside, d] = targets[local[inside], n_rows[inside], n_cols[inside]]
+        return mask
+
+    def _step_to_neighbor(self, worlds: np.ndarray, targets: np.ndarray,
+                          position: np.ndarray) -> np.ndarray:
+        """Move into the least visited neighboring target; returns the worlds without one"""
+        if not len(worlds):
+            return worlds
+        mask = self._neighbor_mask(worlds, targets, position)
+        rows, cols = position[worlds, 0], position[worlds, 1]
+        visits = np.full((len(worlds), 4), np.iinfo(np.int32).max, dtype=np.int64)
+        for d, (dr, dc) in enumerate(zip(DELTA_ROWS, DELTA_COLS)):
+            has = mask[:, d]
+            visits[has, d] = self.visits[worlds[has], rows[has] + dr, cols[has] + dc]
+        found = mask.any(axis=1)
+        self.actions[worlds[found]] = MOVE + visits[found].argmin(axis=1)
+        return worlds[~found]
+
+    def _walk_towards(self, worlds: np.ndarray, targets: np.ndarray,
+                      position: np.ndarray) -> np.ndarray:
+        """Take the first step of a shortest path through visited cells to a target
+        (breadth-first, all worlds at once); returns the worlds with no reachable target"""
+        if not len(worlds):
+            return worlds
+        visited = self.knowledge.planes['V'][worlds]
+        local = np.arange(len(worlds))
+        rows, cols = position[worlds, 0], position[worlds, 1]
+        # Grow the set of cells one step from a target until each agent is reached
+        reached = targets.copy()
+        frontier = targets
+        settled = reached[local, rows, cols]
+        while not settled.all():
+            grown = neighbors(frontier) & visited & ~reached
+            if not grown.any():
+                break
+            # The agent's next cell is a cell of the previous layer next to it
+            arrived = grown[local, rows, cols] & ~settled
+            if arrived.any():
+                step = self._neighbor_mask(worlds[arrived], frontier[arrived], position)
+                self.actions[worlds[arrived]] = MOVE + step.argmax(axis=1)
+                settled |= arrived
+            reached |= grown
+            frontier = grown
+        return worlds[~settled]
+
+
+def run(env: VectorWumpusEnv, policy: VectorExplorer) -> Dict:
+    """Play every episode of env to the end with policy; returns summary statistics"""
+    observation = env.reset()
+    policy.reset()
+    done = env.done
+    while not done.all():
+        observation, _, done = env.step(policy.act(observation, done))
+    return {
+        "episodes": env.n,
+        "wins": int(env.won.sum()),
+        "win_rate": float(env.won.mean()),
+        "deaths": int((~env.alive).sum()),
+        "truncated": int(env.truncated.sum()),
+        "mean_score": float(env.score.mean()),
+        "mean_steps": float(env.steps.mean()),
+    }
+
+
+def main() -> None:
+    import argparse
+    from ..environment.world_corpus import CORPUS_EXTENSION
+    parser = argparse.ArgumentParser(description="Play many worlds at once with the batched agent")
+    parser.add_argument("worlds", nargs="+", help="a corpus file, or world files of one size")
+    parser.add_argument("--count", type=int, default=None, help="worlds to play from a corpus")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if len(args.worlds) == 1 and args.worlds[0].endswith(CORPUS_EXTENSION):
+        env = VectorWumpusEnv.from_corpus(args.worlds[0], 0, args.count, max_steps=args.max_steps)
+    else:
+        env = VectorWumpusEnv.from_files(args.worlds, max_steps=args.max_steps)
+    policy = VectorExplorer(env.n, env.rows, env.cols, seed=args.seed)
+    started = time.perf_counter()
+    summary = run(env, policy)
+    elapsed = time.perf_counter() - started
+    print(f"{summary['episodes']} episodes in {elapsed:.2f}s: win rate {summary['win_rate']:.1%}, "
+          f"mean score {summary['mean_score']:.1f}, mean steps {summary['mean_steps']:.1f}, "
+          f"{summary['deaths']} deaths, {summary['truncated']} truncated")
+
+
+if __name__ == "__main__":
+    main()
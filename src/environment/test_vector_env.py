@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from .vector_env import GRAB, SHOOT, VectorWumpusEnv
+from .world_corpus import CorpusWriter, world_name
+from .world_generator import WorldGenerator
+from ..agent.agent import AgentConfig
+from ..game.env import WumpusEnv
+from ..utils.constants import CELL_WUMPUS, PERCEPT_GLITTER
+
+WORLDS = 120
+MAX_STEPS = 80
+
+
+class Test(unittest.TestCase):
+    """VectorWumpusEnv and WumpusEnv (WumpusGame) play by the same rules"""
+
+    def test_random_play_matches_game(self):
+        worlds = WorldGenerator(8, 8, pit_probability=0.1, wumpus_count=2, seed=21).generate(WORLDS)
+        config = AgentConfig(arrow_count=3, verbose=False)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "parity.wcorp")
+            with CorpusWriter(path, 8, 8) as writer:
+                writer.write(worlds)
+            vector = VectorWumpusEnv.from_corpus(path, agent_config=config, max_steps=MAX_STEPS)
+            games = [WumpusEnv(world_name(path, i), config, max_steps=MAX_STEPS) for i in range(WORLDS)]
+            observation = vector.reset()
+            for game in games:
+                game.reset(seed=0)
+
+            rng = np.random.default_rng(21)
+            for step in range(MAX_STEPS):
+                actions = rng.integers(0, GRAB + 1, WORLDS)
+                shots = rng.random(WORLDS) < 0.2
+                actions[shots] = SHOOT + rng.integers(0, 4, shots.sum())
+                actions[(observation["percept"] & PERCEPT_GLITTER) != 0] = GRAB
+                active = ~vector.done
+                observation, rewards, done = vector.step(actions)
+                for i in np.flatnonzero(active):
+                    game_observation, reward, terminated, truncated, info = games[i].step(actions[i])
+                    where = f"world {i} step {step}"
+                    self.assertEqual(reward, rewards[i], where)
+                    self.assertEqual(terminated or truncated, done[i], where)
+                    self.assertEqual(truncated, vector.truncated[i], where)
+                    self.assertEqual(tuple(game_observation["position"]), tuple(observation["position"][i]), where)
+                    self.assertEqual(info["won"], vector.won[i], where)
+                    self.assertEqual(info["score"], vector.score[i], where)
+                    if vector.alive[i]:
+                        self.assertEqual(game_observation["percept"], observation["percept"][i], where)
+                    else:
+                        self.assertEqual(info["death_cause"], ("pit", "wumpus")[vector.death_cause[i] - 1], where)
+                if vector.done.all():
+                    break
+            kills = int((vector.worlds == CELL_WUMPUS).sum() - vector.wumpus.sum())
+
+        # The random play covers every rule
+        self.assertGreater(vector.won.sum(), 0)
+        self.assertGreater((~vector.alive).sum(), 0)
+        self.assertGreater(vector.truncated.sum(), 0)
+        self.assertGreater(kills, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
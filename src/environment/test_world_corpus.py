@@ -0,0 +1,85 @@
+import glob
+import os
+import tempfile
+import unittest
+import numpy as np
+from .world_corpus import (HEADER, CorpusWriter, WorldCorpus, board_codes, load_world, pack,
+                           pack_world_files, record_stride, unpack, unpack_corpus, world_name)
+from .world_generator import WorldGenerator
+from .world_load import WorldLoader
+
+WORLDS_DIRECTORY = os.path.join(os.path.dirname(__file__), "..", "..", "worlds")
+WORLD_FILES = sorted(glob.glob(os.path.join(WORLDS_DIRECTORY, "*.world")))
+
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_world_files_round_trip(self):
+        self.assertTrue(WORLD_FILES)
+        boards = [WorldLoader(name).get_board() for name in WORLD_FILES]
+        rows, cols = len(boards[0]), len(boards[0][0])
+        corpus_path = self.path("worlds.wcorp")
+        self.assertEqual(pack_world_files(WORLD_FILES, corpus_path), len(boards))
+
+        corpus = WorldCorpus(corpus_path)
+        self.assertEqual((len(corpus), corpus.rows, corpus.cols), (len(boards), rows, cols))
+        self.assertEqual(corpus.stride, record_stride(rows, cols))
+        self.assertEqual(os.path.getsize(corpus_path), HEADER.size + len(boards) * corpus.stride)
+        for index, board in enumerate(boards):
+            self.assertEqual(corpus.board(index), board)
+            self.assertEqual(load_world(world_name(corpus_path, index)).get_board(), board)
+            np.testing.assert_array_equal(corpus.codes(index), board_codes(board))
+
+        out = self.path("unpacked")
+        self.assertEqual(unpack_corpus(corpus_path, out), len(boards))
+        unpacked = sorted(glob.glob(os.path.join(out, "*.world")))
+        self.assertEqual([WorldLoader(name).get_board() for name in unpacked], boards)
+
+    def test_odd_cell_count(self):
+        # 3x5 worlds: 15 cells, so the last byte of a record only uses its low nibble
+        worlds = WorldGenerator(3, 5, wumpus_count=2, seed=17).generate(9)
+        records = pack(worlds)
+        self.assertEqual(records.shape, (9, record_stride(3, 5)))
+        self.assertEqual(record_stride(3, 5), 8)
+        self.assertFalse((records[:, -1] >> 4).any())  # the padding nibble is zero
+        np.testing.assert_array_equal(unpack(records, 3, 5), worlds)
+
+        corpus_path = self.path("odd.wcorp")
+        with CorpusWriter(corpus_path, 3, 5) as writer:
+            writer.write(worlds[:4])  # in two batches: the header count covers both
+            writer.write(worlds[4:])
+        corpus = WorldCorpus(corpus_path)
+        self.assertEqual(len(corpus), 9)
+        np.testing.assert_array_equal(corpus.codes(0, 9), worlds)
+        np.testing.assert_array_equal(np.concatenate(list(corpus.batches(4))), worlds)
+        for index in range(9):
+            np.testing.assert_array_equal(board_codes(corpus.board(index)), worlds[index])
+
+    def test_empty_and_invalid(self):
+        corpus_path = self.path("empty.wcorp")
+        CorpusWriter(corpus_path, 4, 4).close()
+        corpus = WorldCorpus(corpus_path)
+        self.assertEqual(len(corpus), 0)
+        self.assertEqual(corpus.names(), [])
+        with self.assertRaises(IndexError):
+            corpus.board(0)
+
+        with open(self.path("not.wcorp"), "wb") as f:
+            f.write(b"not a corpus at all, just some bytes")
+        with self.assertRaises(ValueError):
+            WorldCorpus(self.path("not.wcorp"))
+        with self.assertRaises(ValueError):
+            board_codes([["-", "X"], ["A", "G"]])
+        with CorpusWriter(self.path("sized.wcorp"), 3, 5) as writer:
+            with self.assertRaises(ValueError):
+                writer.write(np.zeros((1, 5, 3), dtype=np.uint8))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import numpy as np
+from .world_generator import WorldGenerator, gold_reachable
+from ..utils.constants import CELL_AGENT, CELL_GOLD, CELL_WUMPUS
+
+
+class Test(unittest.TestCase):
+    def test_batches_reach_count(self):
+        generator = WorldGenerator(6, 6, pit_probability=0.3, wumpus_count=2, seed=15)
+        batches = list(generator.batches(250, batch_size=64))
+        worlds = np.concatenate(batches)
+        self.assertEqual(len(worlds), 250)
+        self.assertTrue(gold_reachable(worlds, generator.start).all())
+        self.assertTrue((worlds[:, 5, 0] == CELL_AGENT).all())
+        self.assertTrue(((worlds == CELL_GOLD).sum(axis=(1, 2)) == 1).all())
+        self.assertTrue(((worlds == CELL_WUMPUS).sum(axis=(1, 2)) == 2).all())
+
+    def test_no_reachable_gold_gives_up(self):
+        # Every other cell is a pit, so the gold is reachable only in the 5 of
+        # 1953 placements where both pieces form a path from the start
+        generator = WorldGenerator(8, 8, pit_probability=1.0, wumpus_count=0, gold_count=2, seed=15)
+        batches = generator.batches(10, batch_size=8, max_empty_batches=5)
+        with self.assertRaises(RuntimeError):
+            list(batches)
+
+    def test_unfiltered_never_gives_up(self):
+        generator = WorldGenerator(8, 8, pit_probability=1.0, wumpus_count=0, gold_count=2, seed=15)
+        worlds = np.concatenate(list(generator.batches(40, batch_size=8, solvable_only=False,
+                                                       max_empty_batches=1)))
+        self.assertEqual(len(worlds), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+"""Lockstep vectorized Wumpus World: N worlds stepped as NumPy arrays.
+
+VectorWumpusEnv holds N worlds of one size as stacked (N, rows, cols) planes
+(pits, Wumpuses, gold and a percept bitmask per cell, in the PERCEPT_* bits
+of utils.constants) and advances all N episodes with one step(actions) call,
+so the per-step cost is a few array operations however many worlds there are.
+
+The rules and scores are WumpusGame's, with the agent's own per-decision
+charge (DECISION_COST) included, so an episode's return equals the
+Agent.score the same play would end with:
+
+    move     movement_cost; walking off the board is a no-op, entering a pit
+             or a live Wumpus is death (death_penalty) and ends the episode
+    shoot    arrow_cost if an arrow is left; it kills the first live Wumpus
+             in its line, which removes that Wumpus's stench
+    grab     gold_reward if the cell holds gold; holding expected_gold_count
+             pieces wins and ends the episode (charging the final 'win'
+             decision too)
+
+Actions are the integer codes below.  An episode that has ended ignores
+further actions (reward 0) until reset().  Observations are the agent's
+position and the percept bitmask of its cell; the arrays are preallocated and
+updated in place by every step.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from .world_corpus import board_codes, load_world, open_corpus
+from ..agent.agent import AgentConfig
+from ..utils.constants import (CELL_AGENT, CELL_GOLD, CELL_PIT, CELL_WUMPUS, DECISION_COST,
+                               PERCEPT_BREEZE, PERCEPT_GLITTER, PERCEPT_NO_PIT,
+                               PERCEPT_NO_WUMPUS, PERCEPT_STENCH, PERCEPT_VISITED)
+
+DIRECTIONS = ("up", "down", "left", "right")
+DELTA_ROWS = np.array([-1, 1, 0, 0])
+DELTA_COLS = np.array([0, 0, -1, 1])
+
+# Action codes: MOVE + d and SHOOT + d for d an index into DIRECTIONS
+MOVE = 0
+SHOOT = 4
+GRAB = 8
+ACTION_COUNT = 9
+
+# Death causes, as stored in VectorWumpusEnv.death_cause
+DEATH_CAUSES = (None, "pit", "wumpus")
+
+
+def action_code(action: str, direction: str = "") -> int:
+    """Code of a WumpusGame action such as ('move', 'up') or ('grab', '')"""
+    if action == "grab":
+        return GRAB
+    return (MOVE if action == "move" else SHOOT) + DIRECTIONS.index(direction)
+
+
+def action_name(code: int) -> Tuple[str, str]:
+    """The (action, direction) a code stands for"""
+    if code == GRAB:
+        return "grab", ""
+    return ("move" if code < SHOOT else "shoot"), DIRECTIONS[code % 4]
+
+
+def neighbors(planes: np.ndarray) -> np.ndarray:
+    """Cells 4-adjacent to a set cell, for a stack of boolean planes"""
+    grown = np.zeros_like(planes)
+    grown[:, 1:, :] |= planes[:, :-1, :]
+    grown[:, :-1, :] |= planes[:, 1:, :]
+    grown[:, :, 1:] |= planes[:, :, :-1]
+    grown[:, :, :-1] |= planes[:, :, 1:]
+    return grown
+
+
+class VectorWumpusEnv:
+    def __init__(self, worlds: np.ndarray, agent_config: Optional[AgentConfig] = None,
+                 max_steps: int = 1000):
+        """worlds: (N, rows, cols) cell codes, as WorldGenerator and WorldCorpus produce.
+        Each agent starts on its world's 'A' cell, else the bottom-left corner."""
+        self.worlds = np.asarray(worlds, dtype=np.uint8)
+        if self.worlds.ndim == 2:
+            self.worlds = self.worlds[None]
+        self.n, self.rows, self.cols = self.worlds.shape
+        self.config = agent_config or AgentConfig()
+        self.max_steps = max_steps
+        self.index = np.arange(self.n)
+
+        flat = (self.worlds == CELL_AGENT).reshape(self.n, -1)
+        start = np.where(flat.any(axis=1), flat.argmax(axis=1), (self.rows - 1) * self.cols)
+        self.starts = np.stack(np.divmod(start, self.cols), axis=1)
+
+        shape = self.worlds.shape
+        self.pit = np.zeros(shape, dtype=bool)
+        self.wumpus = np.zeros(shape, dtype=bool)
+        self.gold = np.zeros(shape, dtype=bool)
+        self.percepts = np.zeros(shape, dtype=np.uint8)  # what each cell would be sensed as
+        self.visited = np.zeros(shape, dtype=bool)
+
+        self.position = np.zeros((self.n, 2), dtype=np.intp)
+        self.arrows = np.zeros(self.n, dtype=np.int32)
+        self.gold_count = np.zeros(self.n, dtype=np.int32)
+        self.steps = np.zeros(self.n, dtype=np.int32)
+        self.score = np.zeros(self.n, dtype=np.int64)
+        self.rewards = np.zeros(self.n, dtype=np.int64)
+        self.alive = np.zeros(self.n, dtype=bool)
+        self.won = np.zeros(self.n, dtype=bool)
+        self.done = np.zeros(self.n, dtype=bool)
+        self.truncated = np.zeros(self.n, dtype=bool)  # ended by max_steps
+        self.death_cause = np.zeros(self.n, dtype=np.uint8)  # index into DEATH_CAUSES
+        self.percept = np.zeros(self.n, dtype=np.uint8)
+        self.observation = {"position": self.position, "percept": self.percept}
+        self.reset()
+
+    @classmethod
+    def from_files(cls, world_files: Sequence[str], agent_config: Optional[AgentConfig] = None,
+                   max_steps: int = 1000) -> 'VectorWumpusEnv':
+        """An environment over world files or corpus entries, all of one size"""
+        return cls(np.stack([board_codes(load_world(name).get_board()) for name in world_files]),
+                   agent_config, max_steps)
+
+    @classmethod
+    def from_corpus(cls, path: str, start: int = 0, stop: Optional[int] = None,
+                    agent_config: Optional[AgentConfig] = None,
+                    max_steps: int = 1000) -> 'VectorWumpusEnv':
+        corpus = open_corpus(path)
+        return cls(corpus.codes(start, len(corpus) if stop is None else stop), agent_config, max_steps)
+
+    def reset(self) -> Dict[str, np.ndarray]:
+        """Start every episode afresh and return the first observation"""
+        np.equal(self.worlds, CELL_PIT, out=self.pit)
+        np.equal(self.worlds, CELL_WUMPUS, out=self.wumpus)
+        np.equal(self.worlds, CELL_GOLD, out=self.gold)
+        self.percepts[:] = (PERCEPT_BREEZE * neighbors(self.pit)
+                            | PERCEPT_GLITTER * self.gold
+                            | PERCEPT_NO_PIT * ~self.pit)
+        self._update_stench(self.index)
+
+        self.position[:] = self.starts
+        self.visited[:] = False
+        self.visited[self.index, self.starts[:, 0], self.starts[:, 1]] = True
+        self.arrows[:] = self.config.arrow_count
+        self.gold_count[:] = 0
+        self.steps[:] = 0
+        self.score[:] = 0
+        self.rewards[:] = 0
+        self.alive[:] = True
+        self.won[:] = False
+        self.done[:] = False
+        self.truncated[:] = False
+        self.death_cause[:] = 0
+        return self._observe()
+
+    def _update_stench(self, worlds: np.ndarray) -> None:
+        """Recompute the stench and no-Wumpus percept bits of some worlds"""
+        wumpus = self.wumpus[worlds]
+        self.percepts[worlds] = ((self.percepts[worlds] & ~np.uint8(PERCEPT_STENCH | PERCEPT_NO_WUMPUS))
+                                 | PERCEPT_STENCH * neighbors(wumpus)
+                                 | PERCEPT_NO_WUMPUS * ~wumpus)
+
+    def _observe(self) -> Dict[str, np.ndarray]:
+        self.percept[:] = self.percepts[self.index, self.position[:, 0], self.position[:, 1]]
+        self.percept |= PERCEPT_VISITED
+        return self.observation
+
+    def step(self, actions: np.ndarray) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]:
+        """Apply one action per world; returns (observation, rewards, done)"""
+        actions = np.asarray(actions)
+        config = self.config
+        active = ~self.done
+        rewards = self.rewards
+        rewards[:] = np.where(active, -DECISION_COST, 0)
+        rows, cols = self.position[:, 0], self.position[:, 1]
+
+        # Moves (off the board: no move and no movement cost)
+        worlds = np.flatnonzero(active & (actions < SHOOT))
+        if len(worlds):
+            direction = actions[worlds]
+            new_rows = rows[worlds] + DELTA_ROWS[direction]
+            new_cols = cols[worlds] + DELTA_COLS[direction]
+            inside = (new_rows >= 0) & (new_rows < self.rows) & (new_cols >= 0) & (new_cols < self.cols)
+            worlds, new_rows, new_cols = worlds[inside], new_rows[inside], new_cols[inside]
+            rows[worlds] = new_rows
+            cols[worlds] = new_cols
+            self.visited[worlds, new_rows, new_cols] = True
+            rewards[worlds] -= config.movement_cost
+
+            pit = self.pit[worlds, new_rows, new_cols]
+            eaten = self.wumpus[worlds, new_rows, new_cols] & ~pit
+            dead = worlds[pit | eaten]
+            self.death_cause[worlds[pit]] = DEATH_CAUSES.index("pit")
+            self.death_cause[worlds[eaten]] = DEATH_CAUSES.index("wumpus")
+            self.alive[dead] = False
+            self.done[dead] = True
+            rewards[dead] -= config.death_penalty
+
+        # Shots: each arrow flies until it leaves the board or hits a live Wumpus
+        worlds = np.flatnonzero(active & (actions >= SHOOT) & (actions < GRAB) & (self.arrows > 0))
+        if len(worlds):
+            self.arrows[worlds] -= 1
+            rewards[worlds] -= config.arrow_cost
+            direction = actions[worlds] - SHOOT
+            arrow_rows, arrow_cols = rows[worlds].copy(), cols[worlds].copy()
+            flying = np.ones(len(worlds), dtype=bool)
+            hit_worlds = []
+            while flying.any():
+                arrow_rows += DELTA_ROWS[direction]
+                arrow_cols += DELTA_COLS[direction]
+                flying &= ((arrow_rows >= 0) & (arrow_rows < self.rows)
+                           & (arrow_cols >= 0) & (arrow_cols < self.cols))
+                hit = flying.copy()
+                hit[flying] = self.wumpus[worlds[flying], arrow_rows[flying], arrow_cols[flying]]
+                if hit.any():
+                    self.wumpus[worlds[hit], arrow_rows[hit], arrow_cols[hit]] = False
+                    hit_worlds.append(worlds[hit])
+                    flying &= ~hit
+            if hit_worlds:
+                self._update_stench(np.concatenate(hit_worlds))
+
+        # Grabs
+        worlds = np.flatnonzero(active & (actions == GRAB))
+        if len(worlds):
+            worlds = worlds[self.gold[worlds, rows[worlds], cols[worlds]]]
+            self.gold[worlds, rows[worlds], cols[worlds]] = False
+            self.percepts[worlds, rows[worlds], cols[worlds]] &= ~np.uint8(PERCEPT_GLITTER)
+            self.gold_count[worlds] += 1
+            rewards[worlds] += config.gold_reward
+            winners = worlds[self.gold_count[worlds] == config.expected_gold_count]
+            self.won[winners] = True
+            self.done[winners] = True
+            rewards[winners] -= DECISION_COST  # the agent's final 'win' decision
+
+        self.steps[active] += 1
+        out_of_steps = active & ~self.done & (self.steps >= self.max_steps)
+        self.truncated |= out_of_steps
+        self.done |= out_of_steps
+        self.score += rewards
+        return self._observe(), rewards, self.done
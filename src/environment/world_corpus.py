@@ -0,0 +1,229 @@
+"""Packed binary world corpora with memory-mapped random access.
+
+A corpus file holds any number of worlds of one size:
+
+    header   32 bytes, little-endian: magic b'WUMPCORP', format version,
+             bits per cell, reserved byte, rows, cols, world count, record stride
+    records  one per world, `stride` bytes each: the cell codes of
+             utils.constants in row-major order, 4 bits per cell, even cells
+             in the low nibble
+
+Records have a fixed stride, so world N starts at 32 + N * stride.
+WorldCorpus maps the file with numpy.memmap: a worker opens a corpus once and
+reads any world without parsing text.  CorpusWriter appends batches of code
+arrays (such as WorldGenerator batches) and writes the final count into the
+header when it is closed, so corpora of millions of worlds can be streamed.
+
+A world in a corpus is named "<corpus path>#<index>"; load_world() accepts
+those names as well as plain .world/.txt paths.
+
+    python -m src.environment.world_corpus pack corpus.wcorp worlds/*.world
+    python -m src.environment.world_corpus unpack corpus.wcorp worlds_out/
+"""
+import struct
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional
+import numpy as np
+from .world_load import WorldLoader
+from .world_generator import write_worlds
+from ..utils.constants import CELL_SYMBOLS, SYMBOL_CODES
+
+MAGIC = b"WUMPCORP"
+FORMAT_VERSION = 1
+BITS_PER_CELL = 4
+HEADER = struct.Struct("<8sHBBIIQI")
+CORPUS_EXTENSION = ".wcorp"
+
+# Byte -> cell code for world-file symbols; 255 marks a symbol with no code
+_CODES = np.full(256, 255, dtype=np.uint8)
+for _symbol, _code in SYMBOL_CODES.items():
+    _CODES[ord(_symbol)] = _code
+_SYMBOLS = np.frombuffer(CELL_SYMBOLS.encode("ascii"), dtype=np.uint8)
+
+
+def record_stride(rows: int, cols: int) -> int:
+    return (rows * cols * BITS_PER_CELL + 7) // 8
+
+
+def pack(worlds: np.ndarray) -> np.ndarray:
+    """(n, rows, cols) cell codes -> (n, stride) packed records"""
+    n = len(worlds)
+    cells = worlds.reshape(n, -1)
+    if cells.shape[1] % 2:
+        cells = np.hstack([cells, np.zeros((n, 1), dtype=np.uint8)])
+    return (cells[:, 0::2] | (cells[:, 1::2] << 4)).astype(np.uint8)
+
+
+def unpack(records: np.ndarray, rows: int, cols: int) -> np.ndarray:
+    """(n, stride) packed records -> (n, rows, cols) cell codes"""
+    n = len(records)
+    cells = np.empty((n, records.shape[1] * 2), dtype=np.uint8)
+    cells[:, 0::2] = records & 0x0F
+    cells[:, 1::2] = records >> 4
+    return cells[:, :rows * cols].reshape(n, rows, cols)
+
+
+def board_codes(board: List[List[str]]) -> np.ndarray:
+    """A character board as a (rows, cols) array of cell codes"""
+    text = "".join("".join(row) for row in board).encode("ascii")
+    codes = _CODES[np.frombuffer(text, dtype=np.uint8)]
+    if (codes == 255).any():
+        raise ValueError("Board has symbols that cannot be stored in a corpus")
+    return codes.reshape(len(board), len(board[0]))
+
+
+class CorpusWriter:
+    """Streams worlds of one size into a corpus file; use as a context manager"""
+
+    def __init__(self, path: str, rows: int, cols: int):
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.stride = record_stride(rows, cols)
+        self.count = 0
+        self.file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self) -> None:
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, BITS_PER_CELL, 0,
+                                    self.rows, self.cols, self.count, self.stride))
+
+    def write(self, worlds: np.ndarray) -> None:
+        """Append a batch of (n, rows, cols) cell-code arrays"""
+        if worlds.shape[1:] != (self.rows, self.cols):
+            raise ValueError(f"Corpus holds {self.rows}x{self.cols} worlds, got {worlds.shape[1:]}")
+        self.file.write(pack(worlds).tobytes())
+        self.count += len(worlds)
+
+    def write_board(self, board: List[List[str]]) -> None:
+        self.write(board_codes(board)[None])
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self._write_header()
+            self.file.close()
+
+    def __enter__(self) -> 'CorpusWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class WorldCorpus:
+    """Read-only, memory-mapped view of a corpus file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' is not a world corpus")
+        _, version, bits, _, self.rows, self.cols, self.count, self.stride = HEADER.unpack(header)
+        if version != FORMAT_VERSION or bits != BITS_PER_CELL:
+            raise ValueError(f"Unsupported corpus format in '{path}'")
+        if self.count:
+            # A plain ndarray view of the mapping: slicing it skips memmap bookkeeping
+            self.records = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size,
+                                     shape=(self.count, self.stride)).view(np.ndarray)
+        else:
+            self.records = np.zeros((0, self.stride), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def codes(self, start: int, stop: Optional[int] = None) -> np.ndarray:
+        """Worlds start..stop-1 (just world start if stop is None) as cell codes"""
+        if stop is None:
+            return unpack(self.records[start:start + 1], self.rows, self.cols)[0]
+        return unpack(self.records[start:stop], self.rows, self.cols)
+
+    def batches(self, batch_size: int = 10000) -> Iterator[np.ndarray]:
+        for start in range(0, self.count, batch_size):
+            yield self.codes(start, min(start + batch_size, self.count))
+
+    def board(self, index: int) -> List[List[str]]:
+        if not 0 <= index < self.count:
+            raise IndexError(f"World {index} is outside the corpus of {self.count}")
+        symbols = _SYMBOLS[self.codes(index)]
+        return [list(row.tobytes().decode("ascii")) for row in symbols]
+
+    def loader(self, index: int) -> WorldLoader:
+        return WorldLoader.from_board(self.board(index), world_name(self.path, index))
+
+    def names(self) -> List[str]:
+        return [world_name(self.path, i) for i in range(self.count)]
+
+
+def world_name(corpus_path: str, index: int) -> str:
+    return f"{corpus_path}#{index}"
+
+
+@lru_cache(maxsize=8)
+def open_corpus(path: str) -> WorldCorpus:
+    """A corpus opened once per process and shared by every later lookup"""
+    return WorldCorpus(path)
+
+
+def load_world(name: str) -> WorldLoader:
+    """Loader for a world file or a "<corpus>#<index>" corpus entry"""
+    path, _, index = name.rpartition("#")
+    if path.endswith(CORPUS_EXTENSION) and index.isdigit():
+        return open_corpus(path).loader(int(index))
+    return WorldLoader(name)
+
+
+def pack_world_files(world_files: Iterable[str], corpus_path: str, batch_size: int = 10000) -> int:
+    """Convert .world/.txt files (all of one size) into a corpus; returns the count"""
+    writer: Optional[CorpusWriter] = None
+    batch = []
+    try:
+        for world_file in world_files:
+            codes = board_codes(WorldLoader(world_file).get_board())
+            if writer is None:
+                writer = CorpusWriter(corpus_path, *codes.shape)
+            batch.append(codes)
+            if len(batch) == batch_size:
+                writer.write(np.stack(batch))
+                batch = []
+        if writer is None:
+            raise ValueError("No world files to pack")
+        if batch:
+            writer.write(np.stack(batch))
+        return writer.count
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def unpack_corpus(corpus_path: str, directory: str, batch_size: int = 10000) -> int:
+    """Write every world of a corpus to its own .world file; returns the count"""
+    index = 0
+    for worlds in WorldCorpus(corpus_path).batches(batch_size):
+        index = write_worlds(directory, worlds, index)
+    return index
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert between world files and world corpora")
+    commands = parser.add_subparsers(dest="command", required=True)
+    pack_parser = commands.add_parser("pack", help="world files -> corpus")
+    pack_parser.add_argument("corpus")
+    pack_parser.add_argument("worlds", nargs="+")
+    unpack_parser = commands.add_parser("unpack", help="corpus -> world files")
+    unpack_parser.add_argument("corpus")
+    unpack_parser.add_argument("directory")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        count = pack_world_files(args.worlds, args.corpus)
+        print(f"Packed {count} worlds into {args.corpus}")
+    else:
+        count = unpack_corpus(args.corpus, args.directory)
+        print(f"Unpacked {count} worlds into {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Vectorized random world generation.
+
+Worlds are generated in batches as (n, rows, cols) uint8 arrays of the cell
+codes in utils.constants, so a batch of tens of thousands of worlds costs a
+few NumPy operations instead of a Python loop per cell.  The agent starts at
+the bottom-left corner, which is always empty.  Every other cell holds a pit
+with probability pit_probability; the Wumpus and gold counts are exact, on
+cells drawn uniformly from the remaining ones.
+
+A vectorized flood fill then discards worlds in which some gold cannot be
+reached from the start without entering a pit or a live Wumpus, and the
+survivors are streamed to disk batch by batch, as .world files or into one
+packed corpus file (see world_corpus.py), so corpus size is not limited by
+memory.
+
+    python -m src.environment.world_generator corpus/ --count 100000 --size 10x10 --seed 0
+    python -m src.environment.world_generator corpus.wcorp --corpus --count 1000000 --seed 0
+"""
+import os
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from ..utils.constants import CELL_AGENT, CELL_GOLD, CELL_PIT, CELL_SYMBOLS, CELL_WUMPUS
+
+# Lookup table from cell code to world-file character
+_SYMBOL_BYTES = np.frombuffer(CELL_SYMBOLS.encode("ascii"), dtype=np.uint8)
+
+
+class WorldGenerator:
+    def __init__(self, rows: int = 10, cols: int = 10, pit_probability: float = 0.2,
+                 wumpus_count: int = 1, gold_count: int = 1, seed: Optional[int] = None):
+        if rows < 1 or cols < 1:
+            raise ValueError("World must have at least one row and column")
+        if wumpus_count + gold_count > rows * cols - 1:
+            raise ValueError("Too many Wumpuses and gold for the world size")
+        if gold_count < 1:
+            raise ValueError("World must contain at least one gold piece")
+        self.rows = rows
+        self.cols = cols
+        self.pit_probability = pit_probability
+        self.wumpus_count = wumpus_count
+        self.gold_count = gold_count
+        self.start = (rows - 1, 0)
+        self.rng = np.random.default_rng(seed)
+
+    def generate(self, n: int) -> np.ndarray:
+        """n unfiltered worlds as an (n, rows, cols) array of cell codes"""
+        cells = self.rows * self.cols
+        start = self.start[0] * self.cols + self.start[1]
+        placed = self.wumpus_count + self.gold_count
+
+        # The smallest `placed` of n x cells random keys pick distinct cells per world
+        keys = self.rng.random((n, cells))
+        keys[:, start] = 2.0  # never chosen
+        chosen = np.argpartition(keys, placed - 1, axis=1)[:, :placed]
+
+        worlds = np.where(self.rng.random((n, cells)) < self.pit_probability,
+                          CELL_PIT, 0).astype(np.uint8)
+        rows = np.arange(n)[:, None]
+        worlds[rows, chosen[:, :self.wumpus_count]] = CELL_WUMPUS
+        worlds[rows, chosen[:, self.wumpus_count:]] = CELL_GOLD
+        worlds[:, start] = CELL_AGENT
+        return worlds.reshape(n, self.rows, self.cols)
+
+    def batches(self, count: int, batch_size: int = 10000, solvable_only: bool = True,
+                max_empty_batches: int = 100) -> Iterator[np.ndarray]:
+        """Yield batches of worlds until count have been produced.  Raises
+        RuntimeError once max_empty_batches batches in a row have no world
+        whose gold is reachable, as when pit_probability is close to 1."""
+        produced = 0
+        empty = 0
+        while produced < count:
+            worlds = self.generate(batch_size)
+            if solvable_only:
+                worlds = worlds[gold_reachable(worlds, self.start)]
+            worlds = worlds[:count - produced]
+            produced += len(worlds)
+            if len(worlds):
+                empty = 0
+                yield worlds
+            else:
+                empty += 1
+                if empty >= max_empty_batches:
+                    raise RuntimeError(
+                        f"No world with reachable gold in {empty} batches of {batch_size}; "
+                        f"lower the pit probability or the Wumpus count")
+
+
+def gold_reachable(worlds: np.ndarray, start: Tuple[int, int]) -> np.ndarray:
+    """Boolean mask of the worlds in which every gold cell can be reached from
+    start through cells free of pits and Wumpuses.
+
+    Flood-fills all worlds at once.  Worlds up to 63 columns wide keep each
+    row as one uint64 bitmask and are filled by sweeping up and then down the
+    rows, spreading through whole runs of free cells at every row, so a world
+    settles in a few sweeps however long its paths.  Worlds leave the working
+    set as soon as a sweep pair changes nothing in them.
+    """
+    passable = (worlds != CELL_PIT) & (worlds != CELL_WUMPUS)
+    gold = worlds == CELL_GOLD
+    rows, cols = worlds.shape[1:]
+    if cols >= 64:
+        return _gold_reachable_cells(passable, gold, start)
+
+    # (rows, n) layout, so one row of every world is a contiguous vector
+    free = np.ascontiguousarray(_pack_rows(passable).T)
+    reached = np.zeros_like(free)
+    seed = free[start[0]] & np.uint64(1 << start[1])
+    reached[start[0]] = _fill_runs(seed, free[start[0]], cols)
+
+    active = np.arange(len(worlds))
+    reach, active_free = reached, free
+    while len(active):
+        before = reach.copy()
+        for row in range(rows - 2, -1, -1):
+            reach[row] = _fill_runs(reach[row] | (reach[row + 1] & active_free[row]),
+                                    active_free[row], cols)
+        for row in range(1, rows):
+            reach[row] = _fill_runs(reach[row] | (reach[row - 1] & active_free[row]),
+                                    active_free[row], cols)
+        changed = (reach != before).any(axis=0)
+        if not changed.any():
+            break
+        if changed.sum() * 2 < len(active):
+            reached[:, active] = reach
+            active, reach, active_free = active[changed], reach[:, changed], active_free[:, changed]
+    reached[:, active] = reach
+
+    return ~(_pack_rows(gold).T & ~reached).any(axis=0)
+
+
+def _fill_runs(seed: np.ndarray, free: np.ndarray, cols: int) -> np.ndarray:
+    """Spread the seed bits (a subset of free) through their runs of free bits"""
+    # Adding the seeds carries through each run towards the high bits ...
+    filled = seed | (((free + seed) ^ free) & free)
+    # ... and an occluded fill (doubling shifts) spreads towards the low bits
+    shift = 1
+    while shift < cols:
+        step = np.uint64(shift)
+        filled |= (filled >> step) & free
+        free = free & (free >> step)
+        shift *= 2
+    return filled
+
+
+def _pack_rows(cells: np.ndarray) -> np.ndarray:
+    """(n, rows, cols) booleans, cols < 64, as (n, rows) uint64 with bit c for column c"""
+    packed = np.packbits(cells, axis=2, bitorder="little")
+    words = np.zeros(cells.shape[:2] + (8,), dtype=np.uint8)
+    words[..., :packed.shape[2]] = packed
+    return words.view("<u8")[..., 0]
+
+
+def _gold_reachable_cells(passable: np.ndarray, gold: np.ndarray,
+                          start: Tuple[int, int]) -> np.ndarray:
+    """gold_reachable for wide worlds: one step of 4-neighbour dilation per iteration"""
+    n = len(passable)
+    reached = np.zeros_like(passable)
+    reached[:, start[0], start[1]] = passable[:, start[0], start[1]]
+
+    active = np.arange(n)
+    while len(active):
+        reach = reached[active]
+        grown = reach.copy()
+        grown[:, 1:, :] |= reach[:, :-1, :]
+        grown[:, :-1, :] |= reach[:, 1:, :]
+        grown[:, :, 1:] |= reach[:, :, :-1]
+        grown[:, :, :-1] |= reach[:, :, 1:]
+        grown &= passable[active]
+        changed = (grown != reach).reshape(len(active), -1).any(axis=1)
+        reached[active] = grown
+        active = active[changed]
+
+    return ~(gold & ~reached).reshape(n, -1).any(axis=1)
+
+
+def world_text(world: np.ndarray) -> str:
+    """A world array in the world-file format, one row of symbols per line"""
+    symbols = _SYMBOL_BYTES[world]
+    newlines = np.full((world.shape[0], 1), ord("\n"), dtype=np.uint8)
+    return np.hstack([symbols, newlines]).tobytes().decode("ascii")
+
+
+def write_worlds(directory: str, worlds: np.ndarray, start_index: int = 0,
+                 prefix: str = "world_") -> int:
+    """Write each world to its own .world file; returns the next free index"""
+    os.makedirs(directory, exist_ok=True)
+    for offset, world in enumerate(worlds):
+        path = os.path.join(directory, f"{prefix}{start_index + offset:07d}.world")
+        with open(path, "w") as f:
+            f.write(world_text(world))
+    return start_index + len(worlds)
+
+
+def _parse_size(text: str) -> Tuple[int, int]:
+    rows, _, cols = text.lower().partition("x")
+    return int(rows), int(cols or rows)
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate random Wumpus worlds in bulk")
+    parser.add_argument("output", help="directory for the .world files, or the corpus file")
+    parser.add_argument("--corpus", action="store_true",
+                        help="write one packed corpus file instead of .world files")
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--size", type=_parse_size, default=(10, 10), help="ROWSxCOLS, e.g. 10x10")
+    parser.add_argument("--pit-probability", type=float, default=0.2)
+    parser.add_argument("--wumpus", type=int, default=1, help="Wumpuses per world")
+    parser.add_argument("--gold", type=int, default=1, help="gold pieces per world")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--unfiltered", action="store_true",
+                        help="keep worlds whose gold is unreachable")
+    parser.add_argument("--max-empty-batches", type=int, default=100,
+                        help="give up after this many batches in a row without a world to keep")
+    args = parser.parse_args()
+
+    generator = WorldGenerator(*args.size, pit_probability=args.pit_probability,
+                               wumpus_count=args.wumpus, gold_count=args.gold, seed=args.seed)
+    batches = generator.batches(args.count, args.batch_size, not args.unfiltered,
+                                args.max_empty_batches)
+    if args.corpus:
+        from .world_corpus import CorpusWriter
+        with CorpusWriter(args.output, *args.size) as writer:
+            for worlds in batches:
+                writer.write(worlds)
+        index = writer.count
+    else:
+        index = 0
+        for worlds in batches:
+            index = write_worlds(args.output, worlds, index)
+    print(f"Wrote {index} worlds to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,40 @@
 # import random
 from typing import List, Tuple, Optional
+from ..utils.bitboard import WorldBits
+
+DEFAULT_WORLD_SIZE = (10, 10)
+
+# Layout of the generated default world as (rows above the bottom row, column, symbol)
+DEFAULT_LAYOUT = [
+    (1, 3, 'P'), (1, 6, 'P'), (2, 0, 'P'), (2, 7, 'G'),
+    (4, 0, 'W'), (4, 6, 'P'), (5, 3, 'G'), (6, 5, 'P'),
+    (7, 6, 'P'), (8, 2, 'W'), (9, 3, 'P'), (9, 6, 'P'),
+]
 
 class WorldLoader:
-    def __init__(self, file_path: str = "worlds/default.world", world_size: Tuple[int, int] = (10, 10)):
+    def __init__(self, file_path: str = "worlds/default.world", world_size: Optional[Tuple[int, int]] = None):
+        """Load a world; world_size None takes the size from the file (any rectangle)"""
         self.file_path = file_path
         self.world_size = world_size
-        self.board: List[List[str]] = self.load_world()
+        self._set_board(self.load_world())
+
+    @classmethod
+    def from_board(cls, board: List[List[str]], file_path: str = "<board>") -> 'WorldLoader':
+        """A loader for a board already in memory (e.g. read from a world corpus)"""
+        if not board or any(len(row) != len(board[0]) for row in board):
+            raise ValueError("World rows must all have the same length")
+        loader = cls.__new__(cls)
+        loader.file_path = file_path
+        loader.world_size = None
+        loader._set_board([row[:] for row in board])
+        return loader
+
+    def _set_board(self, board: List[List[str]]) -> None:
+        self.board: List[List[str]] = board
+        self.world_size = (len(self.board), len(self.board[0]))
         self.validate_world()
+        self.percept_table = WorldBits.from_board(self.board).percept_table()
+        self.start_position = self._find_start()
 
     def load_world(self) -> List[List[str]]:
         """Load world from file or generate default if not found"""
@@ -26,40 +54,37 @@ class WorldLoader:
                 board.append([c for c in line if c in ['W', 'P', 'G', '-', 'A']])
         
         # Validate dimensions
-        if len(board) != self.world_size[0] or any(len(row) != self.world_size[1] for row in board):
+        if not board or any(len(row) != len(board[0]) for row in board):
+            raise ValueError("World rows must all have the same length")
+        if self.world_size is not None and (len(board), len(board[0])) != tuple(self.world_size):
             raise ValueError(f"World dimensions must be {self.world_size}")
         
         return board
 
     def _generate_default_world(self) -> List[List[str]]:
-        """Generate a simple default world"""
-        board = [['-' for _ in range(self.world_size[1])] for _ in range(self.world_size[0])]
+        """Generate a simple default world anchored at the bottom-left corner"""
+        rows, cols = self.world_size or DEFAULT_WORLD_SIZE
+        board = [['-' for _ in range(cols)] for _ in range(rows)]
         
         # Place agent
-        board[9][0] = 'A'
+        board[rows - 1][0] = 'A'
         
-        # Place some hazards and gold
-        board[8][3] = 'P'
-        board[8][6] = 'P'
-        board[7][0] = 'P'
-        board[7][7] = 'G'
-
-        board[5][0] = 'W'
-        board[5][6] = 'P'
-
-        board[4][3] = 'G'
-
-        board[3][5] = 'P'
-
-        board[2][6] = 'P'
-
-        board[1][2] = 'W'
-
-        board[0][3] = 'P'
-        board[0][6] = 'P'
+        # Place the hazards and gold that fit
+        for up, col, symbol in DEFAULT_LAYOUT:
+            if up < rows and col < cols:
+                board[rows - 1 - up][col] = symbol
+        if not any('G' in row for row in board):
+            board[0][cols - 1] = 'G'
         
         return board
 
+    def _find_start(self) -> Tuple[int, int]:
+        """Agent start: the 'A' cell if the world has one, else the bottom-left corner"""
+        for i, row in enumerate(self.board):
+            if 'A' in row:
+                return (i, row.index('A'))
+        return (self.world_size[0] - 1, 0)
+
     def validate_world(self) -> None:
         """Validate world configuration"""
         if not any('G' in row for row in self.board):
@@ -69,6 +94,10 @@ class WorldLoader:
         """Get a deep copy of the board"""
         return [row.copy() for row in self.board]
 
+    def get_percept_table(self) -> List[int]:
+        """Get a copy of the per-cell percept bitmasks, for a game to patch as the world changes"""
+        return self.percept_table.copy()
+
     def find_elements(self, element: str) -> List[Tuple[int, int]]:
         """Find all positions of a specific element"""
         return [
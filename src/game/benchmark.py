@@ -0,0 +1,304 @@
+"""Multi-process benchmark of the agent over a corpus of worlds.
+
+Fans episodes out over a process pool, one headless WumpusGame and Agent per
+episode, and aggregates win rate, score, steps, deaths by cause and per-step
+decision latency.  Episode i of a run is seeded with seed + i whatever the
+number of workers, so two runs with the same corpus and seed are comparable
+between agent versions.  With --oracle, every world is also solved with full
+information (see oracle.py) and each episode's regret, the optimal score minus
+the score it got, is reported; an oracle cache file keeps worlds from being
+solved again in later runs.  With --profile, every decision is timed phase by
+phase (see agent/profiling.py) and the merged per-phase latency histograms
+are added to the JSON output.
+
+    python -m src.game.benchmark worlds/ --episodes 20 --seed 0 --oracle --oracle-cache oracle.json
+    python -m src.game.benchmark worlds/ --profile
+"""
+import csv
+import glob
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from .oracle import OracleResult, OracleSolver, world_hash
+from .simulator import EpisodeResult, HeadlessSimulator
+from .trace import TraceRecorder
+from ..environment.world_corpus import CORPUS_EXTENSION, load_world, open_corpus
+from ..agent.agent import AgentConfig
+from ..agent.profiling import DecisionProfiler
+from ..utils.histogram import LatencyHistogram
+
+WORLD_PATTERNS = ("*.world", "*.txt")
+PERCENTILES = (5, 25, 50, 75, 95)
+LATENCY_PERCENTILES = (50, 90, 99)
+EPISODE_FIELDS = ("index", "world_file", "seed", "won", "alive", "score", "steps",
+                  "death_cause", "truncated", "decision_mean_ms", "decision_max_ms")
+ORACLE_FIELDS = ("optimal_score", "regret")
+CHUNK_EPISODES = 256  # most episodes a worker plays per task
+
+
+def find_worlds(sources: Iterable[str]) -> List[str]:
+    """World names from paths, directories (their .world/.txt files), glob
+    patterns and corpus files (every world in them)"""
+    worlds = []
+    for source in sources:
+        if os.path.isdir(source):
+            for pattern in WORLD_PATTERNS:
+                worlds.extend(sorted(glob.glob(os.path.join(source, pattern))))
+        elif glob.has_magic(source):
+            worlds.extend(find_worlds(sorted(glob.glob(source))))
+        elif source.endswith(CORPUS_EXTENSION):
+            worlds.extend(open_corpus(source).names())
+        else:
+            worlds.append(source)
+    return worlds
+
+
+# Each worker process builds its simulator once and reuses it for every task
+_simulator: Optional[HeadlessSimulator] = None
+
+
+def _init_worker(agent_config: AgentConfig, max_steps: int, trace_dir: Optional[str] = None,
+                 profile: bool = False) -> None:
+    global _simulator
+    recorder = None
+    if trace_dir:
+        # One trace per worker process, flushed after every chunk of episodes
+        os.makedirs(trace_dir, exist_ok=True)
+        recorder = TraceRecorder(os.path.join(trace_dir, f"worker-{os.getpid()}.wtrace"))
+    _simulator = HeadlessSimulator(agent_config, max_steps, recorder,
+                                   DecisionProfiler() if profile else None, LatencyHistogram())
+
+
+Task = Tuple[int, str, int]
+
+
+def _run_chunk(tasks: Sequence[Task]) -> Tuple[List[Tuple[int, EpisodeResult]], LatencyHistogram,
+                                              Optional[DecisionProfiler]]:
+    results = [(index, _simulator.run_episode(world_file, seed)) for index, world_file, seed in tasks]
+    if _simulator.recorder is not None:
+        _simulator.recorder.flush()
+    # Hand this chunk's decision times back as histograms and start the next afresh
+    latency, profile = _simulator.latency, _simulator.profiler
+    _simulator.latency = LatencyHistogram()
+    if profile is not None:
+        _simulator.profiler = DecisionProfiler()
+    return results, latency, profile
+
+
+_oracle: Optional[OracleSolver] = None
+
+
+def _init_oracle(agent_config: AgentConfig) -> None:
+    global _oracle
+    _oracle = OracleSolver(agent_config)
+
+
+def _solve_task(world_file: str) -> OracleResult:
+    return _oracle.solve(world_file)
+
+
+class Benchmark:
+    def __init__(self, agent_config: Optional[AgentConfig] = None, max_steps: int = 1000,
+                 workers: Optional[int] = None, trace_dir: Optional[str] = None,
+                 profile: bool = False):
+        self.agent_config = agent_config or AgentConfig()
+        self.max_steps = max_steps
+        self.workers = workers or os.cpu_count() or 1
+        self.trace_dir = trace_dir  # each worker writes its own trace file here
+        # run() leaves the merged decision times of its episodes here (in nanoseconds),
+        # and with profile set their merged phase timings
+        self.latency = LatencyHistogram()
+        self.profile: Optional[DecisionProfiler] = DecisionProfiler() if profile else None
+
+    def run(self, world_files: Sequence[str], episodes: int = 1, seed: int = 0) -> List[EpisodeResult]:
+        """Play every world `episodes` times; results come back in task order.
+        Workers play chunks of episodes and send back one latency histogram
+        (and profile) per chunk, never per-step times."""
+        tasks = [(i, world_file, seed + i)
+                 for i, world_file in enumerate(w for w in world_files for _ in range(episodes))]
+        initargs = (self.agent_config, self.max_steps, self.trace_dir, self.profile is not None)
+        results: List[Optional[EpisodeResult]] = [None] * len(tasks)
+        if self.workers == 1 or len(tasks) <= 1:
+            _init_worker(*initargs)
+            self._collect(results, *_run_chunk(tasks))
+            if _simulator.recorder is not None:
+                _simulator.recorder.close()
+            return results
+
+        size = max(1, min(CHUNK_EPISODES, len(tasks) // (self.workers * 8)))
+        chunks = [tasks[i:i + size] for i in range(0, len(tasks), size)]
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker, initargs=initargs) as pool:
+            for chunk in pool.map(_run_chunk, chunks):
+                self._collect(results, *chunk)
+        return results
+
+    def _collect(self, results: List[Optional[EpisodeResult]],
+                 chunk: List[Tuple[int, EpisodeResult]], latency: LatencyHistogram,
+                 profile: Optional[DecisionProfiler]) -> None:
+        for index, result in chunk:
+            results[index] = result
+        self.latency.merge(latency)
+        if profile is not None:
+            self.profile.merge(profile)
+
+    def solve(self, world_files: Sequence[str], oracle: OracleSolver) -> Dict[str, OracleResult]:
+        """Oracle result for each distinct world file; only worlds missing from
+        the oracle's cache are solved, spread over the workers"""
+        solved: Dict[str, OracleResult] = {}
+        missing = []
+        for world_file in dict.fromkeys(world_files):
+            loader = load_world(world_file)
+            cached = oracle.cache.get(world_hash(loader.get_board(), loader.start_position,
+                                                 oracle.agent_config))
+            if cached is not None:
+                solved[world_file] = cached
+            else:
+                missing.append(world_file)
+
+        if self.workers == 1 or len(missing) <= 1:
+            for world_file in missing:
+                solved[world_file] = oracle.solve(world_file)
+            return solved
+        chunksize = max(1, len(missing) // (self.workers * 8))
+        with ProcessPoolExecutor(self.workers, initializer=_init_oracle,
+                                 initargs=(oracle.agent_config,)) as pool:
+            for world_file, result in zip(missing, pool.map(_solve_task, missing, chunksize=chunksize)):
+                oracle.cache[result.world_hash] = result
+                solved[world_file] = result
+        return solved
+
+
+def _distribution(values: Sequence[float], percentiles: Sequence[int], scale: float = 1.0) -> Dict:
+    if not len(values):
+        return {}
+    array = np.asarray(values, dtype=float) * scale
+    summary = {"mean": float(array.mean()), "min": float(array.min()), "max": float(array.max())}
+    for p, value in zip(percentiles, np.percentile(array, percentiles)):
+        summary[f"p{p}"] = float(value)
+    return summary
+
+
+def summarize(results: Sequence[EpisodeResult],
+              optima: Optional[Dict[str, OracleResult]] = None,
+              latency: Optional[LatencyHistogram] = None) -> Dict:
+    """Aggregate statistics over a run; latencies, from the run's merged
+    histogram of decision times in nanoseconds, are in milliseconds.  Regret
+    covers the episodes on worlds the oracle could win."""
+    wins = sum(r.won for r in results)
+    summary = {
+        "episodes": len(results),
+        "wins": wins,
+        "win_rate": wins / len(results) if results else 0.0,
+        "truncated": sum(r.truncated for r in results),
+        "deaths": dict(Counter(r.death_cause for r in results if r.death_cause)),
+        "score": _distribution([r.score for r in results], PERCENTILES),
+        "steps": _distribution([r.steps for r in results], PERCENTILES),
+        "decision_ms": (latency.summary(1e-6, LATENCY_PERCENTILES)
+                        if latency is not None and latency.count else {}),
+    }
+    if optima is not None:
+        solvable = [(r, optima[r.world_file]) for r in results if optima[r.world_file].solvable]
+        summary["unsolvable_episodes"] = len(results) - len(solvable)
+        summary["optimal_score"] = _distribution([o.optimal_score for _, o in solvable], PERCENTILES)
+        summary["regret"] = _distribution([o.optimal_score - r.score for r, o in solvable],
+                                          PERCENTILES)
+    return summary
+
+
+def episode_rows(results: Sequence[EpisodeResult],
+                 optima: Optional[Dict[str, OracleResult]] = None) -> List[Dict]:
+    """One flat record per episode"""
+    fields = EPISODE_FIELDS + (ORACLE_FIELDS if optima is not None else ())
+    rows = []
+    for index, result in enumerate(results):
+        row = asdict(result)
+        row["index"] = index
+        row["decision_mean_ms"] = 1000.0 * result.decision_time / result.steps if result.steps else 0.0
+        row["decision_max_ms"] = 1000.0 * result.decision_max
+        if optima is not None:
+            optimal = optima[result.world_file].optimal_score
+            row["optimal_score"] = optimal
+            row["regret"] = None if optimal is None else optimal - result.score
+        rows.append({key: row[key] for key in fields})
+    return rows
+
+
+def to_json(summary: Dict, results: Sequence[EpisodeResult], run_info: Dict,
+            optima: Optional[Dict[str, OracleResult]] = None) -> str:
+    return json.dumps({"run": run_info, "summary": summary,
+                       "episodes": episode_rows(results, optima)}, indent=2)
+
+
+def to_csv(results: Sequence[EpisodeResult],
+           optima: Optional[Dict[str, OracleResult]] = None) -> str:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=EPISODE_FIELDS + (ORACLE_FIELDS if optima is not None else ()))
+    writer.writeheader()
+    writer.writerows(episode_rows(results, optima))
+    return out.getvalue()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark the agent over a corpus of worlds")
+    parser.add_argument("worlds", nargs="+", help="world files, directories or glob patterns")
+    parser.add_argument("--episodes", type=int, default=1, help="episodes per world")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="episode i is seeded with seed + i")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: CPU count)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json",
+                        help="json: run info, summary and episodes; csv: one row per episode")
+    parser.add_argument("--output", "-o", default=None, help="write here instead of stdout")
+    parser.add_argument("--trace-dir", default=None,
+                        help="record every step, one trace file per worker process")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each phase of every decision (JSON output and stderr)")
+    parser.add_argument("--oracle", action="store_true",
+                        help="solve each world with full information and report regret")
+    parser.add_argument("--oracle-cache", default=None,
+                        help="JSON file of solved worlds, read and updated (implies --oracle)")
+    args = parser.parse_args(argv)
+
+    world_files = find_worlds(args.worlds)
+    if not world_files:
+        parser.error("no world files found")
+
+    benchmark = Benchmark(max_steps=args.max_steps, workers=args.workers, trace_dir=args.trace_dir,
+                          profile=args.profile)
+    started = time.perf_counter()
+    results = benchmark.run(world_files, args.episodes, args.seed)
+    optima = None
+    if args.oracle or args.oracle_cache:
+        oracle = OracleSolver(benchmark.agent_config, args.oracle_cache)
+        optima = benchmark.solve(world_files, oracle)
+        oracle.save()
+    elapsed = time.perf_counter() - started
+    summary = summarize(results, optima, benchmark.latency)
+    if benchmark.profile is not None:
+        summary["profile"] = benchmark.profile.summary()
+
+    run_info = {"worlds": len(world_files), "episodes_per_world": args.episodes,
+                "seed": args.seed, "max_steps": args.max_steps,
+                "workers": benchmark.workers, "seconds": elapsed}
+    text = (to_json(summary, results, run_info, optima) if args.format == "json"
+            else to_csv(results, optima))
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            f.write(text)
+    else:
+        sys.stdout.write(text if text.endswith("\n") else text + "\n")
+    print(f"{summary['episodes']} episodes in {elapsed:.1f}s: win rate {summary['win_rate']:.1%}, "
+          f"mean score {summary['score'].get('mean', 0):.1f}", file=sys.stderr)
+    if benchmark.profile is not None:
+        print(benchmark.profile.report(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
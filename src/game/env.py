@@ -0,0 +1,154 @@
+"""Gym-style reset/step interface to WumpusGame.
+
+    env = WumpusEnv(["worlds/easy.world", "worlds/hard.world"])
+    observation, info = env.reset(seed=0)
+    while True:
+        observation, reward, terminated, truncated, info = env.step(action)
+        if terminated or truncated:
+            observation, info = env.reset()
+
+Actions are the integer codes of environment.vector_env (MOVE + direction,
+SHOOT + direction, GRAB).  The game runs with graphics and printing off:
+nothing is drawn until render() is called, and no menus are shown.
+
+Observations are NumPy buffers allocated once and updated in place by
+reset() and step(), which return the same dict (and info dict) every time;
+copy them to keep a step's values.  They hold:
+
+    position  (2,) int16   the agent's row and column
+    percept   () uint8     the current cell's percepts, PERCEPT_* bits
+    arrows    () int16     arrows left
+    map       (rows, cols) uint8   percepts of every visited cell, 0 elsewhere
+
+Rewards are the change in Agent.score, including the per-decision charge
+the agent itself would make, so an episode's return is the score it ends
+with.  An episode terminates on death or victory (holding the expected gold
+after a grab wins at once, charging the final 'win' decision too) and is
+truncated after max_steps.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .game import WumpusGame
+from ..agent.agent import Agent, AgentConfig
+from ..environment.vector_env import ACTION_COUNT, GRAB, action_name
+from ..environment.world_corpus import load_world
+from ..environment.world_load import WorldLoader
+from ..utils.constants import DECISION_COST
+
+RENDER_MODES = ("human", "ansi")
+
+
+class WumpusEnv:
+    action_count = ACTION_COUNT
+
+    def __init__(self, worlds: Union[str, Sequence[str]], agent_config: Optional[AgentConfig] = None,
+                 max_steps: int = 1000, render_mode: Optional[str] = None):
+        """worlds: one world file (or corpus entry) or a list of them; reset() picks
+        one at random from a list.  All worlds must have the same size."""
+        if render_mode is not None and render_mode not in RENDER_MODES:
+            raise ValueError(f"Unknown render mode '{render_mode}'")
+        self.worlds: List[str] = [worlds] if isinstance(worlds, str) else list(worlds)
+        if not self.worlds:
+            raise ValueError("WumpusEnv needs at least one world")
+        self.config = agent_config or AgentConfig()
+        self.max_steps = max_steps
+        self.render_mode = render_mode
+        self.rng = np.random.default_rng()
+        self.graphics = None  # created by the first human render()
+        self._loaders: Dict[str, WorldLoader] = {}
+        self.game: Optional[WumpusGame] = None
+
+        rows, cols = self._loader(self.worlds[0]).world_size
+        self.shape = (rows, cols)
+        self.observation = {
+            "position": np.zeros(2, dtype=np.int16),
+            "percept": np.zeros((), dtype=np.uint8),
+            "arrows": np.zeros((), dtype=np.int16),
+            "map": np.zeros((rows, cols), dtype=np.uint8),
+        }
+        self.info = {"world": None, "score": 0, "steps": 0, "won": False, "death_cause": None}
+
+    def _loader(self, world: str) -> WorldLoader:
+        loader = self._loaders.get(world)
+        if loader is None:
+            loader = self._loaders[world] = load_world(world)
+        return loader
+
+    def reset(self, seed: Optional[int] = None,
+              world: Optional[str] = None) -> Tuple[Dict[str, np.ndarray], Dict]:
+        """Start a new episode on world (default: a random one of the env's worlds)"""
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        if world is None:
+            world = self.worlds[self.rng.integers(len(self.worlds))] if len(self.worlds) > 1 else self.worlds[0]
+        loader = self._loader(world)
+        if loader.world_size != self.shape:
+            raise ValueError(f"World '{world}' is not {self.shape[0]}x{self.shape[1]}")
+
+        if self.game is not None and self.game.world_loader is loader:
+            self.game._reset_game()
+        else:
+            self.game = WumpusGame(world_file=world, agent=Agent(self.config), graphics=False,
+                                   verbose=False, world_loader=loader)
+        self.info["world"] = world
+        self.observation["map"][:] = 0
+        self._observe()
+        return self.observation, self.info
+
+    def step(self, action: int) -> Tuple[Dict[str, np.ndarray], int, bool, bool, Dict]:
+        """Apply one action; returns (observation, reward, terminated, truncated, info)"""
+        game = self.game
+        if game is None:
+            raise RuntimeError("Call reset() before step()")
+        if game.game_over or game.step_count >= self.max_steps:
+            raise RuntimeError("The episode has ended; call reset()")
+        agent = game.agent
+        score = agent.score
+        agent.score -= DECISION_COST
+        game.step_count += 1
+        game.apply_action(*action_name(int(action)))
+        if action == GRAB and agent.has_won() and not game.game_over:
+            agent.score -= DECISION_COST
+            game.apply_action('win', "congratulations!")
+
+        self._observe()
+        truncated = not game.game_over and game.step_count >= self.max_steps
+        if self.render_mode == "human":
+            self.render()
+        return self.observation, agent.score - score, game.game_over, truncated, self.info
+
+    def _observe(self) -> None:
+        game, observation, info = self.game, self.observation, self.info
+        row, col = game.agent.position
+        observation["position"][:] = (row, col)
+        observation["arrows"][()] = game.agent.arrow_count
+        if game.agent.is_alive:
+            mask = game.get_percepts()
+            observation["percept"][()] = mask
+            observation["map"][row, col] = mask
+        else:
+            observation["percept"][()] = 0
+        info["score"] = game.agent.score
+        info["steps"] = game.step_count
+        info["won"] = game.won
+        info["death_cause"] = game.death_cause
+
+    def render(self) -> Optional[str]:
+        """Draw the current state: a window frame ('human') or the board as text ('ansi')"""
+        game = self.game
+        if game is None:
+            return None
+        if self.render_mode == "ansi":
+            return "\n".join(" ".join(row) for row in game.get_display_board())
+        if self.graphics is None:
+            from ..interface.graphical_control import WumpusGraphics
+            self.graphics = WumpusGraphics(*self.shape)
+        import pygame
+        pygame.event.pump()  # keep the window responsive between frames
+        self.graphics.draw_board(game.get_display_board(), game.agent, game.status)
+        return None
+
+    def close(self) -> None:
+        if self.graphics is not None:
+            self.graphics.close()
+            self.graphics = None
@@ -1,34 +1,45 @@
 # import random
 import time
-import copy
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Optional, Tuple, TYPE_CHECKING
 from ..environment.world_load import WorldLoader
+from .scheduler import FrameScheduler
 from ..agent.agent import Agent, AgentConfig
-from ..interface.graphical_control import WumpusGraphics
-from ..utils.constants import percepts
+from ..utils.constants import (PERCEPT_BREEZE, PERCEPT_GLITTER, PERCEPT_NO_WUMPUS, PERCEPT_STENCH,
+                               PERCEPT_VISITED, percept_text)
+
+if TYPE_CHECKING:
+    from .trace import TraceRecorder
 
 class WumpusGame:
 
     def __init__(self, 
                  world_file: str = "worlds/default.world", 
                  agent: Agent = None,
-                 graphics: bool = True):
-        # Initialize game components
-        self.world_loader = WorldLoader(world_file)
-        self.original_world = copy.deepcopy(self.world_loader.get_board())
-        print(self.original_world) # debugging log
-        self.game_world = copy.deepcopy(self.original_world)
-        print(self.game_world) # debugging log
+                 graphics: bool = True,
+                 verbose: bool = True,
+                 world_loader: Optional[WorldLoader] = None,
+                 recorder: Optional['TraceRecorder'] = None):
+        self.verbose = verbose
+        self.recorder = recorder  # gets one record per step when set
+
+        # Initialize game components (a given loader replaces reading world_file)
+        self.world_loader = world_loader or WorldLoader(world_file)
+        self.original_world = self.world_loader.get_board()
+        self.game_world = [row[:] for row in self.original_world]
         self.world_size = self.world_loader.world_size
-        print()
-        # Initialize agent
+        # Cells are tested in O(1): hazards and gold on original_world, which is
+        # patched as they go, and percepts in this table, by row * cols + col
+        self.percept_table = self.world_loader.get_percept_table()
+        self.wumpus_count = sum(row.count('W') for row in self.original_world)
+        # Initialize agent, sized to the loaded world
         self.agent = agent if agent else Agent(AgentConfig())
-        print(self.agent.__dict__) # debugging log
-        
-        # Initialize graphics
+        self.agent.set_world(self.world_size, self.world_loader.start_position)
+
+        # Initialize graphics (pygame is only imported when a window is wanted)
         self.graphics_enabled = graphics
         if self.graphics_enabled:
-            self.graphics = WumpusGraphics()
+            from ..interface.graphical_control import WumpusGraphics
+            self.graphics = WumpusGraphics(*self.world_size)
         else:
             self.graphics = None
         
@@ -36,9 +47,13 @@ class WumpusGame:
         self.game_over = False
         self.won = False
         self.step_count = 0
+        self.death_cause = None
+        self.last_decision_time = 0.0  # seconds the agent took for the latest decision
+        self.status = ""  # status line shown with the board
         
         # Initial setup
         self._place_agent_on_board()
+        self._build_display_board()
         self._update_display("Game initialized")
 
     def _place_agent_on_board(self) -> None:
@@ -46,14 +61,54 @@ class WumpusGame:
         row, col = self.agent.position
         self.game_world[row][col] = self.agent.agent_config.agent_symbol
 
+    def _display_symbol(self, row: int, col: int) -> str:
+        """Symbol shown for a cell: its board content, or a breeze/stench indicator"""
+        symbol = self.game_world[row][col]
+        # Skip if cell already has something important
+        if symbol in ['A', 'W', 'P', 'G']:
+            return symbol
+        # Add percept indicators (prioritize stench over breeze if both)
+        percept = self.percept_table[row * self.world_size[1] + col]
+        if percept & PERCEPT_STENCH:
+            return 'S'
+        if percept & PERCEPT_BREEZE:
+            return 'B'
+        return symbol
+
+    def _build_display_board(self) -> None:
+        """Build the display board once per world; later changes are patched in per cell"""
+        rows, cols = self.world_size
+        table = self.percept_table
+        self.display_board = []
+        for row in range(rows):
+            display_row = self.game_world[row][:]
+            base = row * cols
+            for col, symbol in enumerate(display_row):
+                if symbol in ('A', 'W', 'P', 'G'):
+                    continue
+                if table[base + col] & PERCEPT_STENCH:
+                    display_row[col] = 'S'
+                elif table[base + col] & PERCEPT_BREEZE:
+                    display_row[col] = 'B'
+            self.display_board.append(display_row)
+
+    def _set_cell(self, cell: Tuple[int, int], symbol: str) -> None:
+        """Change one cell of the game board and its display symbol"""
+        row, col = cell
+        self.game_world[row][col] = symbol
+        self.display_board[row][col] = self._display_symbol(row, col)
+
     def _update_display(self, status: str) -> None:
-        """Update visual display if graphics enabled"""
-        if self.graphics_enabled:
-            display_board = self.get_display_board()
-            self.graphics.draw_board(display_board, self.agent, status)
-        else:
+        """Set the status line; the window shows it on the next frame render() draws"""
+        self.status = status
+        if not self.graphics_enabled and self.verbose:
             self._print_text_status(status)
 
+    def render(self) -> None:
+        """Draw one frame: the board, the status line and any running animation"""
+        if self.graphics_enabled:
+            self.graphics.draw_board(self.get_display_board(), self.agent, self.status)
+
     def _print_text_status(self, status: str) -> None:
         """Print text-based status update"""
         print(f"\nStep {self.step_count}: {status}")
@@ -69,7 +124,7 @@ class WumpusGame:
         print(f"Arrows: {agent_status['arrow_count']}")
         print(f"Gold: {agent_status['gold_count']}")
         print(f"Score: {agent_status['score']}")
-        print(f"Percepts: {self.get_percepts()}")
+        print(f"Percepts: {percept_text(self.get_percepts())}")
 
     def _find_elements(self, element: str) -> List[Tuple[int, int]]:
         """Find all positions of a specific element"""
@@ -102,30 +157,27 @@ class WumpusGame:
         else:
             return False, f"Unknown action: {action}"
 
-    def _update_board_state(self) -> None:
-        """Update the game board representation"""
-        self.game_world = copy.deepcopy(self.original_world)
-        
-        # Mark visited cells
-        for row, col in self.agent.path:
-            if (row, col) != self.agent.position:
-                self.game_world[row][col] = self.agent.agent_config.trail_symbol
-        
+    def _update_board_state(self, previous: Optional[Tuple[int, int]] = None) -> None:
+        """Apply the agent's latest move to the game board (O(1)) and refresh the display"""
+        config = self.agent.agent_config
+        # Leave a trail on the cell the agent just left
+        if previous is not None and previous != self.agent.position:
+            self._set_cell(previous, config.trail_symbol)
+
         # Place agent
-        row, col = self.agent.position
-        self.game_world[row][col] = self.agent.agent_config.agent_symbol
+        self._set_cell(self.agent.position, config.agent_symbol)
         
         # Update display
         self._update_display(f"Step {self.step_count}")
 
-    def _handle_death(self, message: str) -> None:
+    def _handle_death(self, message: str, cause: str) -> None:
         """Handle death scenario"""
+        self.death_cause = cause
         self.agent.die()
         self.game_over = True
         if self.graphics_enabled:
             self.graphics.animate_death()
         self._update_display(message)
-        self._post_game_options()
 
     def _handle_victory(self) -> None:
         """Handle victory scenario"""
@@ -134,7 +186,6 @@ class WumpusGame:
         if self.graphics_enabled:
             self.graphics.animate_victory()
         self._update_display("Victory!")
-        self._post_game_options()
 
     def get_game_status(self) -> Dict: # formerly get_game_state
         """Return complete game state"""
@@ -146,83 +197,44 @@ class WumpusGame:
             'game_over': self.game_over,
             'won': self.won,
             'step_count': self.step_count,
-            'wumpus_alive': 'W' in {cell for row in self.original_world for cell in row}
+            'wumpus_alive': self.wumpus_count > 0
         }
 
     def _reset_game(self) -> None:
         """Reset game to initial state"""
-        self.original_world = copy.deepcopy(self.world_loader.get_board())
-        self.game_world = copy.deepcopy(self.original_world)
+        self.original_world = self.world_loader.get_board()
+        self.game_world = [row[:] for row in self.original_world]
+        self.percept_table = self.world_loader.get_percept_table()
+        self.wumpus_count = sum(row.count('W') for row in self.original_world)
         self.agent.reset()
         self.game_over = False
         self.won = False
         self.step_count = 0
+        self.death_cause = None
+        self.last_decision_time = 0.0
         self._place_agent_on_board()
+        self._build_display_board()
         self._update_display("Game reset")
 
     def get_display_board(self) -> List[List[str]]:
-        """Create a display board that shows breeze and stench indicators"""
-        display_board = [row[:] for row in self.game_world]  # Copy game board
-        
-        # Add breeze indicators where agent would sense nearby pits
-        for row in range(self.world_size[0]):
-            for col in range(self.world_size[1]):
-                # Skip if cell already has something important
-                if display_board[row][col] in ['A', 'W', 'P', 'G']:
-                    continue
-                
-                # Check for adjacent hazards
-                has_adjacent_pit = False
-                has_adjacent_wumpus = False
-                
-                # Check all adjacent cells
-                adjacent = [(row-1,col), (row+1,col), (row,col-1), (row,col+1)]
-                for r, c in adjacent:
-                    if 0 <= r < self.world_size[0] and 0 <= c < self.world_size[1]:
-                        cell = self.original_world[r][c]
-                        if cell == 'P':
-                            has_adjacent_pit = True
-                        elif cell == 'W':
-                            has_adjacent_wumpus = True
-                
-                # Add percept indicators (prioritize stench over breeze if both)
-                if has_adjacent_wumpus:
-                    display_board[row][col] = 'S'  # Stench
-                elif has_adjacent_pit:
-                    display_board[row][col] = 'B'  # Breeze
-        
-        return display_board
+        """Board with breeze and stench indicators, kept up to date incrementally.
+
+        The returned grid is the game's live display state; callers must not modify it.
+        """
+        return self.display_board
 # elite methods that causes the problem. 
-    def get_percepts(self) -> str:
+    def get_percepts(self) -> int:
+        """Bitmask (utils.constants PERCEPT_* bits) of what the agent senses in its cell.
+        The first call on a cell marks it visited and adds it to the agent's path."""
         row, col = self.agent.position
-
-        if 'V' not in percepts[row][col]:
-            percepts[row][col] += 'V'
+        index = row * self.world_size[1] + col
+        percept = self.percept_table[index]
+        if not percept & PERCEPT_VISITED:
+            percept = self.percept_table[index] = percept | PERCEPT_VISITED
             self.agent.path.append((row, col))
-            self.game_world[row][col] = self.agent.agent_config.trail_symbol
-
-            adjacent = [(row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)]
-            for r, c in adjacent:
-                if 0 <= r < self.world_size[0] and 0 <= c < self.world_size[1]:
-                    cell = self.original_world[r][c]
-                    if cell == 'W' and 'S' not in percepts[row][col]:
-                        percepts[row][col] += 'S'
-                    if cell == 'P' and 'B' not in percepts[row][col]:
-                        percepts[row][col] += 'B'
-
-            if self.original_world[row][col] == 'G':
-                percepts[row][col] += 'G'
-            else:
-                percepts[row][col] += '~G'
-
-            if 'W' not in self.original_world[row][col]:
-                percepts[row][col] += '~W'
-            if 'P' not in self.original_world[row][col]:
-                percepts[row][col] += '~P'
-
-            print(f"[PERCEPTS] At {self.agent.position} → {percepts[row][col]}")
-
-        return percepts[row][col]
+            if self.verbose:
+                print(f"[PERCEPTS] At {self.agent.position} → {percept_text(percept)}")
+        return percept
 
 
     def _move_agent(self, direction: str) -> Tuple[bool, str]:
@@ -230,35 +242,34 @@ class WumpusGame:
             if len(self.agent.path) > 0:
                 old = self.agent.path.pop()
                 self.agent.position = self.agent.path[-1]
-                self._update_board_state()
+                if old != self.agent.position and old not in self.agent.path:
+                    self._set_cell(old, self.original_world[old[0]][old[1]])
+                self._update_board_state(old)
                 return True, f"rolled back from {old} to {self.agent.position}"
 
         new_pos = self.agent.get_next_position(direction)
         if not new_pos:
             return False, "Invalid direction"
 
+        previous = self.agent.position
         self.agent.move(new_pos)
-        row, col = new_pos
-        cell_content = self.original_world[row][col]
-
-        if cell_content == 'P':
-            self._handle_death("\U0001F480 You fell into a pit!")
+        content = self.original_world[new_pos[0]][new_pos[1]]
+        if content == 'P':
+            self._handle_death("\U0001F480 You fell into a pit!", "pit")
             return False, "Fell into pit"
-        elif cell_content == 'W':
-            self._handle_death("\U0001F480 You were eaten by the Wumpus!")
+        elif content == 'W':
+            self._handle_death("\U0001F480 You were eaten by the Wumpus!", "wumpus")
             return False, "Eaten by Wumpus"
 
         if self.agent.has_won():
             self._handle_victory()
             return True, "\U0001F389 You won!"
 
-        self._update_board_state()
+        self._update_board_state(previous)
         return True, f"Moved {direction} to {new_pos}"
 
     def _shoot_arrow(self, direction: str) -> Tuple[bool, str]:
         """Handle arrow shooting"""
-        global percepts
-        
         if not self.agent.shoot_arrow():
             return False, "No arrows left"
             
@@ -271,31 +282,38 @@ class WumpusGame:
         while 0 <= r < self.world_size[0] and 0 <= c < self.world_size[1]:
             path.append((r, c))
             if self.original_world[r][c] == 'W':
-                # updated the stench percepts since wumpus died
-                if r-1 >= 0 and 'S' in percepts[r-1][c]:
-                    percepts[r-1][c].replace('S', "") # since wumpus is killed
-                if r+1 < self.world_size[0] and 'S' in percepts[r+1][c]:
-                    percepts[r+1][c].replace('S', "")
-                if c-1 >= 0 and 'S' in percepts[r][c-1]:
-                    percepts[r][c-1].replace('S', "")
-                if c+1 < self.world_size[1] and 'S' in percepts[r][c+1]:
-                    percepts[r][c+1].replace('S', "")
-                    
                 self.original_world[r][c] = '-'
+                self.wumpus_count -= 1
+                # Only the Wumpus cell and its stench ring change, in the percepts and on the display
+                cols = self.world_size[1]
+                self.percept_table[r * cols + c] |= PERCEPT_NO_WUMPUS
+                self._set_cell((r, c), '-')
+                for nr, nc in [(r-1, c), (r+1, c), (r, c-1), (r, c+1)]:
+                    if 0 <= nr < self.world_size[0] and 0 <= nc < cols:
+                        if not self._next_to_wumpus(nr, nc):
+                            self.percept_table[nr * cols + nc] &= ~PERCEPT_STENCH
+                        self._set_cell((nr, nc), self.game_world[nr][nc])
                 self._update_board_state()
                 return True, "🏹 You killed the Wumpus!"
-            percepts[r][c] += '~W'
             r += dr
             c += dc
             
         return True, "Arrow missed"
 
+    def _next_to_wumpus(self, row: int, col: int) -> bool:
+        """Whether a live Wumpus is 4-adjacent to the cell (so it smells)"""
+        rows, cols = self.world_size
+        world = self.original_world
+        return ((row > 0 and world[row - 1][col] == 'W') or (row + 1 < rows and world[row + 1][col] == 'W')
+                or (col > 0 and world[row][col - 1] == 'W') or (col + 1 < cols and world[row][col + 1] == 'W'))
+
     def _grab_gold(self) -> Tuple[bool, str]:
         """Handle gold collection"""
         row, col = self.agent.position
         if self.original_world[row][col] == 'G':
             if self.agent.grab_gold():
                 self.original_world[row][col] = '-'
+                self.percept_table[row * self.world_size[1] + col] &= ~PERCEPT_GLITTER
                 self._update_board_state()
                 if self.graphics_enabled:
                     self.graphics.animate_victory()
@@ -303,43 +321,102 @@ class WumpusGame:
             return False, "Already has gold"
         return False, "No gold here"
     
-    def run_autonomous(self) -> None:  # main method of this file.
-        """Run game in autonomous mode with AI agent"""
-        import pygame  # Ensure pygame is imported for event processing
-        while not self.game_over:
-            # Process pygame events to keep window responsive
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    if self.graphics_enabled:
+    def step(self) -> Tuple[str, str, bool, str]:
+        """Run one percept -> decide -> act cycle and return (action, reason, success, message)"""
+        percept = self.get_percepts()
+        position, score = self.agent.position, self.agent.score
+        started = time.perf_counter()
+        action, reason = self.agent.decide_action(percept)
+        self.last_decision_time = time.perf_counter() - started
+        self.step_count += 1
+
+        success, message = self.apply_action(action, reason)
+        if self.recorder is not None:
+            self.recorder.record(self.step_count, position, percept, action, reason,
+                                 self.agent.score - score, self.last_decision_time)
+        return action, reason, success, message
+
+    def apply_action(self, action: str, reason: str) -> Tuple[bool, str]:
+        """Carry out an action the agent (or a replayed trace) chose"""
+        if action == 'move':
+            return self._move_agent(reason)
+        if action == 'shoot':
+            return self._shoot_arrow(reason)
+        if action == 'grab':
+            return self._grab_gold()
+        if action == 'win':
+            self._handle_victory()
+            return True, reason
+        return False, reason
+
+    def run_autonomous(self, scheduler: Optional[FrameScheduler] = None) -> None:  # main method of this file.
+        """Run game in autonomous mode with AI agent, at the scheduler's pace
+        (default: 10 steps per second)"""
+        def advance() -> bool:
+            action, reason, success, message = self.step()
+            if self.verbose:
+                print(f"Action: {action} {reason} - {message}")
+            return True
+
+        if not self.run_loop(advance, scheduler or FrameScheduler(), post_game_options=True):
+            exit()
+
+    def run_loop(self, advance: Callable[[], bool], scheduler: FrameScheduler,
+                 post_game_options: bool = False) -> bool:
+        """Call advance() (one step; False once it has no more) whenever the scheduler
+        says a step is due, until the game is over.  With graphics, every pass of the
+        loop handles window events and renders one frame, so animations keep playing
+        and the window stays responsive however slowly the game advances.  Returns
+        False if the player closed the window or chose to quit."""
+        if self.graphics_enabled:
+            import pygame  # Ensure pygame is imported for event processing
+        finished = self.game_over
+        while True:
+            scheduler.begin_frame()
+            if self.graphics_enabled:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
                         self.graphics.close()
-                    exit()
-                elif event.type == pygame.VIDEORESIZE and self.graphics_enabled:
-                    self.graphics.handle_resize(event)
-                    # Redraw board after resize
-                    self.graphics.draw_board(self.get_display_board(), self.agent)
-            percepts = self.get_percepts()
-            action, reason = self.agent.decide_action(percepts)
-            
-            if action == 'move':
-                success, message = self._move_agent(reason)
-            elif action == 'shoot':
-                success, message = self._shoot_arrow(reason)
-            elif action == 'grab':
-                success, message = self._grab_gold()
-            else:
-                # time.sleep(0.5)
+                        return False
+                    elif event.type == pygame.VIDEORESIZE:
+                        self.graphics.handle_resize(event)
+                    elif event.type == pygame.KEYDOWN and event.key in (pygame.K_SPACE, pygame.K_RIGHT):
+                        scheduler.request_step()
+            elif scheduler.mode == "keypress" and not finished:
+                input("Press Enter to step...")
+                scheduler.request_step()
+
+            stepped = False
+            while not finished and scheduler.step_due():
+                finished = not advance() or self.game_over
+                stepped = True
+
+            if self.graphics_enabled:
+                self.render()
+                self.graphics.tick(scheduler.fps)
+                if not finished or self.graphics.animating:
+                    continue
+            elif not finished:
+                if not stepped:
+                    time.sleep(scheduler.idle_time())  # console mode: wait for the next step
                 continue
-                
-            print(f"Action: {action} {reason} - {message}")
-            # time.sleep(0.5)
 
-    def _post_game_options(self):
-        if self.graphics_enabled:
-            choice = self.graphics.display_options()
-            if choice == "restart":
-                self._reset_game()
-                self.run_autonomous()
-            elif choice == "quit":
-                self.graphics.close()
-                exit()
-            # else: do nothing (close or snapshot)
\ No newline at end of file
+            if not post_game_options:
+                return True
+            choice = self._post_game_options()
+            if choice == "quit":
+                return False
+            if choice != "restart":
+                return True
+            finished = False
+
+    def _post_game_options(self) -> Optional[str]:
+        """Offer to restart or quit once a game has ended; restarting resets the game"""
+        if not self.graphics_enabled:
+            return None
+        choice = self.graphics.display_options()
+        if choice == "restart":
+            self._reset_game()
+        elif choice == "quit":
+            self.graphics.close()
+        return choice
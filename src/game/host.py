@@ -0,0 +1,224 @@
+"""Many independent Wumpus games hosted in one interpreter.
+
+GameHost keeps a registry of live games, each a headless WumpusGame with its
+own Agent, percept grid and world state, so games never see each other's
+state.  Games are driven one step at a time by id, from any number of
+threads or asyncio tasks:
+
+    host = GameHost(max_steps=500)
+    game_id = host.open("worlds/easy.world", seed=0)
+    while not host.finished(game_id):
+        host.step(game_id)
+    result = host.close(game_id)
+
+The registry is guarded by one lock and every game by its own, so calls on
+different games may run concurrently while calls on the same game are
+serialized.  play_async() and run_async() interleave hundreds of games on one
+event loop, yielding after every few steps; run_threads() plays them on a
+thread pool.  World loaders are read once per world and shared, since games
+only ever take copies of them.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+from .game import WumpusGame
+from .simulator import EpisodeResult, episode_result
+from ..agent.agent import Agent, AgentConfig
+from ..environment.world_corpus import load_world
+from ..environment.world_load import WorldLoader
+
+
+@dataclass
+class HostedGame:
+    game_id: int
+    world_file: str
+    seed: Optional[int]
+    game: WumpusGame
+    decision_time: float = 0.0  # seconds, summed over the steps
+    decision_max: float = 0.0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class GameHost:
+    def __init__(self, agent_config: Optional[AgentConfig] = None, max_steps: int = 1000,
+                 max_games: Optional[int] = None):
+        """max_games: most games open at once (None: no limit); open() fails beyond it"""
+        # Hosted games never print, whatever the caller's config says
+        self.agent_config = replace(agent_config or AgentConfig(), verbose=False)
+        self.max_steps = max_steps
+        self.max_games = max_games
+        self._games: Dict[int, HostedGame] = {}
+        self._loaders: Dict[str, WorldLoader] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._games)
+
+    def game_ids(self) -> List[int]:
+        with self._lock:
+            return list(self._games)
+
+    def _loader(self, world_file: str) -> WorldLoader:
+        with self._lock:
+            loader = self._loaders.get(world_file)
+        if loader is None:
+            loader = load_world(world_file)  # outside the lock: may read a file
+            with self._lock:
+                loader = self._loaders.setdefault(world_file, loader)
+        return loader
+
+    def _hosted(self, game_id: int) -> HostedGame:
+        with self._lock:
+            hosted = self._games.get(game_id)
+        if hosted is None:
+            raise KeyError(f"No game with id {game_id}")
+        return hosted
+
+    def open(self, world_file: str, seed: Optional[int] = None) -> int:
+        """Start a game on a world file (or corpus entry) and return its id.
+        A seed makes the game repeatable, as in HeadlessSimulator."""
+        config = self.agent_config if seed is None else replace(self.agent_config, seed=seed)
+        game = WumpusGame(world_file=world_file, agent=Agent(config), graphics=False,
+                          verbose=False, world_loader=self._loader(world_file))
+        with self._lock:
+            if self.max_games is not None and len(self._games) >= self.max_games:
+                raise RuntimeError(f"Host is full ({self.max_games} games open)")
+            game_id = self._next_id
+            self._next_id += 1
+            self._games[game_id] = HostedGame(game_id, world_file, seed, game)
+        return game_id
+
+    def close(self, game_id: int) -> EpisodeResult:
+        """Remove a game from the host and return its outcome"""
+        hosted = self._hosted(game_id)
+        with hosted.lock:
+            with self._lock:
+                self._games.pop(game_id, None)
+            return self._result(hosted)
+
+    def finished(self, game_id: int) -> bool:
+        """Whether the game is over or has used up max_steps"""
+        game = self._hosted(game_id).game
+        return game.game_over or game.step_count >= self.max_steps
+
+    def step(self, game_id: int) -> Tuple[str, str, bool, str]:
+        """Advance one game by one agent decision; returns (action, reason, success, message)"""
+        hosted = self._hosted(game_id)
+        with hosted.lock:
+            game = hosted.game
+            if game.game_over or game.step_count >= self.max_steps:
+                raise RuntimeError(f"Game {game_id} has finished")
+            outcome = game.step()
+            hosted.decision_time += game.last_decision_time
+            hosted.decision_max = max(hosted.decision_max, game.last_decision_time)
+            return outcome
+
+    def status(self, game_id: int) -> Dict:
+        """The agent's status with the game's progress"""
+        hosted = self._hosted(game_id)
+        with hosted.lock:
+            game = hosted.game
+            return {
+                **game.agent.get_status(),
+                'game_id': game_id,
+                'world_file': hosted.world_file,
+                'game_over': game.game_over,
+                'won': game.won,
+                'death_cause': game.death_cause,
+                'step_count': game.step_count,
+            }
+
+    def result(self, game_id: int) -> EpisodeResult:
+        """The game's outcome so far (truncated while it is still running)"""
+        hosted = self._hosted(game_id)
+        with hosted.lock:
+            return self._result(hosted)
+
+    def _result(self, hosted: HostedGame) -> EpisodeResult:
+        return episode_result(hosted.game, hosted.world_file, hosted.seed,
+                              hosted.decision_time, hosted.decision_max)
+
+    def play(self, world_file: str, seed: Optional[int] = None) -> EpisodeResult:
+        """Open a game, play it to the end and close it"""
+        game_id = self.open(world_file, seed)
+        try:
+            while not self.finished(game_id):
+                self.step(game_id)
+        finally:
+            result = self.close(game_id)
+        return result
+
+    async def play_async(self, world_file: str, seed: Optional[int] = None,
+                         steps_per_yield: int = 1) -> EpisodeResult:
+        """play() as a coroutine that gives way to other tasks every steps_per_yield steps"""
+        game_id = self.open(world_file, seed)
+        try:
+            while not self.finished(game_id):
+                for _ in range(steps_per_yield):
+                    self.step(game_id)
+                    if self.finished(game_id):
+                        break
+                await asyncio.sleep(0)
+        finally:
+            result = self.close(game_id)
+        return result
+
+    async def run_async(self, world_files: Sequence[str], seed: Optional[int] = None,
+                        concurrency: Optional[int] = None,
+                        steps_per_yield: int = 1) -> List[EpisodeResult]:
+        """Play one game per world file, up to concurrency at a time (default: all);
+        game i is seeded with seed + i, so results match HeadlessSimulator.run_batch"""
+        limit = asyncio.Semaphore(concurrency or max(len(world_files), 1))
+
+        async def play(i: int, world_file: str) -> EpisodeResult:
+            async with limit:
+                return await self.play_async(world_file, None if seed is None else seed + i,
+                                             steps_per_yield)
+
+        return list(await asyncio.gather(*(play(i, w) for i, w in enumerate(world_files))))
+
+    def run_threads(self, world_files: Sequence[str], seed: Optional[int] = None,
+                    workers: int = 8) -> List[EpisodeResult]:
+        """run_async() on a pool of threads instead of an event loop"""
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(
+                lambda task: self.play(task[1], None if seed is None else seed + task[0]),
+                enumerate(world_files)))
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Play many games at once in one process")
+    parser.add_argument("worlds", nargs="+", help="world files or corpus entries to play")
+    parser.add_argument("--games", type=int, default=None,
+                        help="games to play, cycling through the worlds (default: one per world)")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="games in flight at once (default: all)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="play on this many threads instead of an asyncio event loop")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    count = args.games or len(args.worlds)
+    world_files = [args.worlds[i % len(args.worlds)] for i in range(count)]
+    host = GameHost(max_steps=args.max_steps)
+    started = time.perf_counter()
+    if args.threads:
+        results = host.run_threads(world_files, args.seed, args.threads)
+    else:
+        results = asyncio.run(host.run_async(world_files, args.seed, args.concurrency))
+    elapsed = time.perf_counter() - started
+    wins = sum(r.won for r in results)
+    print(f"Games: {len(results)}  Wins: {wins}  "
+          f"Mean score: {sum(r.score for r in results) / len(results):.1f}  "
+          f"Time: {elapsed:.2f}s ({len(results) / elapsed:.0f} games/s)")
+
+
+if __name__ == "__main__":
+    main()
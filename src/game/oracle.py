@@ -0,0 +1,175 @@
+"""Full-information oracle: the best score an agent could get on a world.
+
+The oracle sees the whole board and searches the game's own rules with A*
+over (position, gold collected, arrows left, Wumpuses killed) states:
+
+    move     movement_cost; entering a pit or a live Wumpus is never chosen
+    shoot    arrow_cost; the arrow kills the first live Wumpus in its line
+    grab     picks up gold on arrival
+
+and stops as soon as expected_gold_count pieces are held.  Every decision the
+agent makes also costs DECISION_COST (Agent.AI_play charges it), and a
+perfect episode ends with one grab decision per gold piece and a final 'win'
+decision.  The optimal score is expected_gold_count * gold_reward minus all
+of those costs, exactly what Agent.score would read at the end of a perfect
+episode (the game never adds win_bonus to the score, so neither does the
+oracle).  Comparing it with an episode's score gives the agent's regret.
+
+Results are cached by a hash of the board, start and scoring config, in
+memory and optionally in a JSON file shared between runs, so unchanged
+worlds are never solved twice.
+"""
+import hashlib
+import heapq
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+from ..environment.world_corpus import load_world
+from ..agent.agent import AgentConfig
+from ..utils.constants import DECISION_COST
+
+DIRECTIONS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+@dataclass
+class OracleResult:
+    world_hash: str
+    solvable: bool
+    optimal_score: Optional[int] = None  # None when no plan collects enough gold
+    moves: int = 0
+    arrows_used: int = 0
+
+
+def world_hash(board: List[List[str]], start: Tuple[int, int], config: AgentConfig) -> str:
+    """Hash of everything the optimal score depends on"""
+    h = hashlib.sha1()
+    h.update("\n".join("".join(row) for row in board).encode())
+    h.update(repr((start, config.movement_cost, config.arrow_count, config.arrow_cost,
+                   config.gold_reward, config.expected_gold_count, DECISION_COST)).encode())
+    return h.hexdigest()
+
+
+class OracleSolver:
+    def __init__(self, agent_config: Optional[AgentConfig] = None, cache_path: Optional[str] = None):
+        self.agent_config = agent_config or AgentConfig()
+        self.cache_path = cache_path
+        self.cache: Dict[str, OracleResult] = {}
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                self.cache = {key: OracleResult(**value) for key, value in json.load(f).items()}
+
+    def solve(self, world_file: str) -> OracleResult:
+        """Optimal result for a world file or corpus entry, from the cache when already solved"""
+        loader = load_world(world_file)
+        return self.solve_board(loader.get_board(), loader.start_position)
+
+    def solve_board(self, board: List[List[str]], start: Tuple[int, int]) -> OracleResult:
+        key = world_hash(board, start, self.agent_config)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.cache[key] = self._search(board, start, key)
+        return result
+
+    def save(self) -> None:
+        """Write the cache to cache_path (atomically), if there is one"""
+        if not self.cache_path:
+            return
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({key: asdict(result) for key, result in self.cache.items()}, f)
+        os.replace(temp_path, self.cache_path)
+
+    def _search(self, board: List[List[str]], start: Tuple[int, int], key: str) -> OracleResult:
+        config = self.agent_config
+        rows, cols = len(board), len(board[0])
+        cells = [(r, c) for r in range(rows) for c in range(cols)]
+        pits = {cell for cell in cells if board[cell[0]][cell[1]] == 'P'}
+        gold = {cell: 1 << i for i, cell in enumerate(c for c in cells if board[c[0]][c[1]] == 'G')}
+        wumpus = {cell: 1 << i for i, cell in enumerate(c for c in cells if board[c[0]][c[1]] == 'W')}
+        needed = config.expected_gold_count
+        if len(gold) < needed:
+            return OracleResult(key, False)
+        move_cost = config.movement_cost + DECISION_COST
+        shot_cost = config.arrow_cost + DECISION_COST
+        # The grab decisions and the final 'win' decision of any winning plan
+        closing_cost = (needed + 1) * DECISION_COST
+
+        def remaining_cost(position, held):
+            """Admissible A* estimate: moves to the nearest gold not yet held"""
+            if bin(held).count("1") >= needed:
+                return 0
+            return move_cost * min(
+                abs(position[0] - cell[0]) + abs(position[1] - cell[1])
+                for cell, bit in gold.items() if not held & bit)
+
+        def first_wumpus(position, dr, dc, killed):
+            r, c = position[0] + dr, position[1] + dc
+            while 0 <= r < rows and 0 <= c < cols:
+                bit = wumpus.get((r, c), 0)
+                if bit and not killed & bit:
+                    return bit
+                r, c = r + dr, c + dc
+            return 0
+
+        # state: (position, gold held mask, arrows left, killed Wumpus mask)
+        initial = (start, gold.get(start, 0), config.arrow_count, 0)
+        best = {initial: 0}
+        counter = 0
+        queue = [(remaining_cost(start, initial[1]), 0, counter, initial, 0, 0)]
+        while queue:
+            _, cost, _, state, moves, shots = heapq.heappop(queue)
+            if best.get(state, cost) < cost:
+                continue
+            position, held, arrows, killed = state
+            if bin(held).count("1") >= needed:
+                return OracleResult(key, True, needed * config.gold_reward - cost - closing_cost,
+                                    moves, shots)
+
+            successors = []
+            for dr, dc in DIRECTIONS:
+                if arrows:
+                    target = first_wumpus(position, dr, dc, killed)
+                    if target:
+                        successors.append(((position, held, arrows - 1, killed | target),
+                                           shot_cost, 0, 1))
+                r, c = position[0] + dr, position[1] + dc
+                if not (0 <= r < rows and 0 <= c < cols) or (r, c) in pits:
+                    continue
+                bit = wumpus.get((r, c), 0)
+                if bit and not killed & bit:
+                    continue
+                successors.append((((r, c), held | gold.get((r, c), 0), arrows, killed),
+                                   move_cost, 1, 0))
+
+            for successor, step_cost, step_moves, step_shots in successors:
+                new_cost = cost + step_cost
+                if new_cost < best.get(successor, new_cost + 1):
+                    best[successor] = new_cost
+                    counter += 1
+                    heapq.heappush(queue, (new_cost + remaining_cost(successor[0], successor[1]),
+                                           new_cost, counter, successor,
+                                           moves + step_moves, shots + step_shots))
+        return OracleResult(key, False)
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Optimal full-information score of worlds")
+    parser.add_argument("worlds", nargs="+", help="world files")
+    parser.add_argument("--cache", default=None, help="JSON file of previously solved worlds")
+    args = parser.parse_args()
+
+    solver = OracleSolver(cache_path=args.cache)
+    for world_file in args.worlds:
+        result = solver.solve(world_file)
+        if result.solvable:
+            print(f"{world_file}: optimal score {result.optimal_score} "
+                  f"({result.moves} moves, {result.arrows_used} arrows)")
+        else:
+            print(f"{world_file}: no winning plan")
+    solver.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Frame scheduler: decides when the game advances, independently of rendering.
+
+The game loop calls begin_frame() once per rendered frame and then steps the
+simulation while step_due() says so.  How many steps a frame gets depends on
+the mode:
+
+    unthrottled  as many as fit into half a frame; the rest is left for drawing
+    fixed        steps_per_second, however many (or few) frames that spans
+    keypress     one per request_step(), i.e. per key press in the game window
+
+Nothing here sleeps or touches pygame: the graphical loop paces frames with
+pygame's clock and the console loop waits on idle_time().
+"""
+import time
+from typing import Callable, Optional
+
+MODES = ("unthrottled", "fixed", "keypress")
+
+
+class FrameScheduler:
+    def __init__(self, mode: str = "fixed", steps_per_second: float = 10.0, fps: int = 60,
+                 clock: Callable[[], float] = time.perf_counter):
+        if mode not in MODES:
+            raise ValueError(f"Unknown scheduling mode '{mode}' (expected one of {', '.join(MODES)})")
+        if mode == "fixed" and steps_per_second <= 0:
+            raise ValueError("steps_per_second must be positive")
+        self.mode = mode
+        self.interval = 1.0 / steps_per_second if steps_per_second > 0 else 0.0
+        self.fps = fps
+        self.clock = clock
+        self.pending = 0  # key presses not yet turned into steps
+        self.next_step: Optional[float] = None
+        self.frame_deadline = 0.0
+
+    def begin_frame(self) -> None:
+        self.frame_deadline = self.clock() + 0.5 / self.fps
+
+    def request_step(self, count: int = 1) -> None:
+        self.pending += count
+
+    def step_due(self) -> bool:
+        """Whether the simulation should take one more step this frame"""
+        if self.mode == "keypress":
+            if self.pending:
+                self.pending -= 1
+                return True
+            return False
+
+        now = self.clock()
+        if now >= self.frame_deadline and self.next_step is not None:
+            return False  # out of time for this frame; keep rendering responsive
+        if self.mode == "unthrottled":
+            self.next_step = now
+            return True
+
+        if self.next_step is None:
+            self.next_step = now
+        if now < self.next_step:
+            return False
+        # Catch up on at most one frame's worth of missed steps
+        self.next_step = max(self.next_step + self.interval, now - 1.0 / self.fps)
+        return True
+
+    def idle_time(self) -> float:
+        """Seconds until the next step is due (0 when one is due now)"""
+        if self.mode != "fixed" or self.next_step is None:
+            return 0.0
+        return max(0.0, self.next_step - self.clock())
+
+
+def add_scheduler_arguments(parser, default_mode: str = "fixed") -> None:
+    parser.add_argument("--mode", choices=MODES, default=default_mode,
+                        help="step as fast as possible, at --rate steps/s, or on each key press")
+    parser.add_argument("--rate", type=float, default=10.0, help="steps per second in fixed mode")
+    parser.add_argument("--fps", type=int, default=60, help="frames per second drawn")
+
+
+def scheduler_from_args(args) -> FrameScheduler:
+    return FrameScheduler(args.mode, args.rate, args.fps)
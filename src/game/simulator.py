@@ -0,0 +1,123 @@
+"""Headless batch simulation of Wumpus World episodes.
+
+Runs the same WumpusGame rules and Agent logic as the interactive game, but
+without importing pygame, printing the board or pacing the steps.
+A DecisionProfiler, when given, times the phases of every agent decision, and
+a LatencyHistogram records the time of every whole decision.
+"""
+from dataclasses import dataclass, replace
+from typing import Iterable, List, Optional, TYPE_CHECKING
+from .game import WumpusGame
+from ..environment.world_corpus import load_world
+from ..agent.agent import Agent, AgentConfig
+from ..agent.profiling import DecisionProfiler
+from ..utils.histogram import LatencyHistogram
+
+if TYPE_CHECKING:
+    from .trace import TraceRecorder
+
+
+@dataclass
+class EpisodeResult:
+    world_file: str
+    won: bool
+    alive: bool
+    score: int
+    steps: int
+    death_cause: Optional[str] = None
+    truncated: bool = False  # stopped by max_steps before the game ended
+    seed: Optional[int] = None
+    decision_time: float = 0.0  # seconds, summed over the steps
+    decision_max: float = 0.0   # seconds, of the slowest step
+
+
+def episode_result(game: WumpusGame, world_file: str, seed: Optional[int] = None,
+                   decision_time: float = 0.0, decision_max: float = 0.0) -> EpisodeResult:
+    """Outcome of a game so far; truncated unless the game is over"""
+    return EpisodeResult(
+        world_file=world_file,
+        won=game.won,
+        alive=game.agent.is_alive,
+        score=game.agent.score,
+        steps=game.step_count,
+        death_cause=game.death_cause,
+        truncated=not game.game_over,
+        seed=seed,
+        decision_time=decision_time,
+        decision_max=decision_max,
+    )
+
+
+class HeadlessSimulator:
+    def __init__(self, agent_config: Optional[AgentConfig] = None, max_steps: int = 1000,
+                 recorder: Optional['TraceRecorder'] = None,
+                 profiler: Optional[DecisionProfiler] = None,
+                 latency: Optional[LatencyHistogram] = None):
+        # Headless runs never print, whatever the caller's config says
+        self.agent_config = replace(agent_config or AgentConfig(), verbose=False)
+        self.max_steps = max_steps
+        self.recorder = recorder  # traces every episode when set
+        self.profiler = profiler  # attached to every episode's agent when set
+        self.latency = latency  # records every decision time, in nanoseconds, when set
+
+    def run_episode(self, world_file: str, seed: Optional[int] = None) -> EpisodeResult:
+        """Play one episode to completion (or max_steps) and return its outcome.
+        A seed makes the agent's random choices, and so the whole episode, repeatable."""
+        config = self.agent_config if seed is None else replace(self.agent_config, seed=seed)
+        if self.recorder is not None:
+            self.recorder.begin_episode(world_file, seed)
+        agent = Agent(config)
+        if self.profiler is not None:
+            self.profiler.attach(agent)
+        game = WumpusGame(world_file=world_file, agent=agent, graphics=False,
+                          verbose=False, world_loader=load_world(world_file),
+                          recorder=self.recorder)
+        total = slowest = 0.0
+        while not game.game_over and game.step_count < self.max_steps:
+            game.step()
+            seconds = game.last_decision_time
+            total += seconds
+            slowest = max(slowest, seconds)
+            if self.latency is not None:
+                self.latency.record(seconds * 1e9)
+        return episode_result(game, world_file, seed, total, slowest)
+
+    def run_batch(self, world_files: Iterable[str], seed: Optional[int] = None) -> List[EpisodeResult]:
+        """Run one episode per world file; episode i is seeded with seed + i"""
+        return [
+            self.run_episode(world_file, None if seed is None else seed + i)
+            for i, world_file in enumerate(world_files)
+        ]
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Run Wumpus World episodes headlessly")
+    parser.add_argument("worlds", nargs="+", help="world files to play")
+    parser.add_argument("--episodes", type=int, default=1, help="episodes per world")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--trace", default=None, help="record every step to this trace file")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-phase decision latencies")
+    args = parser.parse_args()
+
+    recorder = None
+    if args.trace:
+        from .trace import TraceRecorder
+        recorder = TraceRecorder(args.trace)
+    profiler = DecisionProfiler() if args.profile else None
+    simulator = HeadlessSimulator(max_steps=args.max_steps, recorder=recorder, profiler=profiler)
+    results = simulator.run_batch(
+        [w for w in args.worlds for _ in range(args.episodes)], seed=args.seed)
+    if recorder is not None:
+        recorder.close()
+    wins = sum(r.won for r in results)
+    print(f"Episodes: {len(results)}  Wins: {wins}  "
+          f"Mean score: {sum(r.score for r in results) / len(results):.1f}")
+    if profiler is not None:
+        print(profiler.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""Binary episode traces: a buffered recorder and a deterministic replayer.
+
+A trace file is a 16-byte header (magic b'WUMPTRAC', format version, record
+size) followed by fixed-size 24-byte records, one per game step:
+
+    episode u32, step u32, row u16, col u16, percept u8 (utils.constants
+    PERCEPT_* bits), action u8, direction u8, pad, score delta i32,
+    decision time f32 (seconds)
+
+Position and percept are what the agent saw when it decided.  Records are
+packed into a preallocated buffer and written in batches.  Which world (and
+seed) each episode played is kept in a JSON-lines sidecar, "<trace>.episodes".
+
+TraceReader maps the records as a NumPy structured array, so whole columns
+can be analysed at once, and TraceReplayer re-drives a WumpusGame from an
+episode's records (with graphics, at any speed) without running the agent,
+checking that every position and percept matches the recording.
+
+    python -m src.game.trace show run.wtrace --episode 3
+    python -m src.game.trace replay run.wtrace --episode 3 --graphics --mode fixed --rate 5
+"""
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .game import WumpusGame
+from .scheduler import FrameScheduler, add_scheduler_arguments, scheduler_from_args
+from ..agent.agent import Agent, AgentConfig
+from ..environment.world_corpus import load_world
+from ..utils.constants import percept_text
+
+MAGIC = b"WUMPTRAC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHH4x")
+RECORD = struct.Struct("<IIHHBBBxif")
+RECORD_DTYPE = np.dtype({
+    "names": ["episode", "step", "row", "col", "percept", "action", "direction",
+              "score_delta", "decision_time"],
+    "formats": ["<u4", "<u4", "<u2", "<u2", "u1", "u1", "u1", "<i4", "<f4"],
+    "offsets": [0, 4, 8, 10, 12, 13, 14, 16, 20],
+    "itemsize": RECORD.size,
+})
+
+# Codes 0 stand for an unknown action and for no direction (grab, win)
+ACTIONS = ("none", "move", "shoot", "grab", "win")
+DIRECTIONS = ("", "up", "down", "left", "right")
+ACTION_CODES = {name: code for code, name in enumerate(ACTIONS)}
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+
+
+def episodes_path(path: str) -> str:
+    return path + ".episodes"
+
+
+class TraceRecorder:
+    """Appends step records to a trace file through a fixed-size buffer"""
+
+    def __init__(self, path: str, buffer_records: int = 4096):
+        self.path = path
+        self.buffer = bytearray(RECORD.size * buffer_records)
+        self.capacity = buffer_records
+        self.pending = 0
+        self.episode = -1
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD.size))
+        self.episodes_file = open(episodes_path(path), "w")
+
+    def begin_episode(self, world: str, seed: Optional[int] = None) -> int:
+        """Start the next episode; later records belong to it"""
+        self.episode += 1
+        self.episodes_file.write(json.dumps({"episode": self.episode, "world": world,
+                                             "seed": seed}) + "\n")
+        return self.episode
+
+    def record(self, step: int, position: Tuple[int, int], percept: int, action: str,
+               reason: str, score_delta: int, decision_time: float) -> None:
+        RECORD.pack_into(self.buffer, self.pending * RECORD.size, self.episode, step,
+                         position[0], position[1], percept,
+                         ACTION_CODES.get(action, 0), DIRECTION_CODES.get(reason, 0),
+                         score_delta, decision_time)
+        self.pending += 1
+        if self.pending == self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered records (and pending episode entries) to disk"""
+        if self.pending:
+            self.file.write(memoryview(self.buffer)[:self.pending * RECORD.size])
+            self.pending = 0
+        self.file.flush()
+        self.episodes_file.flush()
+
+    def close(self) -> None:
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+            self.episodes_file.close()
+
+    def __enter__(self) -> 'TraceRecorder':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class TraceReader:
+    """Memory-mapped, columnar view of a trace file"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' is not an episode trace")
+        _, version, record_size = HEADER.unpack(header)
+        if version != FORMAT_VERSION or record_size != RECORD.size:
+            raise ValueError(f"Unsupported trace format in '{path}'")
+        count = (os.path.getsize(path) - HEADER.size) // RECORD.size
+        if count:
+            self.records = np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size,
+                                     shape=(count,)).view(np.ndarray)
+        else:
+            self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        self.episodes: List[Dict] = []
+        if os.path.exists(episodes_path(path)):
+            with open(episodes_path(path)) as f:
+                self.episodes = [json.loads(line) for line in f if line.strip()]
+
+    def episode(self, index: int) -> np.ndarray:
+        """The records of one episode (episodes are written one after another)"""
+        episodes = self.records["episode"]
+        return self.records[np.searchsorted(episodes, index, "left"):
+                            np.searchsorted(episodes, index, "right")]
+
+
+def describe(record) -> str:
+    """One line of text for a step record"""
+    text = (f"step {record['step']:4d} at ({record['row']}, {record['col']}) "
+            f"{percept_text(int(record['percept'])):12s} {ACTIONS[record['action']]}")
+    if record["direction"]:
+        text += " " + DIRECTIONS[record["direction"]]
+    return text + f"  score {int(record['score_delta']):+d}  {record['decision_time'] * 1000:.2f} ms"
+
+
+class ReplayMismatch(Exception):
+    """The game no longer matches a recorded episode (the world or rules changed)"""
+
+
+class TraceReplayer:
+    def __init__(self, reader: TraceReader):
+        self.reader = reader
+
+    def replay(self, episode: int, graphics: bool = False,
+               scheduler: Optional[FrameScheduler] = None, verbose: bool = False) -> WumpusGame:
+        """Play an episode's recorded actions through a fresh game and return it,
+        at the scheduler's pace (default: as fast as possible)"""
+        info = self.reader.episodes[episode]
+        records = iter(self.reader.episode(episode))
+        agent = Agent(AgentConfig(verbose=False, seed=info.get("seed")))
+        game = WumpusGame(world_file=info["world"], agent=agent, graphics=graphics,
+                          verbose=verbose, world_loader=load_world(info["world"]))
+
+        def advance() -> bool:
+            record = next(records, None)
+            if record is None:
+                return False
+            if game.game_over:
+                raise ReplayMismatch(f"Episode {episode} ended before step {record['step']}")
+            percept = game.get_percepts()
+            position = (int(record["row"]), int(record["col"]))
+            if game.agent.position != position or percept != record["percept"]:
+                raise ReplayMismatch(f"Episode {episode} diverged at step {record['step']}: "
+                                     f"{game.agent.position} {percept_text(percept)} != recording")
+            score = game.agent.score
+            game.step_count = int(record["step"])
+            game.apply_action(ACTIONS[record["action"]], DIRECTIONS[record["direction"]])
+            # The recorded change includes the agent's own per-decision charge,
+            # which replaying without the agent does not make
+            game.agent.score = score + int(record["score_delta"])
+            if verbose:
+                print(describe(record))
+            return True
+
+        game.run_loop(advance, scheduler or FrameScheduler("unthrottled"))
+        return game
+
+
+def main() -> None:
+    import argparse
+    parser = argparse.ArgumentParser(description="Inspect and replay episode traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+    show_parser = commands.add_parser("show", help="print an episode's steps")
+    replay_parser = commands.add_parser("replay", help="re-drive the game from a trace")
+    for command in (show_parser, replay_parser):
+        command.add_argument("trace")
+        command.add_argument("--episode", type=int, default=0)
+    replay_parser.add_argument("--graphics", action="store_true")
+    add_scheduler_arguments(replay_parser, default_mode="unthrottled")
+    args = parser.parse_args()
+
+    reader = TraceReader(args.trace)
+    info = reader.episodes[args.episode]
+    print(f"Episode {args.episode}: {info['world']} (seed {info['seed']})")
+    if args.command == "show":
+        for record in reader.episode(args.episode):
+            print(describe(record))
+    else:
+        game = TraceReplayer(reader).replay(args.episode, args.graphics, scheduler_from_args(args),
+                                            verbose=not args.graphics)
+        print(f"Replayed {game.step_count} steps: score {game.agent.score}, "
+              f"{'won' if game.won else game.death_cause or 'unfinished'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,25 @@
 #!/usr/bin/env python3
 import sys
-import pygame
 from .game import WumpusGame
+from .scheduler import add_scheduler_arguments, scheduler_from_args
 from ..agent.agent import Agent, AgentConfig
 
 def main() -> None:
     """Simplified game entry point for autonomous mode only"""
+    import argparse
+    parser = argparse.ArgumentParser(description="Watch the agent play a world")
+    parser.add_argument("--world", default="worlds/default.txt")
+    add_scheduler_arguments(parser)
+    args = parser.parse_args()
+
     try:
         agent = Agent(AgentConfig())
         game = WumpusGame(
-            world_file="worlds/default.txt",
+            world_file=args.world,
             agent=agent,
             graphics=True
         )
-
-        while not game.game_over:
-            game.run_autonomous()
+        game.run_autonomous(scheduler_from_args(args))
 
     except Exception as e:
         print(f"Error: {e}")
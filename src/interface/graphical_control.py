@@ -7,13 +7,30 @@ from pathlib import Path
 from ..agent.agent import Agent
 
 # Constants
-TILE_SIZE = 60
-ROWS, COLS = 10, 10
-BOARD_WIDTH, BOARD_HEIGHT = COLS * TILE_SIZE, ROWS * TILE_SIZE
+TILE_SIZE = 60  # largest tile; big worlds shrink tiles to fit the window
+DETAILED_TILE_SIZE = 40  # below this tiles are drawn as flat colored squares
+ROWS, COLS = 10, 10  # default world size
 UI_HEIGHT = 120
+UI_MIN_WIDTH = 600
+TITLE_HEIGHT = 100
 MIN_WINDOW_WIDTH = 1200
 MIN_WINDOW_HEIGHT = 1000
 
+# Timed overlay effects: seconds each one runs and seconds per animation frame
+EFFECT_DURATIONS = {'death': 3.0, 'victory': 2.7}
+EFFECT_FRAME_TIMES = {'death': 0.05, 'victory': 0.03}
+
+# Flat colors for small tiles and the minimap of very large worlds
+SIMPLE_TILE_COLORS = {
+    'A': (64, 224, 255),
+    'W': (220, 20, 60),
+    'G': (255, 215, 0),
+    'P': (15, 15, 15),
+    'B': (100, 200, 255),
+    'S': (255, 100, 100),
+    '.': (100, 100, 100),
+}
+
 # Modern color palette
 COLORS = {
     'background': (15, 20, 35),
@@ -49,8 +66,10 @@ COLORS = {
 }
 
 class WumpusGraphics:
-    def __init__(self):
+    def __init__(self, rows: int = ROWS, cols: int = COLS):
         pygame.init()
+        self.rows = rows
+        self.cols = cols
         self.window_width = MIN_WINDOW_WIDTH
         self.window_height = MIN_WINDOW_HEIGHT
         self.screen = pygame.display.set_mode((self.window_width, self.window_height), pygame.RESIZABLE)
@@ -58,10 +77,10 @@ class WumpusGraphics:
         self.clock = pygame.time.Clock()
         self.animation_time = time.time()
         self.particles = []
+        self.effects: Dict[str, float] = {}  # running effect -> time it started
         
-        # Calculate board position (centered)
-        self.board_x = (self.window_width - BOARD_WIDTH) // 2
-        self.board_y = (self.window_height - BOARD_HEIGHT - UI_HEIGHT) // 2 + 40 # 40px for title
+        # Calculate tile size and board position (centered)
+        self._layout_board()
         
         # Load fonts
         self.font_title = pygame.font.Font(None, 48)
@@ -83,15 +102,30 @@ class WumpusGraphics:
         self.window_height = max(MIN_WINDOW_HEIGHT, event.h)
         self.screen = pygame.display.set_mode((self.window_width, self.window_height), pygame.RESIZABLE)
         
-        # Recalculate board position
-        self.board_x = (self.window_width - BOARD_WIDTH) // 2
-        self.board_y = (self.window_height - BOARD_HEIGHT - UI_HEIGHT) // 2 + 40
+        # Recalculate tile size and board position
+        self._layout_board()
         
         # Regenerate stars for new window size
         self.stars = [(pygame.math.Vector2(random.randint(0, self.window_width), 
                                          random.randint(0, self.window_height)), 
                       random.uniform(0.5, 2.0)) for _ in range(50)]
 
+    def _layout_board(self) -> None:
+        """Fit the board into the window: shrink tiles for big worlds, minimap below 1px"""
+        avail_width = self.window_width - 80
+        avail_height = self.window_height - UI_HEIGHT - TITLE_HEIGHT - 40
+        fit = min(avail_width / self.cols, avail_height / self.rows)
+        self.tile_size = min(TILE_SIZE, int(fit))
+        if self.tile_size >= 1:
+            self.board_width = self.cols * self.tile_size
+            self.board_height = self.rows * self.tile_size
+        else:
+            # Each cell gets less than a pixel: draw one pixel per cell and scale down
+            self.board_width = max(1, int(self.cols * fit))
+            self.board_height = max(1, int(self.rows * fit))
+        self.board_x = (self.window_width - self.board_width) // 2
+        self.board_y = (self.window_height - self.board_height - UI_HEIGHT) // 2 + 40 # 40px for title
+
     def _draw_animated_background(self):
         """Draw animated starfield background"""
         # Gradient background
@@ -150,12 +184,13 @@ class WumpusGraphics:
 
     def _draw_enhanced_tile(self, x: int, y: int, tile_type: str) -> None:
         """Draw individual tile with enhanced graphics and animations"""
-        pixel_x = self.board_x + x * TILE_SIZE
-        pixel_y = self.board_y + y * TILE_SIZE
-        center = (pixel_x + TILE_SIZE // 2, pixel_y + TILE_SIZE // 2)
+        tile_size = self.tile_size
+        pixel_x = self.board_x + x * tile_size
+        pixel_y = self.board_y + y * tile_size
+        center = (pixel_x + tile_size // 2, pixel_y + tile_size // 2)
         
         # Tile background with subtle animation
-        tile_rect = pygame.Rect(pixel_x, pixel_y, TILE_SIZE, TILE_SIZE)
+        tile_rect = pygame.Rect(pixel_x, pixel_y, tile_size, tile_size)
         
         # Add subtle hover-like effect
         hover_intensity = 0.5 + 0.5 * math.sin(self.animation_time * 1.5 + x * 0.3 + y * 0.5)
@@ -250,9 +285,9 @@ class WumpusGraphics:
 
     def _draw_enhanced_ui(self, agent: Agent, status: str) -> None:
         """Enhanced UI with better styling"""
-        ui_y = self.board_y + BOARD_HEIGHT + 20
-        ui_width = BOARD_WIDTH
-        ui_x = self.board_x
+        ui_y = self.board_y + self.board_height + 20
+        ui_width = max(self.board_width, UI_MIN_WIDTH)
+        ui_x = (self.window_width - ui_width) // 2
         
         # UI background with rounded corners effect
         ui_bg = pygame.Surface((ui_width, UI_HEIGHT - 20), pygame.SRCALPHA)
@@ -428,71 +463,112 @@ class WumpusGraphics:
         self._draw_title_bar()
         
         # Draw board border with glow effect
-        board_border = pygame.Rect(self.board_x - 5, self.board_y - 5, BOARD_WIDTH + 10, BOARD_HEIGHT + 10)
+        board_border = pygame.Rect(self.board_x - 5, self.board_y - 5, self.board_width + 10, self.board_height + 10)
         pygame.draw.rect(self.screen, COLORS['ui_border'], board_border, 3)
         
-        # Draw grid lines
-        for x in range(COLS + 1):
-            line_x = self.board_x + x * TILE_SIZE
-            pygame.draw.line(self.screen, COLORS['tile_border'], 
-                           (line_x, self.board_y), (line_x, self.board_y + BOARD_HEIGHT))
-        for y in range(ROWS + 1):
-            line_y = self.board_y + y * TILE_SIZE
-            pygame.draw.line(self.screen, COLORS['tile_border'], 
-                           (self.board_x, line_y), (self.board_x + BOARD_WIDTH, line_y))
-        
-        # Draw tiles
-        for y in range(ROWS):
-            for x in range(COLS):
-                self._draw_enhanced_tile(x, y, board[y][x])
+        if self.tile_size >= DETAILED_TILE_SIZE:
+            # Draw grid lines
+            for x in range(self.cols + 1):
+                line_x = self.board_x + x * self.tile_size
+                pygame.draw.line(self.screen, COLORS['tile_border'], 
+                               (line_x, self.board_y), (line_x, self.board_y + self.board_height))
+            for y in range(self.rows + 1):
+                line_y = self.board_y + y * self.tile_size
+                pygame.draw.line(self.screen, COLORS['tile_border'], 
+                               (self.board_x, line_y), (self.board_x + self.board_width, line_y))
+            
+            # Draw tiles
+            for y in range(self.rows):
+                for x in range(self.cols):
+                    self._draw_enhanced_tile(x, y, board[y][x])
+        else:
+            self._draw_simple_board(board)
         
         # Draw enhanced UI
         self._draw_enhanced_ui(agent, status)
-        
+
+        self._draw_effects()
         pygame.display.flip()
-        self.clock.tick(60)
+
+    def tick(self, fps: int = 60) -> int:
+        """Wait out the rest of the frame; returns the milliseconds since the last tick"""
+        return self.clock.tick(fps)
+
+    def _draw_simple_board(self, board: List[List[str]]) -> None:
+        """Flat colored cells for worlds too large for the detailed tiles"""
+        minimap = self.tile_size < 1
+        tile_size = 1 if minimap else self.tile_size
+        surface = pygame.Surface((self.cols * tile_size, self.rows * tile_size))
+        surface.fill(COLORS['tile_empty'])
+        for y, row in enumerate(board):
+            for x, symbol in enumerate(row):
+                color = SIMPLE_TILE_COLORS.get(symbol)
+                if color:
+                    surface.fill(color, (x * tile_size, y * tile_size, tile_size, tile_size))
+        if minimap:
+            surface = pygame.transform.smoothscale(surface, (self.board_width, self.board_height))
+        self.screen.blit(surface, (self.board_x, self.board_y))
 
     def animate_death(self):
-        """Enhanced death animation"""
+        """Start the death animation; it plays over the next frames drawn"""
+        self.effects['death'] = time.time()
+
+    def animate_victory(self):
+        """Start the victory animation; it plays over the next frames drawn"""
+        self.effects['victory'] = time.time()
+
+    @property
+    def animating(self) -> bool:
+        """Whether an animation is still running"""
+        now = time.time()
+        return any(now - started < EFFECT_DURATIONS[kind] for kind, started in self.effects.items())
+
+    def _draw_effects(self) -> None:
+        """Draw the running animations over the frame and drop the finished ones"""
+        now = time.time()
+        for kind, started in list(self.effects.items()):
+            elapsed = now - started
+            if elapsed >= EFFECT_DURATIONS[kind]:
+                del self.effects[kind]
+                continue
+            frame = int(elapsed / EFFECT_FRAME_TIMES[kind])
+            if kind == 'death':
+                self._draw_death_frame(frame)
+            else:
+                self._draw_victory_frame(frame)
+
+    def _draw_death_frame(self, frame: int) -> None:
+        # The board darkens over the first frames, then the red glow pulses
         overlay = pygame.Surface((self.window_width, self.window_height))
-        overlay.set_alpha(150)
+        overlay.set_alpha(min(230, 150 + 20 * frame))
         overlay.fill((0, 0, 0))
-        
-        for frame in range(60):
-            self.screen.blit(overlay, (0, 0))
-            
-            alpha = int(100 + 50 * math.sin(frame * 0.3))
-            red_surf = pygame.Surface((self.window_width, self.window_height), pygame.SRCALPHA)
-            red_surf.fill((255, 0, 0, alpha))
-            self.screen.blit(red_surf, (0, 0))
-            
-            death_text = self.font_title.render("GAME OVER", True, (255, 255, 255))
-            text_rect = death_text.get_rect(center=(self.window_width//2, self.window_height//2))
-            self.screen.blit(death_text, text_rect)
-            
-            pygame.display.flip()
-            time.sleep(0.05)
+        self.screen.blit(overlay, (0, 0))
 
-    def animate_victory(self):
-        """Enhanced victory animation"""
+        alpha = int(100 + 50 * math.sin(frame * 0.3))
+        red_surf = pygame.Surface((self.window_width, self.window_height), pygame.SRCALPHA)
+        red_surf.fill((255, 0, 0, alpha))
+        self.screen.blit(red_surf, (0, 0))
+
+        death_text = self.font_title.render("GAME OVER", True, (255, 255, 255))
+        text_rect = death_text.get_rect(center=(self.window_width//2, self.window_height//2))
+        self.screen.blit(death_text, text_rect)
+
+    def _draw_victory_frame(self, frame: int) -> None:
         overlay = pygame.Surface((self.window_width, self.window_height))
-        overlay.set_alpha(100)
+        overlay.set_alpha(min(200, 100 + 10 * frame))
         overlay.fill((255, 255, 255))
-        
-        for frame in range(90):
-            self.screen.blit(overlay, (0, 0))
-            
+        self.screen.blit(overlay, (0, 0))
+
+        # Sparkles leave a short trail behind them
+        for trail in range(min(frame, 5) + 1):
             for i in range(20):
-                sparkle_x = (frame * 3 + i * 30) % self.window_width
-                sparkle_y = 50 + 30 * math.sin(frame * 0.1 + i)
+                sparkle_x = ((frame - trail) * 3 + i * 30) % self.window_width
+                sparkle_y = 50 + 30 * math.sin((frame - trail) * 0.1 + i)
                 pygame.draw.circle(self.screen, (255, 215, 0), (int(sparkle_x), int(sparkle_y)), 3)
-            
-            victory_text = self.font_title.render("VICTORY!", True, (50, 255, 50))
-            text_rect = victory_text.get_rect(center=(self.window_width//2, self.window_height//2))
-            self.screen.blit(victory_text, text_rect)
-            
-            pygame.display.flip()
-            time.sleep(0.03)
+
+        victory_text = self.font_title.render("VICTORY!", True, (50, 255, 50))
+        text_rect = victory_text.get_rect(center=(self.window_width//2, self.window_height//2))
+        self.screen.blit(victory_text, text_rect)
 
     def display_options(self):
         """Enhanced options menu"""
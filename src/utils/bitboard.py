@@ -0,0 +1,105 @@
+"""Integer bitboards for grid worlds.
+
+A plane is a Python int with bit ``row * cols + col`` set for every cell that
+has the feature.  Ints are immutable, so copying a plane (or a whole set of
+planes) is O(1), and whole-plane neighbour propagation is a handful of shifts
+and masks instead of a per-cell scan.
+"""
+from functools import lru_cache
+from typing import Iterator, List, Tuple
+from .constants import PERCEPT_BREEZE, PERCEPT_GLITTER, PERCEPT_NO_PIT, PERCEPT_NO_WUMPUS, PERCEPT_STENCH
+
+Cell = Tuple[int, int]
+
+
+class BitGrid:
+    """Geometry of a rows x cols board and the masks needed to shift planes on it"""
+    __slots__ = ('rows', 'cols', 'size', 'full', 'first_col', 'last_col')
+
+    def __init__(self, rows: int, cols: int):
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.full = (1 << self.size) - 1
+        # Bit 0 of every row; built from a binary string so it stays linear in size
+        self.first_col = int(('0' * (cols - 1) + '1') * rows, 2) if self.size else 0
+        self.last_col = self.first_col << (cols - 1) if self.size else 0
+
+    def index(self, cell: Cell) -> int:
+        return cell[0] * self.cols + cell[1]
+
+    def cell(self, index: int) -> Cell:
+        return divmod(index, self.cols)
+
+    def bit(self, cell: Cell) -> int:
+        return 1 << (cell[0] * self.cols + cell[1])
+
+    def in_bounds(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.rows and 0 <= cell[1] < self.cols
+
+    def neighbors(self, plane: int) -> int:
+        """Every cell 4-adjacent to a set cell of plane (shift-and-mask)"""
+        up = plane >> self.cols
+        down = (plane << self.cols) & self.full
+        left = (plane >> 1) & ~self.last_col
+        right = (plane << 1) & ~self.first_col & self.full
+        return up | down | left | right
+
+    def cells(self, plane: int) -> Iterator[Cell]:
+        """Yield the set cells of plane in row-major order"""
+        while plane:
+            low = plane & -plane
+            yield divmod(low.bit_length() - 1, self.cols)
+            plane ^= low
+
+    def bit_string(self, plane: int) -> str:
+        """'0'/'1' per cell in index order, so a whole plane can be read in linear time"""
+        return format(plane, 'b').zfill(self.size)[::-1] if self.size else ''
+
+    def plane_from_board(self, board: List[List[str]], symbol: str) -> int:
+        """Build a plane from the cells of a character board equal to symbol"""
+        text = ''.join(''.join(row) for row in board).encode('ascii')
+        bits = text.translate(_plane_table(symbol))
+        # int() reads the string most-significant first, so reverse it
+        return int(bits[::-1], 2) if bits else 0
+
+
+@lru_cache(maxsize=None)
+def _plane_table(symbol: str) -> bytes:
+    """bytes.translate table mapping symbol to '1' and every other character to '0'"""
+    return bytes(ord('1') if i == ord(symbol) else ord('0') for i in range(256))
+
+
+class WorldBits:
+    """Hazard, gold and percept planes of a world, from which its percept table is built"""
+    __slots__ = ('grid', 'pit', 'wumpus', 'gold', 'breeze', 'stench')
+
+    def __init__(self, grid: BitGrid, pit: int = 0, wumpus: int = 0, gold: int = 0):
+        self.grid = grid
+        self.pit = pit
+        self.wumpus = wumpus
+        self.gold = gold
+        self.breeze = grid.neighbors(pit)
+        self.stench = grid.neighbors(wumpus)
+
+    @classmethod
+    def from_board(cls, board: List[List[str]]) -> 'WorldBits':
+        grid = BitGrid(len(board), len(board[0]) if board else 0)
+        return cls(grid,
+                   pit=grid.plane_from_board(board, 'P'),
+                   wumpus=grid.plane_from_board(board, 'W'),
+                   gold=grid.plane_from_board(board, 'G'))
+
+    def percept_table(self) -> List[int]:
+        """Percept bitmask of every cell by index (utils.constants PERCEPT_* bits, never
+        PERCEPT_VISITED), built from the bit strings of the planes in linear time"""
+        full = self.grid.full
+        table = [0] * self.grid.size
+        for plane, bit in ((self.stench, PERCEPT_STENCH), (self.breeze, PERCEPT_BREEZE),
+                           (self.gold, PERCEPT_GLITTER), (full & ~self.wumpus, PERCEPT_NO_WUMPUS),
+                           (full & ~self.pit, PERCEPT_NO_PIT)):
+            for index, flag in enumerate(self.grid.bit_string(plane)):
+                if flag == '1':
+                    table[index] |= bit
+        return table
+
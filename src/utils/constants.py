@@ -1,5 +1,38 @@
-from typing import Dict, Tuple, List
+from typing import Dict
 
 
-# the below constant is actually in use in game.py
-percepts = [["" for _ in range(10)] for _ in range(10)]  # 10x10 grid for percepts
\ No newline at end of file
+DECISION_COST = 1  # score Agent.AI_play takes for every decision
+
+
+# Cell codes for array-encoded worlds (world generator, corpora); all fit in 4 bits
+CELL_EMPTY = 0
+CELL_WUMPUS = 1
+CELL_PIT = 2
+CELL_GOLD = 3
+CELL_AGENT = 4  # the start cell, written 'A' in world files
+CELL_SYMBOLS = "-WPGA"  # CELL_SYMBOLS[code] is the world-file symbol of a cell code
+SYMBOL_CODES: Dict[str, int] = {symbol: code for code, symbol in enumerate(CELL_SYMBOLS)}
+
+
+# Percept bits: the tokens of a percept string such as 'VSB~G~W~P' as one int
+PERCEPT_VISITED = 1 << 0    # 'V'
+PERCEPT_STENCH = 1 << 1     # 'S'
+PERCEPT_BREEZE = 1 << 2     # 'B'
+PERCEPT_GLITTER = 1 << 3    # 'G' (absent: '~G')
+PERCEPT_NO_WUMPUS = 1 << 4  # '~W'
+PERCEPT_NO_PIT = 1 << 5     # '~P'
+
+
+def percept_text(mask: int) -> str:
+    """Percept string of a bitmask, tokens in the order the game writes them"""
+    text = 'V' if mask & PERCEPT_VISITED else ''
+    if mask & PERCEPT_STENCH:
+        text += 'S'
+    if mask & PERCEPT_BREEZE:
+        text += 'B'
+    text += 'G' if mask & PERCEPT_GLITTER else '~G'
+    if mask & PERCEPT_NO_WUMPUS:
+        text += '~W'
+    if mask & PERCEPT_NO_PIT:
+        text += '~P'
+    return text
@@ -0,0 +1,91 @@
+"""Log-linear latency histograms in the style of HdrHistogram.
+
+Values are non-negative integers (nanoseconds, say).  Values below
+2 ** (precision_bits + 1) get a bucket each; above that every power of two is
+split into 2 ** precision_bits equal buckets, so a bucket is never wider than
+1 / 2 ** precision_bits of the values in it (under 0.8% with the default 7
+bits) however large they grow.  Recording is a couple of integer operations
+and a list increment, and histograms of the same precision merge by adding
+counts, so per-process histograms can be combined exactly.
+"""
+from typing import Dict, Iterable, List
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+class LatencyHistogram:
+    __slots__ = ('precision_bits', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, precision_bits: int = 7):
+        self.precision_bits = precision_bits
+        self.counts: List[int] = []
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def bucket(self, value: int) -> int:
+        shift = value.bit_length() - self.precision_bits - 1
+        if shift <= 0:
+            return value
+        return (shift << self.precision_bits) + (value >> shift)
+
+    def bucket_range(self, index: int) -> range:
+        """The values that fall into a bucket"""
+        shift = (index >> self.precision_bits) - 1
+        if shift <= 0:
+            return range(index, index + 1)
+        low = (index - (shift << self.precision_bits)) << shift
+        return range(low, low + (1 << shift))
+
+    def record(self, value: int, n: int = 1) -> None:
+        value = max(int(value), 0)
+        index = self.bucket(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += n
+        if not self.count or value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.count += n
+        self.total += value * n
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms of different precision")
+        if not other.count:
+            return
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, n in enumerate(other.counts):
+            if n:
+                self.counts[index] += n
+        self.min = other.min if not self.count else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> int:
+        """Highest value equivalent to the p-th percentile (exact to the bucket width)"""
+        if not self.count:
+            return 0
+        target = max(1, -(-self.count * p // 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self.bucket_range(index)[-1], self.max)
+        return self.max
+
+    def summary(self, scale: float = 1.0,
+                percentiles: Iterable[float] = DEFAULT_PERCENTILES) -> Dict:
+        """Count, mean, min, percentiles and max, with values multiplied by scale"""
+        summary = {"count": self.count, "mean": self.mean() * scale, "min": self.min * scale}
+        for p in percentiles:
+            summary[f"p{p:g}"] = self.percentile(p) * scale
+        summary["max"] = self.max * scale
+        return summary